@@ -1,6 +1,26 @@
-from flask import Flask, render_template, request, redirect, session, flash, url_for, jsonify
+from flask import Flask, render_template, request, redirect, session, flash, url_for, jsonify, g, has_request_context, Response, stream_with_context
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
 import mysql.connector
+import click
+import asyncio
+import base64
+import copy
+import csv
+import hashlib
+import hmac
+import io
 import json
+import math
+import os
+import pickle
+import queue
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 
 app = Flask(__name__)
@@ -17,96 +37,2214 @@ db_config = {
     'database': 'edumentor_db'
 }
 
+# --- Connection Pool Configuration ---
+pool_config = {
+    'pool_size': 10,           # Connections kept open and reused between requests
+    'max_overflow': 5,         # Extra direct connections allowed when the pool is exhausted
+    'checkout_timeout': 2.0,   # Seconds to wait for a free pooled connection before overflowing
+    'idle_timeout': 300,       # Idle connections older than this (seconds) are closed
+    'ping_after_idle': 30      # Health-check (ping) connections idle longer than this on checkout
+}
+
+# --- Read Replica Configuration ---
+# Each entry overrides db_config keys (usually host/port) for one read replica.
+# With no replicas listed, read-only routes use the primary exactly as before.
+replica_config = {
+    'replicas': [],            # e.g. [{'host': 'replica-1.internal'}, {'host': 'replica-2.internal', 'port': 3307}]
+    'max_lag_seconds': 5,      # Replicas further behind the primary than this are skipped
+    'check_interval': 5,       # Seconds between replication status checks
+    'sticky_seconds': 30       # After a user's request commits a write, their reads stay on the primary this long
+                               # (keep above max_lag_seconds plus the usual background job delay)
+}
+
+# --- Connection Pool ---
+class PooledConnection:
+    """ Wraps a raw MySQL connection so that close() hands it back to the pool """
+
+    def __init__(self, pool, raw_conn, overflow=False):
+        self._pool = pool
+        self._raw_conn = raw_conn
+        self._overflow = overflow
+        self._request_bound = False # True while the connection is shared through Flask's g
+
+    def __getattr__(self, name):
+        return getattr(self._raw_conn, name)
+
+    def cursor(self, *args, **kwargs):
+        # Cursors are instrumented so each request's statements can be counted and timed,
+        # and statements in the prepared-statement registry run on this connection's prepared cursors
+        return InstrumentedCursor(self._raw_conn.cursor(*args, **kwargs), self._raw_conn, kwargs.get('dictionary', False))
+
+    def commit(self):
+        self._raw_conn.commit()
+        # A committed write pins this user's reads to the primary for a while (read-your-writes)
+        if not self._pool.replica and has_request_context():
+            g.db_wrote = True
+
+    def close(self):
+        # Request-bound connections are released once, at teardown, so helpers can reuse them
+        if not self._request_bound:
+            self.release()
+
+    def release(self):
+        if self._raw_conn is not None:
+            self._pool.release(self._raw_conn, self._overflow)
+            self._raw_conn = None
+
+    def discard(self):
+        # Closes the connection instead of pooling it, e.g. when a result set was left half read
+        if self._raw_conn is not None:
+            self._pool.discard(self._raw_conn, self._overflow)
+            self._raw_conn = None
+
+
+class ConnectionPool:
+    """ Fixed-size MySQL connection pool with health checks, idle eviction and overflow fallback """
+
+    def __init__(self, connect_args, pool_size, max_overflow, checkout_timeout, idle_timeout, ping_after_idle,
+                 replica=False):
+        self.connect_args = connect_args
+        self.replica = replica # Read-only replica pool: commits on it are not treated as user writes
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.ping_after_idle = ping_after_idle
+
+        self._idle = [] # List of (raw_conn, last_used) pairs, most recently used last
+        self._open = 0 # Pooled connections currently open (idle + in use)
+        self._overflow_open = 0
+        self._cond = threading.Condition()
+        self._metrics = {
+            'checkouts': 0,
+            'misses': 0, # Checkouts that found the pool exhausted and had to overflow
+            'failed_checkouts': 0,
+            'connections_created': 0,
+            'health_check_failures': 0,
+            'idle_evictions': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0
+        }
+
+    def _connect(self):
+        # Called without self._cond held; the caller counts the connection under the lock
+        return mysql.connector.connect(**self.connect_args)
+
+    def _take_expired(self):
+        # Caller must hold self._cond. Removes idle connections past idle_timeout from the pool and
+        # returns them; the caller closes them after releasing the lock
+        now = time.time()
+        keep, expired = [], []
+        for raw_conn, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                expired.append(raw_conn)
+            else:
+                keep.append((raw_conn, last_used))
+        self._idle = keep
+        self._open -= len(expired)
+        self._metrics['idle_evictions'] += len(expired)
+        return expired
+
+    @staticmethod
+    def _close_quietly(raw_conn):
+        # Never called with self._cond held: closing a dead connection can block on the network
+        try:
+            raw_conn.close()
+        except mysql.connector.Error:
+            pass
+
+    def _is_healthy(self, raw_conn, last_used):
+        # Called without self._cond held, so a ping to an unresponsive server stalls only this checkout
+        if time.time() - last_used < self.ping_after_idle:
+            return True
+        try:
+            raw_conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            with self._cond:
+                self._metrics['health_check_failures'] += 1
+            return False
+
+    def acquire(self):
+        started = time.time()
+        deadline = started + self.checkout_timeout
+        while True:
+            idle, reserved = None, False
+            with self._cond:
+                expired = self._take_expired()
+                if self._idle:
+                    idle = self._idle.pop()
+                elif self._open < self.pool_size:
+                    self._open += 1 # Reserve the slot; the connect itself happens outside the lock
+                    reserved = True
+                elif not expired:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    continue
+            for raw_conn in expired:
+                self._close_quietly(raw_conn)
+
+            # 1. Reuse an idle connection if it passes its health check
+            if idle is not None:
+                raw_conn, last_used = idle
+                if self._is_healthy(raw_conn, last_used):
+                    with self._cond:
+                        self._record_checkout(started)
+                    return PooledConnection(self, raw_conn)
+                self.discard(raw_conn)
+                continue
+
+            # 2. Open a new pooled connection in the reserved slot
+            if reserved:
+                try:
+                    raw_conn = self._connect()
+                except mysql.connector.Error as err:
+                    with self._cond:
+                        self._open -= 1
+                        self._metrics['failed_checkouts'] += 1
+                        self._cond.notify()
+                    print(f"Error connecting to database: {err}")
+                    return None
+                with self._cond:
+                    self._metrics['connections_created'] += 1
+                    self._record_checkout(started)
+                return PooledConnection(self, raw_conn)
+            # 3. Only expired connections were closed this round: slots are free again, retry
+
+        # 4. Pool exhausted: fall back to a short-lived overflow connection
+        with self._cond:
+            self._metrics['misses'] += 1
+            if self._overflow_open >= self.max_overflow:
+                self._metrics['failed_checkouts'] += 1
+                print("Error connecting to database: connection pool exhausted")
+                return None
+            self._overflow_open += 1
+
+        try:
+            raw_conn = self._connect()
+        except mysql.connector.Error as err:
+            with self._cond:
+                self._overflow_open -= 1
+                self._metrics['failed_checkouts'] += 1
+            print(f"Error connecting to database: {err}")
+            return None
+        with self._cond:
+            self._metrics['connections_created'] += 1
+            self._record_checkout(started)
+        return PooledConnection(self, raw_conn, overflow=True)
+
+    def _record_checkout(self, started):
+        # Caller must hold self._cond
+        waited = time.time() - started
+        self._metrics['checkouts'] += 1
+        self._metrics['wait_time_total'] += waited
+        self._metrics['wait_time_max'] = max(self._metrics['wait_time_max'], waited)
+
+    def release(self, raw_conn, overflow=False):
+        # Roll back anything left uncommitted so the next borrower starts clean
+        healthy = True
+        try:
+            raw_conn.rollback()
+        except mysql.connector.Error:
+            healthy = False
+
+        if healthy and not overflow:
+            with self._cond:
+                self._idle.append((raw_conn, time.time()))
+                self._cond.notify()
+            return
+        self.discard(raw_conn, overflow)
+
+    def discard(self, raw_conn, overflow=False):
+        """ Closes a checked-out connection and frees its slot instead of returning it to the pool """
+        with self._cond:
+            if overflow:
+                self._overflow_open -= 1
+            else:
+                self._open -= 1
+            self._cond.notify()
+        self._close_quietly(raw_conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._metrics)
+            stats['pool_size'] = self.pool_size
+            stats['open'] = self._open
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._open - len(self._idle) + self._overflow_open
+            stats['overflow_in_use'] = self._overflow_open
+            stats['wait_time_avg'] = stats['wait_time_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+
+db_pool = ConnectionPool(db_config, **pool_config)
+
+# --- NEW: Read Replica Router (Reporting reads on replicas, writes on the primary) ---
+class ReplicaRouter:
+    """ Keeps one connection pool per read replica and hands out connections round robin among
+        the replicas whose last replication check was healthy. A background thread checks each
+        replica's lag every check_interval seconds; a replica that is stopped, unreachable or
+        further behind than max_lag is skipped until it recovers. """
+
+    def __init__(self, primary_args, replicas, pool_settings, max_lag, check_interval):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._replicas = []
+        for overrides in replicas:
+            args = dict(primary_args, **overrides)
+            self._replicas.append({
+                'name': f"{args['host']}:{args.get('port', 3306)}",
+                'pool': ConnectionPool(args, replica=True, **pool_settings),
+                'healthy': False, # Not used until the first check passes
+                'lag': None,
+                'reads': 0,
+                'last_error': None
+            })
+        self._next = 0
+        self._lock = threading.Lock()
+        self._metrics = {'replica_reads': 0, 'primary_reads': 0}
+
+    def start(self):
+        """ Starts the background replication checks (nothing to do without replicas) """
+        if self._replicas:
+            threading.Thread(target=self._check_loop, name='replica-lag-check', daemon=True).start()
+
+    def _check_loop(self):
+        while True:
+            self.check()
+            time.sleep(self.check_interval)
+
+    def check(self):
+        """ Runs one replication check of every replica and updates which ones receive reads """
+        for replica in self._replicas:
+            self._check(replica)
+
+    def _check(self, replica):
+        healthy, lag, error = False, None, None
+        conn = replica['pool'].acquire()
+        if conn is None:
+            error = 'connection failed'
+        else:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                try:
+                    cursor.execute("SHOW REPLICA STATUS")
+                except mysql.connector.Error:
+                    cursor.execute("SHOW SLAVE STATUS") # MySQL before 8.0.22 / MariaDB
+                status = cursor.fetchone()
+                if status is None:
+                    error = 'not replicating'
+                else:
+                    lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+                    if lag is None:
+                        error = 'replication stopped'
+                    elif lag > self.max_lag:
+                        error = f"lag {lag}s"
+                    else:
+                        healthy = True
+            except mysql.connector.Error as err:
+                error = str(err)
+            finally:
+                cursor.close()
+                conn.close()
+        with self._lock:
+            if replica['healthy'] != healthy:
+                print(f"Replica {replica['name']} is now {'healthy' if healthy else 'skipped: ' + error}")
+            replica['healthy'], replica['lag'], replica['last_error'] = healthy, lag, error
+
+    def acquire(self):
+        """ Returns a pooled connection to a healthy replica, or None if reads should go to the primary """
+        with self._lock:
+            healthy = [r for r in self._replicas if r['healthy']]
+            if not healthy:
+                self._metrics['primary_reads'] += 1
+                return None
+            replica = healthy[self._next % len(healthy)]
+            self._next += 1
+        conn = replica['pool'].acquire()
+        with self._lock:
+            if conn is None:
+                replica['healthy'], replica['last_error'] = False, 'connection failed'
+                self._metrics['primary_reads'] += 1
+                return None
+            replica['reads'] += 1
+            self._metrics['replica_reads'] += 1
+        return conn
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['healthy'] = sum(1 for r in self._replicas if r['healthy'])
+            stats['replicas'] = [{'name': r['name'], 'healthy': r['healthy'], 'lag': r['lag'], 'reads': r['reads'],
+                                  'last_error': r['last_error'], 'pool': r['pool'].stats()} for r in self._replicas]
+        return stats
+
+replica_router = ReplicaRouter(db_config, replica_config['replicas'], pool_config,
+                               replica_config['max_lag_seconds'], replica_config['check_interval'])
+replica_router.start()
+
+# --- NEW: Request Instrumentation (Query counts, latency, N+1 detection) ---
+N_PLUS_ONE_THRESHOLD = 10 # Same statement run this many times in one request is flagged as N+1
+LATENCY_SAMPLES = 1000 # Recent latencies kept per endpoint for the p50/p95/p99 quantiles
+
+def _record_query(statement, seconds):
+    if has_request_context() and 'query_log' in g:
+        g.query_log.append((statement, seconds))
+
+
+# --- Prepared Statement Configuration ---
+statement_config = {
+    'enabled': True,
+    'max_per_connection': 32   # Prepared cursors kept per pooled connection (LRU); the server-wide
+                               # limit is max_prepared_stmt_count, so keep pool_size * this well below it
+}
+
+# --- NEW: Prepared Statement Registry (Hot SQL parsed once per connection, not on every call) ---
+class StatementRegistry:
+    """ Names hot statements once and runs them as server-side prepared statements.
+        Statements are matched by their exact SQL text, so the existing query constants and builders
+        are used unchanged; each pooled connection keeps one prepared cursor per statement name. """
+
+    def __init__(self, enabled, max_per_connection):
+        self.enabled = enabled
+        self.max_per_connection = max_per_connection
+        self._names = {} # SQL text -> (statement name, text sent to the server for PREPARE)
+        self._lock = threading.Lock()
+        self._metrics = {} # statement name -> {'executions', 'prepares', 'errors', 'seconds'}
+
+    def register(self, name, sql):
+        self._names[sql] = (name, sql.strip().rstrip(';'))
+        self._metrics.setdefault(name, {'executions': 0, 'prepares': 0, 'errors': 0, 'seconds': 0.0})
+        return sql
+
+    def statements(self):
+        """ Returns {name: sql} for every registered statement (the exact text the routes execute) """
+        return {name: sql for sql, (name, _) in self._names.items()}
+
+    def lookup(self, sql):
+        """ Returns (name, prepared_sql) for a registered statement, else None """
+        return self._names.get(sql) if self.enabled else None
+
+    def execute(self, raw_conn, statement, params, dictionary):
+        """ Runs a registered statement on raw_conn's prepared cursor for it.
+            Returns (rows, status): rows are fetched in full, as dicts if dictionary is set, and status holds the
+            prepared cursor's rowcount, lastrowid, description, column_names and with_rows for that execution. """
+        name, sql = statement
+        prepared = getattr(raw_conn, '_edumentor_prepared', None)
+        if prepared is None:
+            prepared = OrderedDict() # name -> prepared cursor, least recently used first
+            raw_conn._edumentor_prepared = prepared
+
+        cursor = prepared.get(name)
+        is_new = cursor is None
+        if is_new:
+            cursor = raw_conn.cursor(prepared=True)
+            prepared[name] = cursor
+            while len(prepared) > self.max_per_connection:
+                _, evicted = prepared.popitem(last=False)
+                evicted.close() # Deallocates the statement on the server
+        else:
+            prepared.move_to_end(name)
+
+        started = time.perf_counter()
+        try:
+            cursor.execute(sql, params or ())
+            rows = cursor.fetchall() if cursor.with_rows else []
+        except mysql.connector.Error:
+            # Re-prepare on the next call (the statement may have been invalidated by DDL or a reconnect)
+            prepared.pop(name, None)
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                pass
+            with self._lock:
+                self._metrics[name]['errors'] += 1
+            raise
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            metrics = self._metrics[name]
+            metrics['executions'] += 1
+            metrics['prepares'] += 1 if is_new else 0
+            metrics['seconds'] += elapsed
+        status = {attr: getattr(cursor, attr) for attr in InstrumentedCursor.RESULT_ATTRS}
+        if dictionary and rows:
+            columns = cursor.column_names
+            rows = [dict(zip(columns, row)) for row in rows]
+        return list(rows), status
+
+    def stats(self):
+        with self._lock:
+            statements = {name: dict(m, avg_ms=m['seconds'] / m['executions'] * 1000 if m['executions'] else 0.0)
+                          for name, m in self._metrics.items()}
+        return {
+            'enabled': self.enabled,
+            'registered': len(statements),
+            'executions': sum(m['executions'] for m in statements.values()),
+            'prepares': sum(m['prepares'] for m in statements.values()),
+            'statements': statements
+        }
+
+statement_registry = StatementRegistry(statement_config['enabled'], statement_config['max_per_connection'])
+
+
+class InstrumentedCursor:
+    """ Wraps a MySQL cursor and records every execute/executemany/callproc with its duration.
+        execute() of a registered statement runs on the connection's prepared cursor instead, and the
+        fetch methods and result attributes then describe that statement's result. """
+
+    RESULT_ATTRS = ('rowcount', 'lastrowid', 'description', 'column_names', 'with_rows')
+
+    def __init__(self, cursor, raw_conn=None, dictionary=False):
+        self._cursor = cursor
+        self._raw_conn = raw_conn
+        self._dictionary = dictionary
+        self._prepared_result = None # (rows, status) of the last registered statement
+
+    def __getattr__(self, name):
+        if name in self.RESULT_ATTRS and self._prepared_result is not None:
+            return self._prepared_result[1][name]
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        if self._prepared_result is not None:
+            return iter(self.fetchall())
+        return iter(self._cursor)
+
+    def fetchone(self):
+        if self._prepared_result is not None:
+            rows = self._prepared_result[0]
+            return rows.pop(0) if rows else None
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        if self._prepared_result is not None:
+            rows = self._prepared_result[0]
+            batch, rows[:] = rows[:size], rows[size:]
+            return batch
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        if self._prepared_result is not None:
+            rows = self._prepared_result[0]
+            self._prepared_result = ([], self._prepared_result[1])
+            return rows
+        return self._cursor.fetchall()
+
+    def _timed(self, statement, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            _record_query(' '.join(statement.split()), time.perf_counter() - started)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        statement = statement_registry.lookup(operation) if self._raw_conn is not None and not args and not kwargs else None
+        if statement:
+            self._prepared_result = self._timed(operation, statement_registry.execute,
+                                                self._raw_conn, statement, params, self._dictionary)
+            return None
+        self._prepared_result = None
+        return self._timed(operation, lambda: self._cursor.execute(operation, params, *args, **kwargs))
+
+    def executemany(self, operation, seq_params):
+        self._prepared_result = None
+        return self._timed(operation, self._cursor.executemany, operation, seq_params)
+
+    def callproc(self, procname, args=()):
+        self._prepared_result = None
+        return self._timed(f"CALL {procname}", self._cursor.callproc, procname, args)
+
+
+class RequestMetrics:
+    """ Per-endpoint request latency, query counts and N+1 flags, rendered in Prometheus text format """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, seconds, query_log):
+        statement_counts = {}
+        for statement, _ in query_log:
+            statement_counts[statement] = statement_counts.get(statement, 0) + 1
+        repeated = [st for st, count in statement_counts.items() if count >= N_PLUS_ONE_THRESHOLD]
+        if repeated:
+            print(f"N+1 WARNING: {endpoint} ran {statement_counts[repeated[0]]}x: {repeated[0][:120]}")
+
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0,
+                'latency_sum': 0.0,
+                'latency_samples': deque(maxlen=LATENCY_SAMPLES),
+                'queries': 0,
+                'query_seconds': 0.0,
+                'n_plus_one': 0
+            })
+            stats['requests'] += 1
+            stats['latency_sum'] += seconds
+            stats['latency_samples'].append(seconds)
+            stats['queries'] += len(query_log)
+            stats['query_seconds'] += sum(elapsed for _, elapsed in query_log)
+            if repeated:
+                stats['n_plus_one'] += 1
+
+    @staticmethod
+    def _quantile(sorted_samples, q):
+        if not sorted_samples:
+            return 0.0
+        # Nearest-rank quantile
+        index = max(math.ceil(q * len(sorted_samples)) - 1, 0)
+        return sorted_samples[index]
+
+    def render_prometheus(self):
+        lines = [
+            '# HELP edumentor_request_duration_seconds Request latency per endpoint.',
+            '# TYPE edumentor_request_duration_seconds summary'
+        ]
+        with self._lock:
+            snapshot = {name: dict(stats, latency_samples=sorted(stats['latency_samples']))
+                        for name, stats in self._endpoints.items()}
+
+        for endpoint, stats in sorted(snapshot.items()):
+            for q in (0.5, 0.95, 0.99):
+                value = self._quantile(stats['latency_samples'], q)
+                lines.append(f'edumentor_request_duration_seconds{{endpoint="{endpoint}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'edumentor_request_duration_seconds_sum{{endpoint="{endpoint}"}} {stats["latency_sum"]:.6f}')
+            lines.append(f'edumentor_request_duration_seconds_count{{endpoint="{endpoint}"}} {stats["requests"]}')
+
+        counters = [
+            ('edumentor_sql_queries_total', 'SQL statements issued per endpoint.', 'queries', '{}'),
+            ('edumentor_sql_query_seconds_total', 'Time spent in SQL per endpoint.', 'query_seconds', '{:.6f}'),
+            ('edumentor_n_plus_one_requests_total', 'Requests that repeated one statement at least N_PLUS_ONE_THRESHOLD times.', 'n_plus_one', '{}')
+        ]
+        for metric, help_text, field, fmt in counters:
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} counter')
+            for endpoint, stats in sorted(snapshot.items()):
+                lines.append(f'{metric}{{endpoint="{endpoint}"}} {fmt.format(stats[field])}')
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.query_log = []
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' in g:
+        endpoint = request.endpoint or 'unmatched'
+        request_metrics.record(endpoint, time.perf_counter() - g.request_started, g.query_log)
+    return response
+
+@app.after_request
+def remember_recent_write(response):
+    # Read-your-writes: get_read_connection() keeps this user on the primary for sticky_seconds
+    if g.get('db_wrote'):
+        session['last_write_at'] = time.time()
+    return response
+
 # --- Helper Function to Connect to DB ---
 def get_db_connection():
+    # Inside a request, every helper shares one pooled connection (released at teardown)
+    if has_request_context():
+        if 'db_conn' not in g:
+            conn = db_pool.acquire()
+            if conn is None:
+                return None
+            conn._request_bound = True
+            g.db_conn = conn
+        return g.db_conn
+    return db_pool.acquire()
+
+def read_from_replica():
+    """ True once this request has read from a replica: such rows may lag writes made by other users """
+    return has_request_context() and 'db_read_conn' in g
+
+def get_read_connection():
+    """ Connection for read-only routes: a healthy replica, unless this user wrote recently
+        (then the primary, so they see their own writes). Falls back to the primary when no replica is usable. """
+    if has_request_context():
+        if 'db_read_conn' not in g:
+            conn = None
+            last_write = session.get('last_write_at')
+            if not last_write or time.time() - last_write >= replica_config['sticky_seconds']:
+                conn = replica_router.acquire()
+            if conn is None:
+                return get_db_connection()
+            conn._request_bound = True
+            g.db_read_conn = conn
+        return g.db_read_conn
+    return replica_router.acquire() or db_pool.acquire()
+
+@app.teardown_appcontext
+def release_db_connection(exc):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        conn.release()
+    read_conn = g.pop('db_read_conn', None)
+    if read_conn is not None:
+        read_conn.release()
+
+# --- Reference Data Cache Configuration ---
+cache_config = {
+    'backend': 'memory',       # 'memory' (per-process LRU) or 'redis' (shared by all workers)
+    'ttl': 300,                # Seconds before a cached entry is reloaded even without invalidation
+    'max_entries': 256,        # LRU capacity of the in-process backend
+    'redis_url': 'redis://localhost:6379/0'
+}
+
+# --- NEW: Cache Backends ---
+class MemoryCacheBackend:
+    """ In-process LRU cache with per-entry expiry """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCacheBackend:
+    """ Shared cache for multi-worker deployments (requires the optional 'redis' package) """
+
+    def __init__(self, redis_url, namespace='edumentor:'):
+        import redis # Optional dependency: only needed when cache_config['backend'] == 'redis'
+        self._client = redis.Redis.from_url(redis_url)
+        self.namespace = namespace
+
+    def get(self, key):
+        raw = self._client.get(self.namespace + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(self.namespace + key, pickle.dumps(value), ex=int(ttl))
+
+    def delete(self, key):
+        self._client.delete(self.namespace + key)
+
+    def delete_prefix(self, prefix):
+        keys = list(self._client.scan_iter(match=self.namespace + prefix + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self):
+        return sum(1 for _ in self._client.scan_iter(match=self.namespace + '*'))
+
+
+def create_cache_backend(config, namespace='edumentor:'):
+    if config['backend'] == 'redis':
+        return RedisCacheBackend(config['redis_url'], namespace)
+    return MemoryCacheBackend(config['max_entries'])
+
+
+# --- Async Read Pool Configuration (optional, requires the 'aiomysql' package) ---
+async_read_config = {
+    'enabled': False,  # Off by default: without it, independent reads run one after another on the request connection
+    'minsize': 1,      # Connections opened when the pool starts
+    'maxsize': 20,     # Upper bound on concurrent async reads across all requests
+    'timeout': 10.0    # Seconds a request waits for its batch of concurrent reads
+}
+
+# --- NEW: Async Read Pool (Concurrent independent queries on an async MySQL driver) ---
+class AsyncReadPool:
+    """ Runs independent read-only queries concurrently on aiomysql. The event loop and its connection
+        pool live on one background thread shared by every request; views submit a batch with gather()
+        and wait for the slowest query instead of the sum of all of them. """
+
+    def __init__(self, connect_args, minsize, maxsize, timeout):
+        self.connect_args = connect_args
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._aiomysql = None
+        self._loop = None
+        self._pool = None
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._metrics = {'batches': 0, 'queries': 0, 'errors': 0}
+
+    def _ensure_started(self):
+        if self._pool is not None:
+            return
+        with self._start_lock:
+            if self._pool is not None:
+                return
+            import aiomysql # Optional dependency: only needed when async_read_config['enabled'] is True
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='async-read-loop', daemon=True).start()
+            # autocommit: every read sees the latest committed data, not a snapshot held by a pooled connection
+            create = aiomysql.create_pool(
+                host=self.connect_args['host'], user=self.connect_args['user'],
+                password=self.connect_args['password'], db=self.connect_args['database'],
+                minsize=self.minsize, maxsize=self.maxsize, autocommit=True
+            )
+            self._pool = asyncio.run_coroutine_threadsafe(create, loop).result(self.timeout)
+            self._aiomysql = aiomysql
+            self._loop = loop
+
+    async def _run(self, query, params):
+        started = time.time()
+        async with self._pool.acquire() as conn:
+            async with conn.cursor(self._aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall()
+        return list(rows), time.time() - started
+
+    async def _gather(self, queries):
+        names = list(queries)
+        results = await asyncio.gather(*(self._run(*queries[name]) for name in names))
+        return dict(zip(names, results))
+
+    def gather(self, queries):
+        """ Takes {name: (query, params)} and returns {name: (rows, seconds)} """
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._gather(queries), self._loop)
+        try:
+            results = future.result(self.timeout)
+        except Exception:
+            future.cancel()
+            with self._lock:
+                self._metrics['errors'] += 1
+            raise
+        with self._lock:
+            self._metrics['batches'] += 1
+            self._metrics['queries'] += len(queries)
+        return results
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+        if self._pool is not None:
+            stats['pool_size'] = self._pool.size
+            stats['pool_free'] = self._pool.freesize
+        return stats
+
+async_read_pool = AsyncReadPool(db_config, async_read_config['minsize'], async_read_config['maxsize'],
+                                async_read_config['timeout']) if async_read_config['enabled'] else None
+
+def run_read_queries(queries):
+    """ Runs independent read queries given as {name: (query, params)} and returns {name: rows}.
+        Uses the async pool concurrently when enabled, otherwise runs them in turn on the request connection. """
+    if async_read_pool is not None:
+        try:
+            results = async_read_pool.gather(queries)
+            for name, (_, seconds) in results.items():
+                _record_query(queries[name][0], seconds)
+            return {name: rows for name, (rows, _) in results.items()}
+        except Exception as err:
+            print(f"Async reads failed, falling back to the sync pool: {err}")
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
     try:
-        conn = mysql.connector.connect(**db_config)
-        return conn
-    except mysql.connector.Error as err:
-        print(f"Error connecting to database: {err}")
+        results = {}
+        for name, (query, params) in queries.items():
+            cursor.execute(query, params)
+            results[name] = cursor.fetchall()
+        return results
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# --- NEW: Read-Through Reference Data Cache (Subjects, Mentors) ---
+class ReferenceDataCache:
+    """ Read-through cache: get_or_load() serves cached rows or calls the loader on a miss.
+        Callers get deep copies, so routes can annotate rows without corrupting the cache. """
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _count(self, metric):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def get_or_load(self, key, loader):
+        value = self.backend.get(key)
+        if value is not None:
+            self._count('hits')
+            return copy.deepcopy(value)
+
+        self._count('misses')
+        value = loader()
+        if value is not None: # Missing rows are not cached
+            self.backend.set(key, value, self.ttl)
+        return copy.deepcopy(value)
+
+    def invalidate(self, prefix):
+        self._count('invalidations')
+        self.backend.delete_prefix(prefix)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['entries'] = self.backend.size()
+        stats['backend'] = type(self.backend).__name__
+        return stats
+
+
+reference_cache = ReferenceDataCache(create_cache_backend(cache_config), cache_config['ttl'])
+
+def _load_rows(query, params=()):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def get_all_subjects():
+    return reference_cache.get_or_load('subjects:all', lambda: _load_rows("SELECT * FROM Subjects"))
+
+def get_all_mentors():
+    return reference_cache.get_or_load('mentors:all', lambda: _load_rows("SELECT * FROM Mentors"))
+
+def get_subject(subject_id):
+    """ Returns one Subjects row as a dict, or None if it does not exist """
+    def load():
+        rows = _load_rows("SELECT * FROM Subjects WHERE subject_id = %s", (subject_id,))
+        return rows[0] if rows else None
+    return reference_cache.get_or_load(f'subjects:id:{subject_id}', load)
+
+def get_student_ids():
+    """ Returns every Students.student_id as a list (used to validate bulk imports) """
+    return reference_cache.get_or_load('students:ids', lambda: [row['student_id'] for row in _load_rows("SELECT student_id FROM Students")])
+
+def get_subjects_for_major(major):
+    # FIX APPLIED: Corrected the subject filter to be broad and ensure all 122 subjects are visible.
+    subject_query = """
+        SELECT subject_id, subject_name 
+        FROM Subjects 
+        WHERE major_area = %s 
+        OR major_area IN ('General', 'CSE', 'Database & Security', 'AI & Logic', 'Software Engineering', 'Algorithm Design')
+        ORDER BY subject_name
+    """
+    return reference_cache.get_or_load(f'subjects:major:{major}', lambda: _load_rows(subject_query, (major,)))
+
+# --- Page Cache Configuration ---
+page_cache_config = {
+    'max_bytes': 64 * 1024 * 1024, # Memory cap for rendered pages (least recently used evicted first)
+    'ttl': 300,                    # Safety net for changes not covered by the write-path invalidations
+    'backend': 'memory',           # Where per-user version stamps live: 'memory' (this process only) or 'redis' (every worker)
+    'max_entries': 100000,         # Stamps kept by the in-process backend
+    'stamp_ttl': 86400,            # Seconds an unused stamp is kept (an expired stamp only costs a re-render)
+    'redis_url': cache_config['redis_url']
+}
+
+# --- NEW: Per-User Rendered Page Cache (dashboard, progress, student goals) ---
+class PageCache:
+    """ LRU cache of rendered pages keyed by role, user and page, capped by total size.
+        Pages live in this process, but every key carries the user's version stamp from the stamps backend.
+        Write paths call invalidate_user() to replace the stamp, so with a shared (redis) backend a write
+        handled by one worker retires the pages cached by all of them. """
+
+    def __init__(self, max_bytes, ttl, stamps, stamp_ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stamps = stamps
+        self.stamp_ttl = stamp_ttl
+        self._entries = OrderedDict() # key -> (html, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _stamp(self, name):
+        stamp = self.stamps.get(name)
+        if stamp is None:
+            # Always a fresh random value: a lost stamp must never bring back pages cached under an older one
+            stamp = secrets.token_hex(8)
+            self.stamps.set(name, stamp, self.stamp_ttl)
+        return stamp
+
+    def key(self, role, user_id, page):
+        """ Taken before the page's data is read: a write that lands during the render replaces the stamp,
+            so the page is stored under a key nobody looks up again. """
+        # The date is part of the key because pages compare due dates against today
+        stamps = f"{self._stamp('epoch')}.{self._stamp(f'{role}:{int(user_id)}')}"
+        return f"{role}:{int(user_id)}:{page}:{datetime.now().strftime('%Y-%m-%d')}:{stamps}"
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] < time.time():
+                if entry is not None:
+                    self._remove(key)
+                self._metrics['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics['hits'] += 1
+            return entry[0]
+
+    def set(self, key, html):
+        size = len(html.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (html, size, time.time() + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._metrics['evictions'] += 1
+
+    def invalidate_user(self, role, user_id):
+        self.stamps.set(f'{role}:{int(user_id)}', secrets.token_hex(8), self.stamp_ttl)
+        prefix = f"{role}:{int(user_id)}:"
+        with self._lock: # Frees this process's copies now; other workers' copies are unreachable and age out
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._remove(key)
+            self._metrics['invalidations'] += 1
+
+    def clear(self):
+        self.stamps.set('epoch', secrets.token_hex(8), self.stamp_ttl)
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._metrics['invalidations'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['stamps_backend'] = type(self.stamps).__name__
+        return stats
+
+page_cache = PageCache(page_cache_config['max_bytes'], page_cache_config['ttl'],
+                       create_cache_backend(page_cache_config, namespace='edumentor:page-stamp:'),
+                       page_cache_config['stamp_ttl'])
+
+
+# --- NEW HELPER: Cached Unread Message Counts (Polled by the nav bar) ---
+UNREAD_COUNT_TTL = 30 # Seconds a cached count may be served before re-counting
+
+_unread_count_cache = {} # (user_id, role) -> (count, expires_at)
+_unread_count_lock = threading.Lock()
+
+UNREAD_COUNT_QUERY = statement_registry.register('messages.unread_count', """
+    SELECT COUNT(*) FROM Messages
+    WHERE recipient_id = %s AND recipient_role = %s AND is_read = FALSE
+""")
+
+def get_unread_count(user_id, role):
+    key = (int(user_id), role)
+    with _unread_count_lock:
+        cached = _unread_count_cache.get(key)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
+    conn = get_db_connection()
+    if not conn:
+        return 0
+    cursor = conn.cursor()
+    try:
+        cursor.execute(UNREAD_COUNT_QUERY, key)
+        count = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+        conn.close()
+
+    with _unread_count_lock:
+        _unread_count_cache[key] = (count, time.time() + UNREAD_COUNT_TTL)
+    return count
+
+def invalidate_unread_count(user_id, role):
+    with _unread_count_lock:
+        _unread_count_cache.pop((int(user_id), role), None)
+
+# --- Event Bus Configuration (Server-Sent Events push channel) ---
+# Each open /events/stream holds one worker thread while it waits, so with the default threaded or sync
+# workers a few open tabs would use up every worker. Pages therefore only open the stream when push is
+# enabled, which 'auto' does when the app runs under gevent (e.g. 'gunicorn -k gevent -w 4 app:app'):
+# with monkey patching, the queue and Redis socket waits below yield to other greenlets. Otherwise pages
+# poll /messages/unread_count. Multi-worker deployments need the 'redis' backend so events published
+# on one worker reach streams held open by the others.
+event_bus_config = {
+    'backend': 'memory', # 'memory' (single process) or 'redis' (pub/sub shared across workers)
+    'redis_url': 'redis://localhost:6379/0',
+    'queue_size': 100,   # Undelivered events buffered per connection (oldest dropped first)
+    'keepalive': 15,     # Seconds between comment pings on idle streams
+    'push': 'auto',      # 'auto' (push only under gevent), True or False
+    'max_streams': 1000  # Open streams per process; further ones get 503 and the page falls back to polling
+}
+
+# --- NEW: In-Process Pub/Sub for Push Events ---
+class MemorySubscription:
+    def __init__(self, bus, channel, queue_size):
+        self._bus = bus
+        self.channel = channel
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def deliver(self, event):
+        """ Never blocks the publisher: a slow client loses its oldest pending event instead """
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return True
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._bus._count('dropped')
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        """ Returns the next event, or None if nothing arrived within timeout seconds """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._bus._unsubscribe(self)
+
+
+class MemoryEventBus:
+    """ Fan-out of events to the subscriptions of one process, keyed by channel """
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._metrics = {'published': 0, 'delivered': 0, 'dropped': 0}
+
+    def _count(self, metric, amount=1):
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def subscribe(self, channel):
+        subscription = MemorySubscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+        self._count('published')
+        self._count('delivered', len(subscribers))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['channels'] = len(self._subscriptions)
+            stats['subscribers'] = sum(len(subs) for subs in self._subscriptions.values())
+        return stats
+
+
+class RedisSubscription:
+    def __init__(self, bus, pubsub):
+        self._bus = bus
+        self._pubsub = pubsub
+
+    def get(self, timeout):
+        message = self._pubsub.get_message(timeout=timeout)
+        return json.loads(message['data']) if message else None
+
+    def close(self):
+        self._pubsub.close()
+        self._bus._count('subscribers', -1)
+
+
+class RedisEventBus:
+    """ Cross-worker event bus on Redis pub/sub (requires the optional 'redis' package) """
+
+    def __init__(self, redis_url, namespace='edumentor:events:'):
+        import redis # Optional dependency: only needed when event_bus_config['backend'] == 'redis'
+        self._client = redis.Redis.from_url(redis_url)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._metrics = {'published': 0, 'subscribers': 0}
+
+    def _count(self, metric, amount=1):
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def subscribe(self, channel):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.namespace + channel)
+        self._count('subscribers')
+        return RedisSubscription(self, pubsub)
+
+    def publish(self, channel, event):
+        self._client.publish(self.namespace + channel, json.dumps(event))
+        self._count('published')
+
+    def stats(self):
+        with self._lock:
+            return dict(self._metrics)
+
+
+def create_event_bus(config):
+    if config['backend'] == 'redis':
+        return RedisEventBus(config['redis_url'])
+    return MemoryEventBus(config['queue_size'])
+
+event_bus = create_event_bus(event_bus_config)
+
+def push_enabled():
+    """ Whether pages should open /events/stream instead of polling (see event_bus_config['push']) """
+    if event_bus_config['push'] != 'auto':
+        return bool(event_bus_config['push'])
+    try:
+        from gevent import monkey # Optional dependency: only present when served by gevent workers
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+stream_stats = {'open': 0, 'rejected': 0}
+_stream_stats_lock = threading.Lock()
+
+def publish_event(role, user_id, event_type, data):
+    """ Pushes an event to every open stream of one user. Delivery is best effort: a failing
+        backend never breaks the write that triggered the event. """
+    try:
+        event_bus.publish(f"{role}:{int(user_id)}", {'type': event_type, 'data': data})
+    except Exception as err:
+        print(f"Error publishing {event_type} event: {err}")
+
+def notify_new_message(recipient_id, recipient_role, sender_role, content):
+    """ Called after a message commits: refreshes the unread count and pushes a 'message' event """
+    invalidate_unread_count(recipient_id, recipient_role)
+    publish_event(recipient_role, recipient_id, 'message', {'sender_role': sender_role, 'preview': content[:80]})
+
+def notify_goal_met(student_id, mentor_id, subject_name):
+    data = {'student_id': int(student_id), 'subject_name': subject_name}
+    publish_event('student', student_id, 'goal_met', data)
+    publish_event('mentor', mentor_id, 'goal_met', data)
+
+def build_praise_message(subject_name, student_name):
+    return f"⚡ SYSTEM ALERT: Progress Node {subject_name.upper()} Criticality Reached (100%+). Excellent Work, {student_name}!"
+
+
+# --- NEW HELPER: Set-Based Goal Evaluation (Automated Praise) ---
+def evaluate_goals(cursor, first_student_id=None, last_student_id=None):
+    """ Marks every open goal whose subject progress has reached 100% as met and inserts the praise
+        messages (one per student/subject pair) as one multi-row INSERT. Covers the students in
+        [first_student_id, last_student_id], or every student when no range is given.
+        Runs inside the caller's transaction and does not commit. The goal rows are read with FOR UPDATE and
+        only unmet goals qualify, so concurrent or repeated runs never praise the same goal twice.
+        Goals a mentor toggled by hand (mentor_override) are never re-evaluated.
+        Returns (met_goals, messages) for publish_goal_results() once the caller has committed. """
+    goal_query = """
+        SELECT sg.goal_id, sg.student_id, sg.subject_id, sg.mentor_id, s.name AS student_name, sub.subject_name
+        FROM SubjectGoals sg
+        JOIN StudentProgress sp ON sp.student_id = sg.student_id AND sp.subject_id = sg.subject_id
+        JOIN Students s ON sg.student_id = s.student_id
+        JOIN Subjects sub ON sg.subject_id = sub.subject_id
+        WHERE sg.is_met = FALSE AND sg.mentor_override = FALSE AND sp.progress_percentage >= 100
+    """
+    params = ()
+    if first_student_id is not None:
+        goal_query += " AND sg.student_id BETWEEN %s AND %s"
+        params = (first_student_id, last_student_id)
+    goal_query += " ORDER BY sg.goal_id FOR UPDATE"
+
+    cursor.execute(goal_query, params)
+    met_goals = cursor.fetchall()
+    if not met_goals:
+        return [], []
+
+    goal_ids = [goal['goal_id'] for goal in met_goals]
+    placeholders = ', '.join(['%s'] * len(goal_ids))
+    cursor.execute(f"UPDATE SubjectGoals SET is_met = TRUE WHERE goal_id IN ({placeholders}) AND is_met = FALSE", tuple(goal_ids))
+
+    # One praise message per student/subject pair, even when several goals are met at once
+    messages = []
+    praised_pairs = set()
+    for goal in met_goals:
+        pair = (goal['student_id'], goal['subject_id'])
+        if pair in praised_pairs:
+            continue
+        praised_pairs.add(pair)
+        content = build_praise_message(goal['subject_name'], goal['student_name'])
+        messages.append((goal['mentor_id'], goal['student_id'], content))
+
+    # executemany() sends the praise rows as a single multi-row INSERT
+    insert_query = "INSERT INTO Messages (sender_id, recipient_id, sender_role, recipient_role, content) VALUES (%s, %s, 'mentor', 'student', %s)"
+    cursor.executemany(insert_query, messages)
+    return met_goals, messages
+
+def publish_goal_results(met_goals, messages):
+    """ Post-commit side effects of evaluate_goals(): page invalidation, unread counts and push events """
+    for goal in met_goals:
+        page_cache.invalidate_user('student', goal['student_id'])
+        notify_goal_met(goal['student_id'], goal['mentor_id'], goal['subject_name'])
+    for _, recipient_id, content in messages:
+        notify_new_message(recipient_id, 'student', 'mentor', content)
+
+def run_goal_evaluation(first_student_id=None, last_student_id=None):
+    """ Evaluates open goals in its own transaction. Returns (goals_met, messages_sent). """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        met_goals, messages = evaluate_goals(cursor, first_student_id, last_student_id)
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    publish_goal_results(met_goals, messages)
+    return len(met_goals), len(messages)
+
+@app.cli.command('evaluate-goals')
+@click.option('--student', 'student_id', type=int, default=None, help='Evaluate one student only.')
+def evaluate_goals_command(student_id):
+    """ Mark met goals and send praise (safe to run periodically, e.g. from cron). """
+    started = time.time()
+    goals_met, messages_sent = run_goal_evaluation(student_id, student_id)
+    print(f"Goal evaluation: {goals_met} goals met, {messages_sent} praise messages in {time.time() - started:.3f}s.")
+
+
+# --- MODIFIED HELPER: Progress Calculation (A) ---
+def update_student_progress(student_id, subject_id):
+    """ Returns True on success so background jobs know whether to retry """
+    conn = get_db_connection()
+    
+    if conn:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            # Calls the stored procedure to calculate and update progress for the given student/subject pair
+            cursor.callproc('CalculateAndUpdateProgress', (student_id, subject_id))
+
+            # After updating progress, check this student's open goals (Automated Praise) in the same transaction
+            met_goals, messages = evaluate_goals(cursor, student_id, student_id)
+            conn.commit()
+
+            page_cache.invalidate_user('student', student_id)
+            publish_goal_results(met_goals, messages)
+            return True
+        except mysql.connector.Error as err:
+            conn.rollback()
+            print(f"Error during progress update and goal check: {err}")
+            return False
+        finally:
+            cursor.close()
+            conn.close()
+    return False
+
+# --- Background Job Queue Configuration ---
+job_queue_config = {
+    'num_workers': 2,     # Worker threads processing post-commit jobs
+    'max_retries': 3,     # Attempts after the first failure before a job is dropped
+    'retry_delay': 2.0    # Seconds before the first retry (doubles on each further attempt)
+}
+
+# --- NEW: In-Process Background Job Queue (Post-commit work off the request thread) ---
+class BackgroundJobQueue:
+    """ Runs post-commit jobs on a small pool of worker threads.
+        Jobs with the same coalesce key that are still waiting run only once, failed jobs
+        (handler returns False or raises) are retried with exponential backoff. """
+
+    def __init__(self, num_workers, max_retries, retry_delay):
+        self.num_workers = num_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._queue = deque() # Job dicts in FIFO order
+        self._pending_keys = set() # Coalesce keys of jobs waiting in the queue
+        self._cond = threading.Condition()
+        self._workers = []
+        self._running = 0
+        self._metrics = {
+            'enqueued': 0,
+            'coalesced': 0,
+            'completed': 0,
+            'retried': 0,
+            'failed': 0
+        }
+
+    def _start_workers(self):
+        # Caller must hold self._cond. Workers start lazily so CLI commands and scripts spawn no threads.
+        if self._workers:
+            return
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._work, name=f"edumentor-job-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def enqueue(self, job_type, func, args=(), coalesce_key=None, attempt=0):
+        with self._cond:
+            if coalesce_key is not None and coalesce_key in self._pending_keys:
+                self._metrics['coalesced'] += 1
+                return False
+            if coalesce_key is not None:
+                self._pending_keys.add(coalesce_key)
+            self._queue.append({
+                'type': job_type,
+                'func': func,
+                'args': args,
+                'coalesce_key': coalesce_key,
+                'attempt': attempt
+            })
+            if attempt == 0:
+                self._metrics['enqueued'] += 1
+            self._start_workers()
+            self._cond.notify()
+        return True
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                job = self._queue.popleft()
+                # Once running, a new job for the same key must run again (it may see newer data)
+                self._pending_keys.discard(job['coalesce_key'])
+                self._running += 1
+
+            try:
+                succeeded = job['func'](*job['args']) is not False
+            except Exception as err:
+                print(f"Error running background job {job['type']}: {err}")
+                succeeded = False
+
+            with self._cond:
+                self._running -= 1
+                if succeeded:
+                    self._metrics['completed'] += 1
+                elif job['attempt'] < self.max_retries:
+                    self._metrics['retried'] += 1
+                else:
+                    self._metrics['failed'] += 1
+                    print(f"Background job {job['type']}{job['args']} dropped after {job['attempt'] + 1} attempts.")
+
+            if not succeeded and job['attempt'] < self.max_retries:
+                delay = self.retry_delay * (2 ** job['attempt'])
+                retry = threading.Timer(delay, self.enqueue,
+                                        (job['type'], job['func'], job['args'], job['coalesce_key'], job['attempt'] + 1))
+                retry.daemon = True
+                retry.start()
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._metrics)
+            stats['depth'] = len(self._queue)
+            stats['running'] = self._running
+            stats['workers'] = len(self._workers)
+        return stats
+
+
+job_queue = BackgroundJobQueue(**job_queue_config)
+
+def enqueue_progress_update(student_id, subject_id):
+    """ Recalculates progress (and checks goals) for a student/subject pair after the request returns """
+    job_queue.enqueue('progress', update_student_progress, (student_id, subject_id),
+                      coalesce_key=('progress', int(student_id), int(subject_id)))
+
+
+# --- NEW HELPER: Materialized Study-Hour Aggregates (StudyHoursSummary) ---
+def record_study_hours(cursor, student_id, subject_id, mentor_id, duration):
+    """ Adds one logged session to StudyHoursSummary, the daily/weekly rollups and MentorStudent. Run on the same
+        connection (and transaction) as the StudyLog insert so everything commits or rolls back together. """
+    summary_query = """
+        INSERT INTO StudyHoursSummary (student_id, subject_id, mentor_id, total_hours, session_count, last_study_date)
+        VALUES (%s, %s, %s, %s, 1, CURRENT_TIMESTAMP)
+        ON DUPLICATE KEY UPDATE
+            total_hours = total_hours + VALUES(total_hours),
+            session_count = session_count + 1,
+            last_study_date = VALUES(last_study_date);
+    """
+    cursor.execute(summary_query, (student_id, subject_id, mentor_id, duration))
+
+    # StudyLog.study_date defaults to CURRENT_TIMESTAMP, so the session lands in today's buckets
+    daily_query = """
+        INSERT INTO StudyDailyRollup (student_id, subject_id, study_day, total_hours, session_count)
+        VALUES (%s, %s, CURRENT_DATE, %s, 1)
+        ON DUPLICATE KEY UPDATE
+            total_hours = total_hours + VALUES(total_hours),
+            session_count = session_count + 1;
+    """
+    cursor.execute(daily_query, (student_id, subject_id, duration))
+
+    weekly_query = """
+        INSERT INTO StudyWeeklyRollup (student_id, subject_id, week_start, total_hours, session_count)
+        VALUES (%s, %s, CURRENT_DATE - INTERVAL WEEKDAY(CURRENT_DATE) DAY, %s, 1)
+        ON DUPLICATE KEY UPDATE
+            total_hours = total_hours + VALUES(total_hours),
+            session_count = session_count + 1;
+    """
+    cursor.execute(weekly_query, (student_id, subject_id, duration))
+
+    association_query = """
+        INSERT INTO MentorStudent (mentor_id, student_id, first_interaction, last_interaction, session_count)
+        VALUES (%s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
+        ON DUPLICATE KEY UPDATE
+            last_interaction = VALUES(last_interaction),
+            session_count = session_count + 1;
+    """
+    cursor.execute(association_query, (mentor_id, student_id))
+
+
+def rebuild_study_summary():
+    """ Recomputes StudyHoursSummary from StudyLog plus StudyArchiveTotals in one transaction. Returns the row count. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM StudyHoursSummary")
+        cursor.execute("""
+            INSERT INTO StudyHoursSummary (student_id, subject_id, mentor_id, total_hours, session_count, last_study_date)
+            SELECT student_id, subject_id, mentor_id, SUM(hours), SUM(sessions), MAX(last_date)
+            FROM (
+                SELECT student_id, subject_id, mentor_id, SUM(duration_hours) AS hours, COUNT(*) AS sessions,
+                       MAX(study_date) AS last_date
+                FROM StudyLog
+                WHERE student_id IS NOT NULL AND subject_id IS NOT NULL AND mentor_id IS NOT NULL
+                GROUP BY student_id, subject_id, mentor_id
+                UNION ALL
+                SELECT student_id, subject_id, mentor_id, total_hours, session_count, last_study_date
+                FROM StudyArchiveTotals
+            ) t
+            GROUP BY student_id, subject_id, mentor_id;
+        """)
+        rows = cursor.rowcount
+        conn.commit()
+        return rows
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def verify_study_summary():
+    """ Compares StudyHoursSummary against StudyLog plus the archived totals and returns the mismatching
+        rows (missing, stale, or orphaned summary entries). An empty list means they agree. """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    verify_query = """
+        SELECT a.student_id, a.subject_id, a.mentor_id,
+               a.total_hours AS logged_hours, a.sessions AS logged_sessions,
+               h.total_hours AS summary_hours, h.session_count AS summary_sessions
+        FROM (
+            SELECT student_id, subject_id, mentor_id, SUM(hours) AS total_hours, SUM(sessions) AS sessions
+            FROM (
+                SELECT student_id, subject_id, mentor_id, SUM(duration_hours) AS hours, COUNT(*) AS sessions
+                FROM StudyLog
+                WHERE student_id IS NOT NULL AND subject_id IS NOT NULL AND mentor_id IS NOT NULL
+                GROUP BY student_id, subject_id, mentor_id
+                UNION ALL
+                SELECT student_id, subject_id, mentor_id, total_hours, session_count
+                FROM StudyArchiveTotals
+            ) t
+            GROUP BY student_id, subject_id, mentor_id
+        ) a
+        LEFT JOIN StudyHoursSummary h
+          ON h.student_id = a.student_id AND h.subject_id = a.subject_id AND h.mentor_id = a.mentor_id
+        WHERE h.student_id IS NULL OR h.total_hours <> a.total_hours OR h.session_count <> a.sessions
+        UNION ALL
+        SELECT h.student_id, h.subject_id, h.mentor_id, NULL, NULL, h.total_hours, h.session_count
+        FROM StudyHoursSummary h
+        WHERE NOT EXISTS (
+            SELECT 1 FROM StudyLog sl
+            WHERE sl.student_id = h.student_id AND sl.subject_id = h.subject_id AND sl.mentor_id = h.mentor_id
+        ) AND NOT EXISTS (
+            SELECT 1 FROM StudyArchiveTotals t
+            WHERE t.student_id = h.student_id AND t.subject_id = h.subject_id AND t.mentor_id = h.mentor_id
+        );
+    """
+    try:
+        cursor.execute(verify_query)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@app.cli.command('study-summary')
+@click.option('--rebuild', is_flag=True, help='Rebuild StudyHoursSummary from StudyLog before verifying.')
+def study_summary_command(rebuild):
+    """ Verify (and optionally rebuild) the StudyHoursSummary aggregate table. """
+    if rebuild:
+        rows = rebuild_study_summary()
+        print(f"StudyHoursSummary rebuilt: {rows} rows.")
+
+    mismatches = verify_study_summary()
+    if not mismatches:
+        print("StudyHoursSummary is consistent with StudyLog.")
+        return
+    print(f"StudyHoursSummary has {len(mismatches)} mismatching rows:")
+    for row in mismatches:
+        print(f"  student {row['student_id']} / subject {row['subject_id']} / mentor {row['mentor_id']}: "
+              f"log={row['logged_hours']}h ({row['logged_sessions']}) summary={row['summary_hours']}h ({row['summary_sessions']})")
+    raise SystemExit(1)
+
+
+# --- NEW HELPER: Mentor-Student Associations (MentorStudent index) ---
+ASSOCIATED_STUDENTS_QUERY = statement_registry.register('contacts.students', """
+    SELECT S.student_id, S.name, S.semester, ms.first_interaction, ms.last_interaction
+    FROM MentorStudent ms
+    JOIN Students S ON ms.student_id = S.student_id
+    WHERE ms.mentor_id = %s
+    ORDER BY S.name;
+""")
+
+ASSOCIATED_MENTORS_QUERY = statement_registry.register('contacts.mentors', """
+    SELECT M.mentor_id, M.name, M.expertise_area, ms.first_interaction, ms.last_interaction
+    FROM MentorStudent ms
+    JOIN Mentors M ON ms.mentor_id = M.mentor_id
+    WHERE ms.student_id = %s
+    ORDER BY M.name;
+""")
+
+def get_associated_students(cursor, mentor_id):
+    """ Students who have logged study time with this mentor, by name """
+    cursor.execute(ASSOCIATED_STUDENTS_QUERY, (mentor_id,))
+    return cursor.fetchall()
+
+def contacts_query(user_id, role):
+    """ Returns (query, params) for the people a user can message: a student's mentors or a mentor's students """
+    if role == 'student':
+        return ASSOCIATED_MENTORS_QUERY, (user_id,)
+    return ASSOCIATED_STUDENTS_QUERY, (user_id,)
+
+def contacts_result(rows, role):
+    """ Shapes association rows into the id/name/info/role contacts used by messages.html """
+    if role == 'student':
+        return [{'id': m['mentor_id'], 'name': m['name'], 'info': m['expertise_area'], 'role': 'mentor'} for m in rows]
+    return [{'id': s['student_id'], 'name': s['name'], 'info': s['semester'], 'role': 'student'} for s in rows]
+
+def rebuild_mentor_students():
+    """ Recomputes MentorStudent from StudyLog plus StudyArchiveTotals in one transaction. Returns the row count. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM MentorStudent")
+        cursor.execute("""
+            INSERT INTO MentorStudent (mentor_id, student_id, first_interaction, last_interaction, session_count)
+            SELECT mentor_id, student_id, MIN(first_date), MAX(last_date), SUM(sessions)
+            FROM (
+                SELECT mentor_id, student_id, MIN(study_date) AS first_date, MAX(study_date) AS last_date, COUNT(*) AS sessions
+                FROM StudyLog
+                WHERE mentor_id IS NOT NULL AND student_id IS NOT NULL
+                GROUP BY mentor_id, student_id
+                UNION ALL
+                SELECT mentor_id, student_id, first_study_date, last_study_date, session_count
+                FROM StudyArchiveTotals
+            ) t
+            GROUP BY mentor_id, student_id;
+        """)
+        rows = cursor.rowcount
+        conn.commit()
+        return rows
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.cli.command('mentor-students')
+def mentor_students_command():
+    """ Rebuild the MentorStudent association index from StudyLog. """
+    rows = rebuild_mentor_students()
+    print(f"MentorStudent rebuilt: {rows} associations.")
+
+
+# --- NEW HELPER: Time-Bucketed Study Rollups (Daily / Weekly trends) ---
+# bucket -> (rollup table, bucket column, SQL expression mapping StudyLog.study_date to its bucket, days per bucket)
+ROLLUP_BUCKETS = {
+    'day': ('StudyDailyRollup', 'study_day', 'DATE(study_date)', 1),
+    'week': ('StudyWeeklyRollup', 'week_start', 'DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY', 7)
+}
+MAX_TREND_BUCKETS = 366
+
+def backfill_study_rollups(since=None):
+    """ Rebuilds the daily and weekly rollups from StudyLog, either completely or from the
+        bucket containing `since` onwards. Buckets of archived terms are never rebuilt, since their
+        StudyLog rows are gone. Returns {bucket: rows_written}. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    written = {}
+    try:
+        archived_before = get_archived_before(cursor)
+        if archived_before:
+            archived_before = archived_before.date()
+            since = max(since, archived_before) if since else archived_before
+        for bucket, (table, column, bucket_expr, _) in ROLLUP_BUCKETS.items():
+            if since:
+                first_bucket = since - timedelta(days=since.weekday()) if bucket == 'week' else since
+                if archived_before and first_bucket < archived_before:
+                    first_bucket += timedelta(days=7) # The week straddling the archive boundary keeps its row
+                cursor.execute(f"DELETE FROM {table} WHERE {column} >= %s", (first_bucket,))
+                where, params = "WHERE study_date >= %s", (first_bucket,)
+            else:
+                cursor.execute(f"DELETE FROM {table}")
+                where, params = "", ()
+            cursor.execute(f"""
+                INSERT INTO {table} (student_id, subject_id, {column}, total_hours, session_count)
+                SELECT student_id, subject_id, {bucket_expr}, SUM(duration_hours), COUNT(*)
+                FROM StudyLog
+                {where}
+                GROUP BY student_id, subject_id, {bucket_expr};
+            """, params)
+            written[bucket] = cursor.rowcount
+            conn.commit() # One transaction per rollup table keeps lock time bounded
+        return written
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@app.cli.command('study-rollups')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Only rebuild buckets from this date (YYYY-MM-DD) onwards.')
+def study_rollups_command(since):
+    """ Backfill the daily and weekly StudyLog rollup tables. """
+    started = time.time()
+    written = backfill_study_rollups(since.date() if since else None)
+    print(f"Study rollups rebuilt in {time.time() - started:.1f}s: "
+          + ', '.join(f"{bucket}={rows} rows" for bucket, rows in written.items()))
+
+
+def get_study_trend(cursor, start_date, end_date, bucket='week', student_id=None, subject_id=None):
+    """ Returns a dense series [{'bucket': 'YYYY-MM-DD', 'hours': float, 'sessions': int}, ...] between
+        start_date and end_date (inclusive), read from the rollup tables. Buckets without study are 0. """
+    table, column, _, bucket_days = ROLLUP_BUCKETS[bucket]
+    if bucket == 'week':
+        start_date = start_date - timedelta(days=start_date.weekday())
+
+    filters = [f"{column} BETWEEN %s AND %s"]
+    params = [start_date, end_date]
+    if student_id is not None:
+        filters.append("student_id = %s")
+        params.append(student_id)
+    if subject_id is not None:
+        filters.append("subject_id = %s")
+        params.append(subject_id)
+
+    cursor.execute(f"""
+        SELECT {column} AS bucket, SUM(total_hours) AS hours, SUM(session_count) AS sessions
+        FROM {table}
+        WHERE {' AND '.join(filters)}
+        GROUP BY {column};
+    """, tuple(params))
+    found = {row['bucket']: row for row in cursor.fetchall()}
+
+    series = []
+    current = start_date
+    while current <= end_date:
+        row = found.get(current)
+        series.append({
+            'bucket': current.strftime('%Y-%m-%d'),
+            'hours': float(row['hours']) if row else 0.0,
+            'sessions': int(row['sessions']) if row else 0
+        })
+        current += timedelta(days=bucket_days)
+    return series
+
+# --- NEW HELPER: Batched Goal Progress (Replaces per-goal SUM lookups) ---
+def goals_with_progress_query(role):
+    owner_column = 'student_id' if role == 'student' else 'mentor_id'
+    order = 'DESC' if role == 'student' else 'ASC'
+    return f"""
+        SELECT sg.goal_id, sg.student_id, sg.subject_id, s.name as student_name, m.name as mentor_name,
+               sub.subject_name, sg.target_hours, sg.due_date, sg.is_met,
+               COALESCE(h.current_hours, 0) AS current_hours
+        FROM SubjectGoals sg
+        JOIN Students s ON sg.student_id = s.student_id
+        JOIN Mentors m ON sg.mentor_id = m.mentor_id
+        JOIN Subjects sub ON sg.subject_id = sub.subject_id
+        LEFT JOIN (
+            SELECT hs.student_id, hs.subject_id, SUM(hs.total_hours) AS current_hours
+            FROM StudyHoursSummary hs
+            JOIN (SELECT DISTINCT student_id, subject_id FROM SubjectGoals WHERE {owner_column} = %s) gp
+              ON hs.student_id = gp.student_id AND hs.subject_id = gp.subject_id
+            GROUP BY hs.student_id, hs.subject_id
+        ) h ON h.student_id = sg.student_id AND h.subject_id = sg.subject_id
+        WHERE sg.{owner_column} = %s
+        ORDER BY sg.due_date {order};
+    """
+
+for _role in ('student', 'mentor'):
+    statement_registry.register(f'goals.with_progress.{_role}', goals_with_progress_query(_role))
+
+def fetch_goals_with_progress(cursor, role, user_id):
+    """ Returns every goal owned by a student or mentor with current_hours and progress_percent filled in.
+        Hours for all goals come from one grouped lookup on StudyHoursSummary instead of one SUM query per goal. """
+    cursor.execute(goals_with_progress_query(role), (user_id, user_id))
+    goals = cursor.fetchall()
+
+    for goal in goals:
+        current_hours = float(goal['current_hours']) if goal['current_hours'] is not None else 0.0
+        target_hours = float(goal['target_hours'])
+
+        goal['current_hours'] = current_hours
+
+        # DIRECT PROGRESS CALCULATION (Cap the display at 100%)
+        if target_hours > 0:
+            goal['progress_percent'] = min((current_hours / target_hours) * 100, 100.0)
+        else:
+            goal['progress_percent'] = 0.0
+
+    return goals
+
+# --- NEW HELPER: Keyset-Paginated Study Log Feed (Dashboard) ---
+DASHBOARD_PAGE_SIZE = 50
+
+def encode_page_cursor(position_time, row_id):
+    """ Encodes a (timestamp, id) keyset position as an opaque page cursor """
+    return f"{position_time.strftime('%Y-%m-%dT%H:%M:%S')}_{row_id}"
+
+def decode_page_cursor(cursor_value):
+    """ Returns (timestamp, id) for a page cursor, or None if it is malformed """
+    try:
+        date_part, id_part = cursor_value.rsplit('_', 1)
+        return datetime.strptime(date_part, '%Y-%m-%dT%H:%M:%S'), int(id_part)
+    except (ValueError, AttributeError):
         return None
 
-# --- NEW HELPER: Send Automated Message (For Automated Praise) ---
-def send_automated_message(sender_id, recipient_id, content):
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor()
-        try:
-            # Sender role is 'mentor' for automated praise
-            insert_query = "INSERT INTO Messages (sender_id, recipient_id, sender_role, content) VALUES (%s, %s, 'mentor', %s)"
-            cursor.execute(insert_query, (sender_id, recipient_id, content))
-            conn.commit()
-        except mysql.connector.Error as err:
-            print(f"Error sending automated message: {err}")
-        finally:
-            cursor.close()
-            conn.close()
+def study_log_page_query(role, user_id, after=None, limit=DASHBOARD_PAGE_SIZE):
+    """ Returns (query, params) for one page of a student's or mentor's study log feed,
+        newest first. Pages seek past the (study_date, log_id) of the previous page instead
+        of using OFFSET, so later pages cost the same as the first. """
+    if role == 'student':
+        query = """
+            SELECT StudyLog.log_id, StudyLog.study_date, StudyLog.duration_hours, 
+                   Subjects.subject_name, Mentors.name as mentor_name
+            FROM StudyLog
+            JOIN Subjects ON StudyLog.subject_id = Subjects.subject_id
+            JOIN Mentors ON StudyLog.mentor_id = Mentors.mentor_id
+            WHERE StudyLog.student_id = %s
+        """
+    else:
+        query = """
+            SELECT StudyLog.log_id, StudyLog.study_date, StudyLog.duration_hours, 
+                   Subjects.subject_name, Students.name as student_name, Students.semester
+            FROM StudyLog
+            JOIN Subjects ON StudyLog.subject_id = Subjects.subject_id
+            JOIN Students ON StudyLog.student_id = Students.student_id
+            WHERE StudyLog.mentor_id = %s
+        """
+    params = [user_id]
+
+    if after:
+        after_date, after_id = after
+        query += " AND (StudyLog.study_date < %s OR (StudyLog.study_date = %s AND StudyLog.log_id < %s))"
+        params += [after_date, after_date, after_id]
 
+    # Fetch one extra row to know whether another page exists
+    query += " ORDER BY StudyLog.study_date DESC, StudyLog.log_id DESC LIMIT %s"
+    params.append(limit + 1)
+    return query, tuple(params)
 
-# --- MODIFIED HELPER: Progress Calculation (A) ---
-def update_student_progress(student_id, subject_id):
-    conn = get_db_connection()
-    mentor_id = None
-    subject_name = None
-    
-    if conn:
-        cursor = conn.cursor()
+def study_log_page_result(logs, limit=DASHBOARD_PAGE_SIZE):
+    """ Trims the look-ahead row and returns (logs, next_cursor) """
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_page_cursor(logs[-1]['study_date'], logs[-1]['log_id'])
+    return logs, next_cursor
+
+def fetch_study_log_page(cursor, role, user_id, after=None, limit=DASHBOARD_PAGE_SIZE):
+    cursor.execute(*study_log_page_query(role, user_id, after, limit))
+    return study_log_page_result(cursor.fetchall(), limit)
+
+for _role in ('student', 'mentor'):
+    statement_registry.register(f'study_log.feed.{_role}', study_log_page_query(_role, 0)[0])
+    statement_registry.register(f'study_log.feed.{_role}.after', study_log_page_query(_role, 0, (datetime.min, 0))[0])
+
+# --- NEW HELPER: Keyset-Paginated, Role-Aware Inbox ---
+INBOX_PAGE_SIZE = 30
+
+def inbox_page_query(user_id, role, after=None, limit=INBOX_PAGE_SIZE):
+    """ Returns (query, params) for one page of a user's inbox, newest first.
+        Filtering on recipient_role keeps student and mentor IDs from colliding, and the
+        (recipient_id, recipient_role, timestamp) index serves the ORDER BY without a filesort. """
+    # Use COALESCE to reliably retrieve the sender's name regardless of sender_role.
+    inbox_query = """
+        SELECT m.message_id, m.content, m.timestamp, m.sender_role, m.is_read, m.sender_id,
+               COALESCE(S.name, T.name) AS sender_name
+        FROM Messages m
+        LEFT JOIN Students S ON m.sender_id = S.student_id AND m.sender_role = 'student'
+        LEFT JOIN Mentors T ON m.sender_id = T.mentor_id AND m.sender_role = 'mentor'
+        WHERE m.recipient_id = %s AND m.recipient_role = %s
+    """
+    params = [user_id, role]
+
+    if after:
+        after_timestamp, after_id = after
+        inbox_query += " AND (m.timestamp < %s OR (m.timestamp = %s AND m.message_id < %s))"
+        params += [after_timestamp, after_timestamp, after_id]
+
+    # Fetch one extra row to know whether another page exists
+    inbox_query += " ORDER BY m.timestamp DESC, m.message_id DESC LIMIT %s"
+    params.append(limit + 1)
+    return inbox_query, tuple(params)
+
+def inbox_page_result(messages, limit=INBOX_PAGE_SIZE):
+    """ Trims the look-ahead row and returns (messages, next_cursor) """
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_page_cursor(messages[-1]['timestamp'], messages[-1]['message_id'])
+    return messages, next_cursor
+
+def fetch_inbox_page(cursor, user_id, role, after=None, limit=INBOX_PAGE_SIZE):
+    cursor.execute(*inbox_page_query(user_id, role, after, limit))
+    return inbox_page_result(cursor.fetchall(), limit)
+
+statement_registry.register('inbox.page', inbox_page_query(0, 'student')[0])
+statement_registry.register('inbox.page.after', inbox_page_query(0, 'student', (datetime.min, 0))[0])
+
+def mark_messages_read(cursor, user_id, role, message_ids):
+    """ Marks this user's messages among message_ids as read and refreshes the unread count.
+        Returns the number of messages that were unread. """
+    if not message_ids:
+        return 0
+    placeholders = ', '.join(['%s'] * len(message_ids))
+    cursor.execute(f"""
+        UPDATE Messages SET is_read = TRUE
+        WHERE recipient_id = %s AND recipient_role = %s AND is_read = FALSE AND message_id IN ({placeholders})
+    """, (user_id, role, *message_ids))
+    marked = cursor.rowcount
+    if marked:
+        invalidate_unread_count(user_id, role)
+    return marked
+
+# --- Credential Configuration ---
+credential_config = {
+    'iterations': 260000,            # PBKDF2-SHA256 work factor; tune with benchmarks/kdf_bench.py
+    'workers': 4,                    # Threads running the KDF (hashlib releases the GIL while hashing)
+    'max_pending': 64,               # Logins waiting for a verifier before new ones are turned away
+    'timeout': 5.0,                  # Seconds a request waits for its verification
+    'failure_window': 900,           # Seconds failed attempts are remembered
+    'max_failures_per_account': 5,
+    'max_failures_per_ip': 50,
+    'max_tracked': 100000            # Throttle keys kept in memory (oldest dropped first)
+}
+
+PASSWORD_SCHEME = 'pbkdf2_sha256'
+
+# --- NEW HELPER: Password Hashing (PBKDF2-SHA256, gradual migration from plaintext) ---
+def hash_password(password, iterations=None):
+    """ Returns 'pbkdf2_sha256$<iterations>$<salt>$<digest>' for storage in the password column """
+    iterations = iterations or credential_config['iterations']
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f"{PASSWORD_SCHEME}${iterations}${base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+
+def check_password(password, stored):
+    """ Returns (matches, needs_rehash). Values not in the hashed format are legacy plaintext rows,
+        which always need a rehash once the password is confirmed. """
+    if stored.startswith(PASSWORD_SCHEME + '$'):
         try:
-            # Calls the stored procedure to calculate and update progress for the given student/subject pair
-            cursor.callproc('CalculateAndUpdateProgress', (student_id, subject_id))
-            conn.commit()
-            
-            # After updating progress, check for goal completion (Automated Praise)
-            # Use a dictionary cursor to fetch results clearly for debugging/use if needed
-            dict_cursor = conn.cursor(dictionary=True)
-
-            dict_cursor.execute("""
-                SELECT sg.mentor_id, sub.subject_name 
-                FROM SubjectGoals sg ON sp.student_id = sg.student_id AND sp.subject_id = sg.subject_id
-                JOIN Subjects sub ON sg.subject_id = sub.subject_id
-                WHERE sp.student_id = %s AND sp.subject_id = %s 
-                AND sp.progress_percentage >= 100 AND sg.is_met = FALSE
-                LIMIT 1
-            """, (student_id, subject_id))
-            
-            goal_check_result = dict_cursor.fetchone()
-            
-            if goal_check_result:
-                # Need to use the non-dict cursor for subsequent commands
-                
-                mentor_id = goal_check_result['mentor_id']
-                subject_name = goal_check_result['subject_name']
-                
-                # 1. Update Goal Status to MET to prevent spamming
-                update_goal_query = """
-                    UPDATE SubjectGoals 
-                    SET is_met = TRUE 
-                    WHERE student_id = %s AND subject_id = %s AND is_met = FALSE
-                """
-                cursor.execute(update_goal_query, (student_id, subject_id))
-                conn.commit()
-
-                # 2. Fetch student name
-                dict_cursor.execute("SELECT name FROM Students WHERE student_id = %s", (student_id,))
-                student_name_result = dict_cursor.fetchone()
-                
-                if student_name_result:
-                    student_name = student_name_result['name']
-
-                    # 3. Send Automated Praise Message
-                    if mentor_id and student_name:
-                        content = f"⚡ SYSTEM ALERT: Progress Node {subject_name.upper()} Criticality Reached (100%+). Excellent Work, {student_name}!"
-                        send_automated_message(mentor_id, student_id, content)
+            _, iterations, salt, expected = stored.split('$')
+            iterations = int(iterations)
+            salt, expected = base64.b64decode(salt), base64.b64decode(expected)
+        except ValueError:
+            return False, False
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+        matches = hmac.compare_digest(digest, expected)
+        return matches, matches and iterations != credential_config['iterations']
+    matches = hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+    return matches, matches
 
-        except mysql.connector.Error as err:
-            print(f"Error during progress update and goal check: {err}")
+
+class PasswordVerifier:
+    """ Runs KDF work on a bounded thread pool so a login burst queues for a fixed number of
+        hashing threads instead of saturating every request worker. """
+
+    def __init__(self, workers, max_pending, timeout):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='edumentor-kdf')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._dummy_hash = None
+        self._metrics = {'verified': 0, 'hashed': 0, 'rejected_busy': 0, 'timeouts': 0}
+
+    def _submit(self, func, *args):
+        """ Returns the result, or None when the pool is saturated or the call times out """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._metrics['rejected_busy'] += 1
+                return None
+            self._pending += 1
+        try:
+            return self._executor.submit(func, *args).result(self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._metrics['timeouts'] += 1
+            return None
         finally:
-            # Ensure all cursors are closed
-            if 'dict_cursor' in locals() and dict_cursor:
-                dict_cursor.close()
-            if cursor:
-                 cursor.close()
-            conn.close()
+            with self._lock:
+                self._pending -= 1
+
+    def verify(self, password, stored):
+        """ Returns (matches, needs_rehash), or None if the verifier is overloaded.
+            Unknown accounts (stored is None) are checked against a dummy hash so they take as long as real ones. """
+        if stored is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = hash_password(base64.b64encode(os.urandom(12)).decode())
+            result = self._submit(check_password, password, self._dummy_hash)
+            return None if result is None else (False, False)
+        result = self._submit(check_password, password, stored)
+        if result is not None:
+            with self._lock:
+                self._metrics['verified'] += 1
+        return result
+
+    def hash(self, password):
+        result = self._submit(hash_password, password)
+        if result is not None:
+            with self._lock:
+                self._metrics['hashed'] += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['pending'] = self._pending
+        return stats
+
+password_verifier = PasswordVerifier(credential_config['workers'], credential_config['max_pending'],
+                                     credential_config['timeout'])
+
+
+# --- NEW: Failed-Login Throttle (Short-circuits brute force before MySQL) ---
+class LoginThrottle:
+    """ Counts failed logins per key (account or client IP) within a fixed window.
+        Keys are kept in LRU order and capped so a spray of distinct keys cannot exhaust memory. """
+
+    def __init__(self, window, max_tracked):
+        self.window = window
+        self.max_tracked = max_tracked
+        self._failures = OrderedDict() # key -> (count, window_started_at)
+        self._lock = threading.Lock()
+        self._metrics = {'blocked': 0, 'failures': 0}
+
+    def _current(self, key, now):
+        entry = self._failures.get(key)
+        if entry and now - entry[1] > self.window:
+            del self._failures[key]
+            return None
+        return entry
+
+    def is_blocked(self, key, limit):
+        with self._lock:
+            entry = self._current(key, time.time())
+            if entry and entry[0] >= limit:
+                self._metrics['blocked'] += 1
+                return True
+            return False
+
+    def record_failure(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._current(key, now)
+            self._failures[key] = (entry[0] + 1, entry[1]) if entry else (1, now)
+            self._failures.move_to_end(key)
+            self._metrics['failures'] += 1
+            while len(self._failures) > self.max_tracked:
+                self._failures.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['tracked'] = len(self._failures)
+        return stats
+
+login_throttle = LoginThrottle(credential_config['failure_window'], credential_config['max_tracked'])
+
+
+# --- Session Store Configuration ---
+# With more than one worker process, use the 'redis' backend so every worker sees the same sessions.
+session_config = {
+    'backend': 'memory',       # 'memory' (per-process LRU) or 'redis' (shared by all workers)
+    'ttl': 86400,              # Seconds a session (and its cached principal) lives after its last change
+    'max_entries': 100000,     # LRU capacity of the in-process backend (sessions + principals)
+    'redis_url': 'redis://localhost:6379/1'
+}
+
+# --- NEW: Server-Side Sessions (The cookie carries only an opaque session id) ---
+class ServerSideSession(CallbackDict, SessionMixin):
+    """ Session dict stored in the session backend; any change marks it for saving """
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.previous_sid = None
+
+    def regenerate(self):
+        """ Issues a fresh session id (called at login so a pre-login id cannot be reused) """
+        if self.previous_sid is None and not self.new:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """ Keeps session data in a cache backend under 'session:<sid>' instead of a signed cookie """
+
+    def __init__(self, store, ttl):
+        self.store = store
+        self.ttl = ttl
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.get('session:' + sid)
+            if data is not None:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.previous_sid:
+            self.store.delete('session:' + session.previous_sid)
+        if not session:
+            # Emptied (logout) or never used: nothing to keep
+            if not session.new:
+                self.store.delete('session:' + session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        if not session.modified:
+            return
+        self.store.set('session:' + session.sid, dict(session), self.ttl)
+        response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                            httponly=self.get_cookie_httponly(app), domain=domain, path=path,
+                            secure=self.get_cookie_secure(app), samesite=self.get_cookie_samesite(app))
+
+session_store = create_cache_backend(session_config, namespace='edumentor:sessions:')
+app.session_interface = ServerSideSessionInterface(session_store, session_config['ttl'])
+
+
+# --- NEW HELPER: Cached Principal (Profile attributes routes need, loaded once per login) ---
+def principal_from_row(role, user):
+    """ Compact record cached for a logged-in user: id, role, name and major (student) or expertise (mentor) """
+    if role == 'student':
+        return {'id': user['student_id'], 'role': role, 'name': user['name'], 'major': user.get('major') or 'General'}
+    return {'id': user['mentor_id'], 'role': role, 'name': user['name'], 'expertise': user.get('expertise_area')}
+
+def cache_principal(role, user):
+    principal = principal_from_row(role, user)
+    session_store.set(f"principal:{role}:{int(principal['id'])}", principal, session_config['ttl'])
+    return principal
+
+def principal_from_session():
+    """ Stand-in built from the login session when MySQL cannot be reached: name only, default major """
+    role = session['role']
+    principal = {'id': session['user_id'], 'role': role, 'name': session.get('name')}
+    if role == 'student':
+        principal['major'] = 'General'
+    else:
+        principal['expertise'] = None
+    return principal
+
+def get_principal():
+    """ Returns the current user's principal, reloading it from MySQL only if it is not cached.
+        If the reload cannot run (pool exhausted, database down) the session's stand-in is used for this
+        request only, so the next request retries the load. """
+    if 'user_id' not in session:
+        return None
+    if 'principal' not in g:
+        role, user_id = session['role'], session['user_id']
+        principal = session_store.get(f"principal:{role}:{int(user_id)}")
+        if principal is None:
+            if role == 'student':
+                query = "SELECT student_id, name, major FROM Students WHERE student_id = %s"
+            else:
+                query = "SELECT mentor_id, name, expertise_area FROM Mentors WHERE mentor_id = %s"
+            conn = get_db_connection()
+            if conn is None:
+                principal = principal_from_session()
+            else:
+                try:
+                    cursor = conn.cursor(dictionary=True)
+                    try:
+                        cursor.execute(query, (user_id,))
+                        user = cursor.fetchone()
+                    finally:
+                        cursor.close()
+                    principal = cache_principal(role, user) if user else None
+                except mysql.connector.Error as err:
+                    print(f"Error loading principal: {err}")
+                    principal = principal_from_session()
+        g.principal = principal
+    return g.principal
+
+def drop_principal(role, user_id):
+    """ Called after writes to a user's profile row; the next request reloads it.
+        The cached fields (name, major, expertise_area) are only written at registration and by AddMentor,
+        both for new ids, and only DeleteMentor removes a row, so delete_mentor is the one caller. Any new
+        route that updates a profile row must call this after committing. """
+    session_store.delete(f"principal:{role}:{int(user_id)}")
 
 # --- Routes ---
 
@@ -123,32 +2261,73 @@ def login():
         password = request.form['password']
         role = request.form['role'] 
 
+        # Throttled accounts and clients are turned away before any query or hashing
+        account_key = ('account', role, email.strip().lower())
+        ip_key = ('ip', request.remote_addr)
+        if (login_throttle.is_blocked(account_key, credential_config['max_failures_per_account'])
+                or login_throttle.is_blocked(ip_key, credential_config['max_failures_per_ip'])):
+            flash('ACCESS DENIED: Too many failed attempts. Try again later.', 'error')
+            return redirect(url_for('login'))
+
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
         if role == 'student':
-            query = "SELECT * FROM Students WHERE email = %s AND password = %s"
+            query = "SELECT * FROM Students WHERE email = %s"
         else:
-            query = "SELECT * FROM Mentors WHERE email = %s AND password = %s"
+            query = "SELECT * FROM Mentors WHERE email = %s"
 
-        cursor.execute(query, (email, password))
+        cursor.execute(query, (email,))
         user = cursor.fetchone()
 
         cursor.close()
         conn.close()
 
-        if user:
+        result = password_verifier.verify(password, user['password'] if user else None)
+        if result is None:
+            flash('SYSTEM BUSY: Please try logging in again in a moment.', 'error')
+            return redirect(url_for('login'))
+
+        matches, needs_rehash = result
+        if matches:
+            login_throttle.reset(account_key)
             # Note: For mentors, we still use 'user_id' but store their 'mentor_id'
-            session['user_id'] = user['student_id'] if role == 'student' else user['mentor_id']
+            user_id = user['student_id'] if role == 'student' else user['mentor_id']
+            if needs_rehash:
+                rehash_password(role, user_id, user['password'], password)
+            cache_principal(role, user)
+            session.regenerate()
+            session['user_id'] = user_id
             session['name'] = user['name']
             session['role'] = role
             return redirect(url_for('dashboard'))
         else:
+            login_throttle.record_failure(account_key)
+            login_throttle.record_failure(ip_key)
             flash('ACCESS DENIED: Invalid Credentials', 'error')
             return redirect(url_for('login'))
 
     return render_template('login.html')
 
+def rehash_password(role, user_id, old_value, password):
+    """ Replaces a plaintext (or outdated) password with a current hash after a successful login.
+        The UPDATE only applies if the stored value is unchanged, so concurrent logins cannot clobber each other. """
+    new_hash = password_verifier.hash(password)
+    if new_hash is None:
+        return # Busy: the next login retries the migration
+    table, id_column = ('Students', 'student_id') if role == 'student' else ('Mentors', 'mentor_id')
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"UPDATE {table} SET password = %s WHERE {id_column} = %s AND password = %s",
+                       (new_hash, user_id, old_value))
+        conn.commit()
+    except mysql.connector.Error as err:
+        print(f"Error rehashing password: {err}")
+    finally:
+        cursor.close()
+        conn.close()
+
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     """ Handles New User Registration """
@@ -162,6 +2341,11 @@ def register():
         # NEW LINE: Fetch the major field
         major = request.form.get('major')
 
+        password = password_verifier.hash(password)
+        if password is None:
+            flash('SYSTEM BUSY: Please try registering again in a moment.', 'error')
+            return redirect(url_for('register'))
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
@@ -175,6 +2359,7 @@ def register():
                 cursor.execute(query, (name, email, password, extra_info))
             
             conn.commit()
+            reference_cache.invalidate('students:' if role == 'student' else 'mentors:')
             flash('REGISTRATION SUCCESSFUL. PLEASE LOGIN.', 'success')
             return redirect(url_for('login'))
             
@@ -192,43 +2377,40 @@ def logout():
     session.clear()
     return redirect(url_for('index'))
 
+PRESSING_GOAL_QUERY = statement_registry.register('goals.most_pressing', """
+    SELECT sg.due_date, sg.target_hours, sub.subject_name
+    FROM SubjectGoals sg
+    JOIN Subjects sub ON sg.subject_id = sub.subject_id
+    WHERE sg.student_id = %s AND sg.is_met = FALSE
+    ORDER BY sg.due_date ASC
+    LIMIT 1
+""")
+
 @app.route('/dashboard')
 def dashboard():
     if 'user_id' not in session:
         return redirect(url_for('login'))
-    
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+
+    cache_key = page_cache.key(session['role'], session['user_id'], 'dashboard')
+    html = page_cache.get(cache_key)
+    if html is not None:
+        return html
     
     logs = []
+    next_cursor = None
     current_goal = None # Initialize new variable
 
     if session['role'] == 'student':
         student_id = session['user_id']
-        # Student View: Fetch logs created BY this student
-        query = """
-            SELECT StudyLog.study_date, StudyLog.duration_hours, 
-                   Subjects.subject_name, Mentors.name as mentor_name
-            FROM StudyLog
-            JOIN Subjects ON StudyLog.subject_id = Subjects.subject_id
-            JOIN Mentors ON StudyLog.mentor_id = Mentors.mentor_id
-            WHERE StudyLog.student_id = %s
-            ORDER BY StudyLog.study_date DESC
-        """
-        cursor.execute(query, (student_id,))
-        logs = cursor.fetchall()
 
         # --- NEW FEATURE: Fetch Most Pressing Goal ---
-        goal_query = """
-            SELECT sg.due_date, sg.target_hours, sub.subject_name
-            FROM SubjectGoals sg
-            JOIN Subjects sub ON sg.subject_id = sub.subject_id
-            WHERE sg.student_id = %s AND sg.is_met = FALSE
-            ORDER BY sg.due_date ASC
-            LIMIT 1
-        """
-        cursor.execute(goal_query, (student_id,))
-        goal_data = cursor.fetchone()
+        # The first page of logs created BY this student and the goal lookup are independent reads
+        results = run_read_queries({
+            'logs': study_log_page_query('student', student_id),
+            'goal': (PRESSING_GOAL_QUERY, (student_id,))
+        })
+        logs, next_cursor = study_log_page_result(results['logs'])
+        goal_data = results['goal'][0] if results['goal'] else None
 
         if goal_data:
             current_goal = {
@@ -240,24 +2422,46 @@ def dashboard():
             }
         
     elif session['role'] == 'mentor':
-        # Mentor View: Fetch logs assigned TO this mentor
-        query = """
-            SELECT StudyLog.study_date, StudyLog.duration_hours, 
-                   Subjects.subject_name, Students.name as student_name, Students.semester
-            FROM StudyLog
-            JOIN Subjects ON StudyLog.subject_id = Subjects.subject_id
-            JOIN Students ON StudyLog.student_id = Students.student_id
-            WHERE StudyLog.mentor_id = %s
-            ORDER BY StudyLog.study_date DESC
-        """
-        cursor.execute(query, (session['user_id'],))
-        logs = cursor.fetchall()
+        # Mentor View: Fetch the first page of logs assigned TO this mentor
+        results = run_read_queries({'logs': study_log_page_query('mentor', session['user_id'])})
+        logs, next_cursor = study_log_page_result(results['logs'])
 
+    html = render_template('dashboard.html', name=session['name'], role=session['role'], logs=logs,
+                           next_cursor=next_cursor, current_goal=current_goal, push_enabled=push_enabled())
+    page_cache.set(cache_key, html)
+    return html
 
-    cursor.close()
-    conn.close()
-    
-    return render_template('dashboard.html', name=session['name'], role=session['role'], logs=logs, current_goal=current_goal)
+# --- NEW ROUTE: Lazy-loaded Dashboard Log Pages (JSON) ---
+@app.route('/dashboard/logs')
+def dashboard_logs():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required.'}), 401
+
+    after = None
+    if request.args.get('cursor'):
+        after = decode_page_cursor(request.args['cursor'])
+        if after is None:
+            return jsonify({'error': 'Invalid cursor.'}), 400
+    limit = min(max(request.args.get('limit', DASHBOARD_PAGE_SIZE, type=int), 1), 200)
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        logs, next_cursor = fetch_study_log_page(cursor, session['role'], session['user_id'], after, limit)
+    finally:
+        cursor.close()
+        conn.close()
+
+    for log in logs:
+        log['study_date'] = log['study_date'].strftime('%Y-%m-%d %H:%M:%S')
+        log['duration_hours'] = str(log['duration_hours'])
+
+    return jsonify({'logs': logs, 'next_cursor': next_cursor})
+
+STUDY_LOG_INSERT_QUERY = statement_registry.register('study_log.insert', """
+    INSERT INTO StudyLog (student_id, subject_id, mentor_id, duration_hours)
+    VALUES (%s, %s, %s, %s)
+""")
 
 @app.route('/log_study', methods=['GET', 'POST'])
 def log_study():
@@ -291,52 +2495,44 @@ def log_study():
         
         # --- END OF REMOVED INTEGRITY CHECK ---
         
-        insert_query = """
-            INSERT INTO StudyLog (student_id, subject_id, mentor_id, duration_hours)
-            VALUES (%s, %s, %s, %s)
-        """
         # Using non-dictionary cursor for execution consistency
-        conn.cursor().execute(insert_query, (student_id, subject_id, mentor_id, duration))
-        conn.commit()
-        
-        cursor.close()
-        conn.close()
+        insert_cursor = conn.cursor()
+        try:
+            # The log row and its StudyHoursSummary update commit in the same transaction
+            insert_cursor.execute(STUDY_LOG_INSERT_QUERY, (student_id, subject_id, mentor_id, duration))
+            record_study_hours(insert_cursor, student_id, subject_id, mentor_id, duration)
+            conn.commit()
+        except mysql.connector.Error as err:
+            conn.rollback()
+            flash(f"Error logging study session: {err}", 'error')
+            return redirect(url_for('log_study'))
+        finally:
+            insert_cursor.close()
+            cursor.close()
+            conn.close()
         
-        # Call progress update after logging the session
-        update_student_progress(student_id, subject_id)
+        # The new log shows on both dashboards right away; progress pages refresh when the job commits
+        page_cache.invalidate_user('student', student_id)
+        page_cache.invalidate_user('mentor', mentor_id)
+
+        # Progress update (and goal check) runs in the background; the student is redirected right away
+        enqueue_progress_update(student_id, subject_id)
         
         return redirect(url_for('dashboard'))
 
     # GET Request: Filter Subjects by Student's Major
 
-    # 1. Fetch student's major
-    try:
-        cursor.execute("SELECT major FROM Students WHERE student_id = %s", (student_id,))
-        student_major_result = cursor.fetchone()
-        student_major = student_major_result['major'] if student_major_result else 'General'
-    except mysql.connector.Error:
-        student_major = 'General'
-    except TypeError:
-        student_major = 'General'
-
-    # 2. Fetch Subjects matching the major or marked as 'General'
-    # FIX APPLIED: Corrected the subject filter to be broad and ensure all 122 subjects are visible.
-    subject_query = """
-        SELECT subject_id, subject_name 
-        FROM Subjects 
-        WHERE major_area = %s 
-        OR major_area IN ('General', 'CSE', 'Database & Security', 'AI & Logic', 'Software Engineering', 'Algorithm Design')
-        ORDER BY subject_name
-    """
-    cursor.execute(subject_query, (student_major,))
-    subjects = cursor.fetchall()
-
-    # 3. Fetch Mentors (still fetches all for selection)
-    cursor.execute("SELECT * FROM Mentors")
-    mentors = cursor.fetchall()
-
+    # 1. Student's major comes from the cached principal (no per-request profile query)
     cursor.close()
     conn.close()
+    principal = get_principal()
+    student_major = principal['major'] if principal else 'General'
+
+    # 2. Fetch Subjects matching the major or marked as 'General' (cached reference data)
+    subjects = get_subjects_for_major(student_major)
+
+    # 3. Fetch Mentors (still fetches all for selection, cached reference data)
+    mentors = get_all_mentors()
 
     return render_template('log_study.html', subjects=subjects, mentors=mentors)
 
@@ -347,9 +2543,15 @@ def progress_report():
         return redirect(url_for('login'))
     
     student_id = session['user_id']
-    conn = get_db_connection()
+    cache_key = page_cache.key('student', student_id, 'progress')
+    html = page_cache.get(cache_key)
+    if html is not None:
+        return html
+
+    conn = get_read_connection()
     cursor = conn.cursor(dictionary=True)
     report = []
+    failed = False
     
     try:
         # Call the stored procedure to get the report
@@ -358,92 +2560,171 @@ def progress_report():
             report = result.fetchall()
     except mysql.connector.Error as err:
         print(f"Error fetching progress report: {err}")
+        failed = True
+    finally:
+        cursor.close()
+        conn.close()
+
+    html = render_template('progress.html', report=report)
+    # A lagging replica can predate a mentor's write that already invalidated this page, so only
+    # primary reads (including read-your-writes fallbacks) are cached
+    if not failed and not read_from_replica():
+        page_cache.set(cache_key, html)
+    return html
+
+# --- NEW HELPER: Subject Analytics Data (Single round trip) ---
+def get_analytics_version(cursor, student_id, subject_id):
+    """ Returns (version_tag, last_modified) for a student's analytics response.
+        The allocation chart covers every subject, so the tag counts the student's sessions and hours across
+        all of them plus this subject's progress: any logged, imported or backdated session changes it, even
+        within the same second. last_modified is the newest study or progress timestamp (None if nothing is
+        logged). Both are index range reads on the student's summary rows, so revalidating stays cheap. """
+    cursor.execute("""
+        SELECT COALESCE(SUM(session_count), 0) AS sessions, COALESCE(SUM(total_hours), 0) AS hours,
+               MAX(last_study_date) AS last_study,
+               (SELECT MAX(last_updated) FROM StudentProgress WHERE student_id = %s) AS last_progress,
+               (SELECT progress_percentage FROM StudentProgress WHERE student_id = %s AND subject_id = %s) AS progress
+        FROM StudyHoursSummary
+        WHERE student_id = %s
+    """, (student_id, student_id, subject_id, student_id))
+    row = cursor.fetchone()
+    stamps = [stamp for stamp in (row['last_study'], row['last_progress']) if stamp is not None]
+    if not stamps:
+        return 'empty', None
+    return f"{row['sessions']}-{row['hours']}-{row['progress']}", max(stamps)
+
+def fetch_subject_analytics(cursor, student_id, subject_id):
+    """ Fetches the metrics, mentor breakdown and allocation chart for one subject in a single query.
+        Each UNION ALL branch tags its rows with a 'kind' so they can be split apart afterwards. """
+    analytics_query = """
+        SELECT 'mentor' AS kind, M.name AS label, SUM(HS.total_hours) AS hours, NULL AS progress
+        FROM StudyHoursSummary HS
+        JOIN Mentors M ON HS.mentor_id = M.mentor_id
+        WHERE HS.student_id = %s AND HS.subject_id = %s
+        GROUP BY M.name
+        UNION ALL
+        SELECT 'allocation', sub.subject_name, SUM(hs.total_hours), NULL
+        FROM StudyHoursSummary hs
+        JOIN Subjects sub ON hs.subject_id = sub.subject_id
+        WHERE hs.student_id = %s
+        GROUP BY sub.subject_name
+        UNION ALL
+        SELECT 'progress', NULL, NULL, progress_percentage
+        FROM StudentProgress
+        WHERE student_id = %s AND subject_id = %s
+        ORDER BY hours DESC;
+    """
+    cursor.execute(analytics_query, (student_id, subject_id, student_id, student_id, subject_id))
+
+    analytics = {
+        'total_logged_hours': 0.0,
+        'progress_percentage': 0.0,
+        'mentor_summary': [],
+        'allocation_labels': [],
+        'allocation_data': []
+    }
+    for row in cursor.fetchall():
+        if row['kind'] == 'mentor':
+            hours = float(row['hours'])
+            analytics['mentor_summary'].append({'mentor_name': row['label'], 'total_hours': hours})
+            analytics['total_logged_hours'] += hours
+        elif row['kind'] == 'allocation':
+            analytics['allocation_labels'].append(row['label'])
+            analytics['allocation_data'].append(float(row['hours']))
+        elif row['progress'] is not None:
+            analytics['progress_percentage'] = float(row['progress'])
+    return analytics
+
+# --- NEW ROUTE: Study-Hour Trends (JSON, served from the rollup tables) ---
+@app.route('/trends/study_hours')
+def study_hours_trend():
+    """ Students get their own trend; the system view (PIN session) may ask for a whole subject. """
+    if session.get('role') == 'student' and 'user_id' in session:
+        student_id = session['user_id']
+    elif session.get('sys_access'):
+        student_id = None
+    else:
+        return jsonify({'error': 'Login required.'}), 401
+
+    bucket = request.args.get('bucket', 'week')
+    if bucket not in ROLLUP_BUCKETS:
+        return jsonify({'error': "bucket must be 'day' or 'week'."}), 400
+    subject_id = request.args.get('subject_id', type=int)
+    if student_id is None and subject_id is None:
+        return jsonify({'error': 'subject_id is required for system-wide trends.'}), 400
+
+    try:
+        end_date = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else datetime.now().date()
+        default_start = end_date - timedelta(weeks=12) if bucket == 'week' else end_date - timedelta(days=30)
+        start_date = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') else default_start
+    except ValueError:
+        return jsonify({'error': 'Dates must be YYYY-MM-DD.'}), 400
+
+    bucket_days = ROLLUP_BUCKETS[bucket][3]
+    if start_date > end_date or (end_date - start_date).days // bucket_days > MAX_TREND_BUCKETS:
+        return jsonify({'error': f'Range must be ascending and at most {MAX_TREND_BUCKETS} buckets.'}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        series = get_study_trend(cursor, start_date, end_date, bucket, student_id, subject_id)
     finally:
         cursor.close()
         conn.close()
 
-    return render_template('progress.html', report=report)
+    return jsonify({'bucket': bucket, 'subject_id': subject_id, 'series': series})
 
 # --- NEW ROUTE: Dedicated Subject Analytics Page ---
 @app.route('/subject_analytics/<int:subject_id>')
 def subject_analytics(subject_id):
     if 'user_id' not in session or session['role'] != 'student':
         return redirect(url_for('login'))
-    
-    student_id = session['user_id']
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    
-    # --- 1. Fetch Subject Details ---
-    cursor.execute("SELECT subject_id, subject_name, credits FROM Subjects WHERE subject_id = %s", (subject_id,))
-    subject = cursor.fetchone()
+
+    # --- 1. Fetch Subject Details (cached reference data) ---
+    subject = get_subject(subject_id)
     if not subject:
-        cursor.close()
-        conn.close()
         flash("Subject not found.", 'error')
         return redirect(url_for('progress_report'))
 
-    # --- 1B. FETCH METRICS ---
-    total_hours_query = """
-        SELECT SUM(duration_hours) AS total_logged 
-        FROM StudyLog
-        WHERE student_id = %s AND subject_id = %s;
-    """
-    cursor.execute(total_hours_query, (student_id, subject_id))
-    total_logged_result = cursor.fetchone()
-    
-    progress_query = """
-        SELECT progress_percentage 
-        FROM StudentProgress
-        WHERE student_id = %s AND subject_id = %s;
-    """
-    cursor.execute(progress_query, (student_id, subject_id))
-    progress_result = cursor.fetchone()
-
-    # Inject the new metrics into the subject dictionary
-    subject['total_logged_hours'] = float(total_logged_result['total_logged']) if total_logged_result and total_logged_result['total_logged'] is not None else 0.0
-    subject['progress_percentage'] = float(progress_result['progress_percentage']) if progress_result and progress_result['progress_percentage'] is not None else 0.0
+    # Metrics and charts are loaded by the page from subject_analytics_data (cacheable JSON)
+    return render_template('subject_analytics.html', subject=subject)
 
+# --- NEW ROUTE: Subject Analytics Data (JSON for Chart.js, with ETag/Last-Modified) ---
+@app.route('/subject_analytics/<int:subject_id>/data')
+def subject_analytics_data(subject_id):
+    if 'user_id' not in session or session['role'] != 'student':
+        return jsonify({'error': 'Login required.'}), 401
+    if not get_subject(subject_id):
+        return jsonify({'error': 'Subject not found.'}), 404
 
-    # --- 2. Mentor Log Summary Query ---
-    mentor_summary_query = """
-        SELECT M.name AS mentor_name, SUM(SL.duration_hours) AS total_hours
-        FROM StudyLog SL
-        JOIN Mentors M ON SL.mentor_id = M.mentor_id
-        WHERE SL.student_id = %s AND SL.subject_id = %s
-        GROUP BY M.name
-        ORDER BY total_hours DESC;
-    """
-    cursor.execute(mentor_summary_query, (student_id, subject_id))
-    mentor_summary = cursor.fetchall()
-    
-    # --- 3. NEW: Fetch ALL Study Hours for ALL subjects (for allocation breakdown) ---
-    allocation_query = """
-        SELECT sub.subject_name, SUM(sl.duration_hours) AS total_hours
-        FROM StudyLog sl
-        JOIN Subjects sub ON sl.subject_id = sub.subject_id
-        WHERE sl.student_id = %s
-        GROUP BY sub.subject_name
-        ORDER BY total_hours DESC;
-    """
-    cursor.execute(allocation_query, (student_id,))
-    allocation_data_raw = cursor.fetchall()
-
-    # Process data for JS rendering (labels and values for the pie chart)
-    allocation_labels = json.dumps([item['subject_name'] for item in allocation_data_raw])
-    allocation_data = json.dumps([float(item['total_hours']) for item in allocation_data_raw])
+    student_id = session['user_id']
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        # 1. Cheap validator lookup: unchanged data is answered with 304 before any aggregation runs
+        version_tag, last_modified = get_analytics_version(cursor, student_id, subject_id)
+        etag = f"analytics-{student_id}-{subject_id}-{version_tag}"
 
+        # The ETag is authoritative; If-Modified-Since (one-second resolution) only applies without one
+        not_modified = request.if_none_match.contains(etag)
+        if not request.if_none_match and last_modified and request.if_modified_since:
+            not_modified = last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
 
-    cursor.close()
-    conn.close()
+        if not_modified:
+            response = Response(status=304)
+        else:
+            # 2. Changed (or first) view: one consolidated analytics query
+            response = jsonify(fetch_subject_analytics(cursor, student_id, subject_id))
+    finally:
+        cursor.close()
+        conn.close()
 
-    return render_template(
-        'subject_analytics.html', 
-        subject=subject, 
-        mentor_summary=mentor_summary, 
-        allocation_labels=allocation_labels,  # NEW
-        allocation_data=allocation_data       # NEW
-    )
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Private to the student, and always revalidated (cheaply) before reuse
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 # --- START NEW STUDENT GOALS ROUTE ---
 @app.route('/student_goals')
@@ -452,46 +2733,22 @@ def student_goals():
         return redirect(url_for('login'))
     
     student_id = session['user_id']
+    cache_key = page_cache.key('student', student_id, 'student_goals')
+    html = page_cache.get(cache_key)
+    if html is not None:
+        return html
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
+    failed = False
     
-    # Fetch ALL goals (met and unmet) for the current student
-    goals_query = """
-        SELECT sg.goal_id, sg.student_id, sg.subject_id, m.name as mentor_name, sub.subject_name, sg.target_hours, sg.due_date, sg.is_met
-        FROM SubjectGoals sg
-        JOIN Mentors m ON sg.mentor_id = m.mentor_id
-        JOIN Subjects sub ON sg.subject_id = sub.subject_id
-        WHERE sg.student_id = %s
-        ORDER BY sg.due_date DESC;
-    """
-    
+    # Fetch ALL goals (met and unmet) for the current student, with progress, in one query
     try:
-        cursor.execute(goals_query, (student_id,))
-        goals = cursor.fetchall()
-        
-        # Calculate progress for each goal (required for the view)
-        for goal in goals:
-            # Fetch Current Logged Hours 
-            hours_query = "SELECT SUM(duration_hours) AS current_hours FROM StudyLog WHERE student_id = %s AND subject_id = %s"
-            cursor.execute(hours_query, (goal['student_id'], goal['subject_id']))
-            hours_result = cursor.fetchone()
-            
-            current_hours = float(hours_result['current_hours']) if hours_result and hours_result['current_hours'] is not None else 0.0
-            target_hours = float(goal['target_hours'])
-
-            # Inject current hours
-            goal['current_hours'] = current_hours
-            
-            # DIRECT PROGRESS CALCULATION
-            if target_hours > 0:
-                calculated_percent = (current_hours / target_hours) * 100
-                goal['progress_percent'] = min(calculated_percent, 100.0) 
-            else:
-                goal['progress_percent'] = 0.0
-
+        goals = fetch_goals_with_progress(cursor, 'student', student_id)
     except mysql.connector.Error as err:
         print(f"Error fetching student goals: {err}")
         goals = []
+        failed = True
     
     cursor.close()
     conn.close()
@@ -499,7 +2756,10 @@ def student_goals():
     # Calculate today's date as a string for template comparison
     today_date = datetime.now().strftime('%Y-%m-%d')
     
-    return render_template('student_goals.html', goals=goals, today_date=today_date) 
+    html = render_template('student_goals.html', goals=goals, today_date=today_date)
+    if not failed:
+        page_cache.set(cache_key, html)
+    return html
 # --- END NEW STUDENT GOALS ROUTE ---
 
 # --- NEW FEATURE: Automated Goal Setting Routes (For Mentors) ---
@@ -524,6 +2784,7 @@ def goals_management():
             # Call the stored procedure to add/update a goal
             cursor.callproc('AddSubjectGoal', (student_id, subject_id, mentor_id, target_hours, due_date))
             conn.commit()
+            page_cache.invalidate_user('student', student_id)
             flash(f"Goal set/updated successfully for Student ID {student_id}.", 'success')
         except mysql.connector.Error as err:
             flash(f"Error setting goal: {err}", 'error')
@@ -536,14 +2797,7 @@ def goals_management():
     # GET Request: Dynamic Filtering
     
     # 1. Fetch ALL students who have logged activity with this mentor (Associated Students)
-    associated_students_query = """
-        SELECT DISTINCT S.student_id, S.name, S.semester 
-        FROM Students S
-        JOIN StudyLog SL ON S.student_id = SL.student_id
-        WHERE SL.mentor_id = %s;
-    """
-    cursor.execute(associated_students_query, (mentor_id,))
-    students = cursor.fetchall()
+    students = get_associated_students(cursor, mentor_id)
     
     # Extract the IDs of the associated students for the next filter
     student_ids = [s['student_id'] for s in students]
@@ -553,11 +2807,12 @@ def goals_management():
         # Construct a tuple of placeholders for the IN clause
         placeholders = ', '.join(['%s'] * len(student_ids))
         
+        # StudyHoursSummary holds one row per student/subject/mentor, so this avoids scanning StudyLog
         subject_filter_query = f"""
             SELECT DISTINCT sub.subject_id, sub.subject_name 
             FROM Subjects sub
-            JOIN StudyLog sl ON sub.subject_id = sl.subject_id
-            WHERE sl.student_id IN ({placeholders})
+            JOIN StudyHoursSummary h ON sub.subject_id = h.subject_id
+            WHERE h.student_id IN ({placeholders})
             ORDER BY sub.subject_name;
         """
         cursor.execute(subject_filter_query, tuple(student_ids))
@@ -565,41 +2820,9 @@ def goals_management():
     else:
         subjects = [] # No associated students, no subjects to show
 
-    # Fetch existing goals for the mentor's view (now shows ALL goals)
-    goals_query = """
-        SELECT sg.goal_id, sg.student_id, sg.subject_id, s.name as student_name, sub.subject_name, sg.target_hours, sg.due_date, sg.is_met
-        FROM SubjectGoals sg
-        JOIN Students s ON sg.student_id = s.student_id
-        JOIN Subjects sub ON sg.subject_id = sub.subject_id
-        WHERE sg.mentor_id = %s
-        ORDER BY sg.due_date;
-    """
-    
-    try:
-        cursor.execute(goals_query, (mentor_id,))
-        goals = cursor.fetchall()
-        
-        # --- NEW: Fetch CURRENT PROGRESS for EACH goal & Calculate Percentage in Python (Fix for 0.0% Error) ---
-        for goal in goals:
-            # Fetch Current Logged Hours (Hours must be fetched to calculate percentage)
-            hours_query = "SELECT SUM(duration_hours) AS current_hours FROM StudyLog WHERE student_id = %s AND subject_id = %s"
-            cursor.execute(hours_query, (goal['student_id'], goal['subject_id']))
-            hours_result = cursor.fetchone()
-            
-            current_hours = float(hours_result['current_hours']) if hours_result and hours_result['current_hours'] is not None else 0.0
-            target_hours = float(goal['target_hours'])
-
-            # Inject current hours
-            goal['current_hours'] = current_hours
-            
-            # DIRECT PROGRESS CALCULATION
-            if target_hours > 0:
-                calculated_percent = (current_hours / target_hours) * 100
-                # Cap the display at 100% (the progress bar doesn't need to show 150%)
-                goal['progress_percent'] = min(calculated_percent, 100.0) 
-            else:
-                goal['progress_percent'] = 0.0
-            
+    # Fetch existing goals for the mentor's view (now shows ALL goals) with progress, in one query
+    try:
+        goals = fetch_goals_with_progress(cursor, 'mentor', mentor_id)
     except mysql.connector.Error as err:
         goals = []
     
@@ -626,10 +2849,12 @@ def toggle_goal_met(goal_id):
     mentor_id = session['user_id']
     
     try:
-        # Step 1: Toggle the goal status
+        # Step 1: Toggle the goal status. The mentor's decision sticks: goal evaluation skips overridden goals,
+        # so un-marking a goal the student has already reached is not undone by the progress update below
         toggle_query = """
             UPDATE SubjectGoals 
-            SET is_met = CASE WHEN is_met = TRUE THEN FALSE ELSE TRUE END 
+            SET is_met = CASE WHEN is_met = TRUE THEN FALSE ELSE TRUE END,
+                mentor_override = TRUE
             WHERE goal_id = %s AND mentor_id = %s;
         """
         # Execute with non-dictionary cursor for the UPDATE
@@ -637,12 +2862,20 @@ def toggle_goal_met(goal_id):
         conn.commit()
         
         # Step 2: Retrieve the necessary IDs (Use the dict cursor results)
-        select_ids_query = "SELECT student_id, subject_id FROM SubjectGoals WHERE goal_id = %s"
-        cursor.execute(select_ids_query, (goal_id,))
+        select_ids_query = """
+            SELECT sg.student_id, sg.subject_id, sg.is_met, sub.subject_name
+            FROM SubjectGoals sg
+            JOIN Subjects sub ON sg.subject_id = sub.subject_id
+            WHERE sg.goal_id = %s AND sg.mentor_id = %s
+        """
+        cursor.execute(select_ids_query, (goal_id, mentor_id))
         goal_data = cursor.fetchone()
         
         # Step 3: Call the progress update helper
         if goal_data:
+            page_cache.invalidate_user('student', goal_data['student_id'])
+            if goal_data['is_met']:
+                notify_goal_met(goal_data['student_id'], mentor_id, goal_data['subject_name'])
             # Explicitly pass the retrieved IDs using their dictionary keys
             update_student_progress(goal_data['student_id'], goal_data['subject_id'])
         
@@ -670,7 +2903,7 @@ def mentor_feedback_history(student_id):
         return redirect(url_for('login'))
         
     mentor_id = session['user_id']
-    conn = get_db_connection()
+    conn = get_read_connection()
     cursor = conn.cursor(dictionary=True)
     
     # 1. Get the student's name for the page header
@@ -713,20 +2946,15 @@ def subject_selector():
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     
-    mentor_expertise_query = "SELECT expertise_area FROM Mentors WHERE mentor_id = %s"
-    cursor.execute(mentor_expertise_query, (mentor_id,))
-    expertise = cursor.fetchone()
-    
+    # The mentor's profile comes from the cached principal instead of a Mentors lookup
     subjects = []
-    if expertise:
-        expertise_area = expertise['expertise_area']
-        
-        # Use StudyLog as the most reliable way to list subjects the mentor has experience with
+    if get_principal():
+        # StudyHoursSummary lists every subject the mentor has logged time in, archived terms included
         subjects_logged_query = """
             SELECT DISTINCT s.subject_id, s.subject_name, s.major_area, s.credits
             FROM Subjects s
-            JOIN StudyLog sl ON s.subject_id = sl.subject_id
-            WHERE sl.mentor_id = %s
+            JOIN StudyHoursSummary h ON s.subject_id = h.subject_id
+            WHERE h.mentor_id = %s
             ORDER BY s.subject_name;
         """
         cursor.execute(subjects_logged_query, (mentor_id,))
@@ -743,31 +2971,28 @@ def subject_performance_report(subject_id):
         return redirect(url_for('login'))
         
     mentor_id = session['user_id']
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    
-    # 1. Get Subject Name and Credits
-    cursor.execute("SELECT subject_name, credits FROM Subjects WHERE subject_id = %s", (subject_id,))
-    subject_details = cursor.fetchone()
+
+    # 1. Get Subject Name and Credits (cached reference data)
+    subject_details = get_subject(subject_id)
     if not subject_details:
         flash("Subject not found.", 'error')
-        cursor.close()
-        conn.close()
         return redirect(url_for('subject_selector'))
 
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+
     # 2. Fetch All Students associated with this mentor/subject and their progress
     student_report_query = """
         SELECT 
             S.student_id, 
             S.name AS student_name, 
             S.semester,
-            SUM(SL.duration_hours) AS total_logged_hours,
+            HS.total_hours AS total_logged_hours,
             SP.progress_percentage
-        FROM Students S
-        JOIN StudyLog SL ON S.student_id = SL.student_id
+        FROM StudyHoursSummary HS
+        JOIN Students S ON S.student_id = HS.student_id
         LEFT JOIN StudentProgress SP ON S.student_id = SP.student_id AND SP.subject_id = %s
-        WHERE SL.subject_id = %s AND SL.mentor_id = %s
-        GROUP BY S.student_id, S.name, S.semester, SP.progress_percentage
+        WHERE HS.subject_id = %s AND HS.mentor_id = %s
         ORDER BY S.name;
     """
     cursor.execute(student_report_query, (subject_id, subject_id, mentor_id))
@@ -794,64 +3019,133 @@ def message_inbox():
     
     user_id = session['user_id']
     role = session['role']
+
+    after = None
+    if request.args.get('cursor'):
+        after = decode_page_cursor(request.args['cursor'])
+
+    # --- UPDATED INBOX QUERY ---
+    # Fetch one page of messages addressed to this user *in their role* (student and mentor IDs overlap),
+    # together with the contacts for sending new messages (STUDENTS SEE THEIR MENTORS, MENTORS THEIR STUDENTS).
+    results = run_read_queries({
+        'inbox': inbox_page_query(user_id, role, after),
+        'contacts': contacts_query(user_id, role)
+    })
+    inbox, next_cursor = inbox_page_result(results['inbox'])
+    contacts = contacts_result(results['contacts'], role)
+
+    # Viewing is read-only: the rendered page marks its unread messages read with a POST to /messages/mark_read
+    return render_template('messages.html', inbox=inbox, next_cursor=next_cursor, contacts=contacts, role=role,
+                           push_enabled=push_enabled())
+
+# --- NEW ROUTE: Inbox Pages (JSON) ---
+@app.route('/messages/inbox')
+def inbox_api():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required.'}), 401
+
+    after = None
+    if request.args.get('cursor'):
+        after = decode_page_cursor(request.args['cursor'])
+        if after is None:
+            return jsonify({'error': 'Invalid cursor.'}), 400
+    limit = min(max(request.args.get('limit', INBOX_PAGE_SIZE, type=int), 1), 100)
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
-    
-    # --- UPDATED INBOX QUERY ---
-    # Fetch all messages where the current user is the recipient (user_id).
-    # Use COALESCE to reliably retrieve the sender's name regardless of sender_role.
-    inbox_query = """
-        SELECT m.content, m.timestamp, m.sender_role, m.is_read, m.sender_id,
-               COALESCE(S.name, T.name) AS sender_name
-        FROM Messages m
-        LEFT JOIN Students S ON m.sender_id = S.student_id AND m.sender_role = 'student'
-        LEFT JOIN Mentors T ON m.sender_id = T.mentor_id AND m.sender_role = 'mentor'
-        WHERE m.recipient_id = %s
-        ORDER BY m.timestamp DESC;
-    """
-    # Pass only user_id to the query. The redundant role filtering is removed.
-    cursor.execute(inbox_query, (user_id,))
-    inbox = cursor.fetchall()
+    try:
+        messages, next_cursor = fetch_inbox_page(cursor, session['user_id'], session['role'], after, limit)
+    finally:
+        cursor.close()
+        conn.close()
 
-    # Query to fetch available contacts for sending new messages
-    contacts = []
-    if role == 'student':
-        # STUDENT CONTACTS: FILTERED TO SHOW ONLY MENTORS WHOSE COURSES THE STUDENT IS TAKING
-        student_mentor_filter_query = """
-            SELECT DISTINCT
-                M.mentor_id as id, 
-                M.name, 
-                M.expertise_area as info, 
-                'mentor' as role 
-            FROM Mentors M
-            JOIN StudyLog SL ON M.mentor_id = SL.mentor_id
-            WHERE SL.student_id = %s
-            ORDER BY M.name;
-        """
-        # Note: For students, user_id is their student_id
-        cursor.execute(student_mentor_filter_query, (user_id,))
-        contacts = cursor.fetchall()
-    else:
-        # MENTOR CONTACTS: FILTERED TO SHOW ONLY STUDENTS LOGGING TIME WITH THIS MENTOR
-        mentor_student_filter_query = """
-            SELECT DISTINCT
-                S.student_id as id, 
-                S.name, 
-                S.semester as info, 
-                'student' as role 
-            FROM Students S
-            JOIN StudyLog SL ON S.student_id = SL.student_id
-            WHERE SL.mentor_id = %s
-            ORDER BY S.name;
-        """
-        # Note: For mentors, user_id is their mentor_id
-        cursor.execute(mentor_student_filter_query, (user_id,))
-        contacts = cursor.fetchall()
+    for message in messages:
+        message['timestamp'] = message['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
+        message['is_read'] = bool(message['is_read'])
 
-    cursor.close()
-    conn.close()
-    
-    return render_template('messages.html', inbox=inbox, contacts=contacts, role=role)
+    return jsonify({'messages': messages, 'next_cursor': next_cursor})
+
+# --- NEW ROUTE: Mark Messages Read (POSTed by messages.html once the page has rendered) ---
+@app.route('/messages/mark_read', methods=['POST'])
+def mark_read():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required.'}), 401
+
+    payload = request.get_json(silent=True)
+    # A string would otherwise be read digit by digit ("123" -> messages 1, 2 and 3)
+    if not isinstance(payload, dict) or not isinstance(payload.get('message_ids'), list):
+        return jsonify({'error': 'message_ids must be a list of integers.'}), 400
+    try:
+        message_ids = [int(message_id) for message_id in payload['message_ids']]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'message_ids must be a list of integers.'}), 400
+    if len(message_ids) > 100:
+        return jsonify({'error': 'At most 100 messages per request.'}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        marked = mark_messages_read(cursor, session['user_id'], session['role'], message_ids)
+        conn.commit()
+    except mysql.connector.Error as err:
+        print(f"Error marking messages read: {err}")
+        return jsonify({'error': 'Database error.'}), 500
+    finally:
+        cursor.close()
+        conn.close()
+    return jsonify({'marked': marked, 'unread': get_unread_count(session['user_id'], session['role'])})
+
+# --- NEW ROUTE: Unread Count (Cheap nav bar polling) ---
+@app.route('/messages/unread_count')
+def unread_count():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required.'}), 401
+    return jsonify({'unread': get_unread_count(session['user_id'], session['role'])})
+
+# --- NEW ROUTE: Server-Sent Events Push Channel ---
+@app.route('/events/stream')
+def event_stream():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required.'}), 401
+
+    # Every open stream pins a worker; past the cap the page falls back to polling
+    with _stream_stats_lock:
+        if stream_stats['open'] >= event_bus_config['max_streams']:
+            stream_stats['rejected'] += 1
+            return Response('Too many open event streams.\n', status=503, mimetype='text/plain',
+                            headers={'Retry-After': '60'})
+        stream_stats['open'] += 1
+
+    # The stream never touches the database, so it holds no pooled connection while idle
+    try:
+        subscription = event_bus.subscribe(f"{session['role']}:{int(session['user_id'])}")
+    except Exception:
+        # No response will carry close_stream, so give the slot back here (e.g. Redis unreachable)
+        with _stream_stats_lock:
+            stream_stats['open'] -= 1
+        raise
+    keepalive = event_bus_config['keepalive']
+
+    def generate():
+        yield 'retry: 5000\n\n' # Browser reconnect delay (ms)
+        while True:
+            event = subscription.get(keepalive)
+            if event is None:
+                yield ': keepalive\n\n' # Also detects disconnected clients
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    def close_stream():
+        # Runs when the server closes the response, even if the client left before the first chunk
+        subscription.close()
+        with _stream_stats_lock:
+            stream_stats['open'] -= 1
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.call_on_close(close_stream)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no' # Disable proxy buffering (nginx)
+    return response
 
 @app.route('/send_message', methods=['POST'])
 def send_message():
@@ -860,6 +3154,8 @@ def send_message():
 
     sender_id = session['user_id']
     sender_role = session['role']
+    # Students only message mentors and mentors only message students
+    recipient_role = 'mentor' if sender_role == 'student' else 'student'
     recipient_id = request.form['recipient_id']
     content = request.form['content']
 
@@ -867,9 +3163,10 @@ def send_message():
     cursor = conn.cursor()
 
     try:
-        insert_query = "INSERT INTO Messages (sender_id, recipient_id, sender_role, content) VALUES (%s, %s, %s, %s)"
-        cursor.execute(insert_query, (sender_id, recipient_id, sender_role, content))
+        insert_query = "INSERT INTO Messages (sender_id, recipient_id, sender_role, recipient_role, content) VALUES (%s, %s, %s, %s, %s)"
+        cursor.execute(insert_query, (sender_id, recipient_id, sender_role, recipient_role, content))
         conn.commit()
+        notify_new_message(recipient_id, recipient_role, sender_role, content)
         
         flash("Message sent successfully!", "success")
     except mysql.connector.Error as err:
@@ -912,9 +3209,11 @@ def react_message():
     cursor = conn.cursor()
 
     try:
-        insert_query = "INSERT INTO Messages (sender_id, recipient_id, sender_role, content) VALUES (%s, %s, %s, %s)"
+        # Reactions always go back to the student who sent the original message
+        insert_query = "INSERT INTO Messages (sender_id, recipient_id, sender_role, recipient_role, content) VALUES (%s, %s, %s, 'student', %s)"
         cursor.execute(insert_query, (sender_id, recipient_id, sender_role, content))
         conn.commit()
+        notify_new_message(recipient_id, 'student', sender_role, content)
         
         flash(f"Reaction '{reaction_text}' transmitted successfully!", "success")
     except mysql.connector.Error as err:
@@ -936,30 +3235,155 @@ def subjects_pin():
     return render_template('subjects_pin.html')
 
 # --- SYSTEM ROUTE: Force Progress Recalculation Helper (No Route Decorator) ---
-def force_update_all_progress():
+
+# Students per chunk for bulk recalculation (0 = recalculate everything in one pass)
+BULK_RECALC_CHUNK_SIZE = 500
+
+def _recalculate_progress_chunk(conn, first_student_id, last_student_id):
+    """ Recalculates progress, marks met goals and sends praise for one student_id range.
+        Returns (progress_rows_affected, goals_met, messages_sent). """
+    cursor = conn.cursor(dictionary=True)
+    try:
+        # 1. Set-based progress upsert (same formula as CalculateAndUpdateProgress: hours vs credits * 10).
+        #    StudyHoursSummary still counts sessions whose StudyLog rows were archived.
+        progress_query = """
+            INSERT INTO StudentProgress (student_id, subject_id, progress_percentage)
+            SELECT h.student_id, h.subject_id,
+                   LEAST(100.00, (SUM(h.total_hours) / (sub.credits * 10)) * 100)
+            FROM StudyHoursSummary h
+            JOIN Subjects sub ON h.subject_id = sub.subject_id
+            WHERE h.student_id BETWEEN %s AND %s
+            GROUP BY h.student_id, h.subject_id, sub.credits
+            ON DUPLICATE KEY UPDATE
+                progress_percentage = VALUES(progress_percentage),
+                last_updated = CURRENT_TIMESTAMP;
+        """
+        cursor.execute(progress_query, (first_student_id, last_student_id))
+        progress_rows = cursor.rowcount
+
+        # 2. Batch goal evaluation and praise for the same student range, in the same transaction
+        met_goals, messages = evaluate_goals(cursor, first_student_id, last_student_id)
+
+        conn.commit()
+        publish_goal_results(met_goals, messages)
+        return progress_rows, len(met_goals), len(messages)
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def bulk_recalculate_progress(chunk_size=BULK_RECALC_CHUNK_SIZE):
+    """ Recalculates progress for every student/subject pair in StudyHoursSummary using set-based SQL.
+        Work is committed per chunk of student IDs so no single transaction holds locks for long.
+        Returns a list with one timing report per chunk, or None on failure. """
     conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        try:
-            # 1. Find all unique student-subject pairs in the StudyLog that need calculation
-            query = "SELECT DISTINCT student_id, subject_id FROM StudyLog"
-            cursor.execute(query)
-            pairs = cursor.fetchall()
-            
-            # 2. Iterate and trigger the update for each pair
-            for pair in pairs:
-                # Call the existing update function for each pair
-                # The helper itself handles connection closing.
-                update_student_progress(pair['student_id'], pair['subject_id'])
-            
-            print(f"FORCED PROGRESS UPDATE COMPLETE for {len(pairs)} pairs.")
-            return True
-        except mysql.connector.Error as err:
-            print(f"Error during forced progress update: {err}")
-            return False
-        finally:
-            cursor.close()
-            conn.close()
+    if not conn:
+        return None
+
+    cursor = conn.cursor(dictionary=True)
+    chunk_reports = []
+    try:
+        cursor.execute("SELECT MIN(student_id) AS first_id, MAX(student_id) AS last_id FROM StudyHoursSummary")
+        id_range = cursor.fetchone()
+        if not id_range or id_range['first_id'] is None:
+            return chunk_reports
+
+        first_id, last_id = id_range['first_id'], id_range['last_id']
+        step = chunk_size if chunk_size and chunk_size > 0 else last_id - first_id + 1
+
+        for chunk_start in range(first_id, last_id + 1, step):
+            chunk_end = min(chunk_start + step - 1, last_id)
+            started = time.time()
+            progress_rows, goals_met, messages_sent = _recalculate_progress_chunk(conn, chunk_start, chunk_end)
+            report = {
+                'students': (chunk_start, chunk_end),
+                'progress_rows': progress_rows,
+                'goals_met': goals_met,
+                'messages_sent': messages_sent,
+                'seconds': time.time() - started
+            }
+            chunk_reports.append(report)
+            print(f"PROGRESS RECALC CHUNK students {chunk_start}-{chunk_end}: "
+                  f"{progress_rows} rows, {goals_met} goals met, {messages_sent} messages in {report['seconds']:.3f}s")
+
+        return chunk_reports
+    except mysql.connector.Error as err:
+        print(f"Error during bulk progress recalculation: {err}")
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# Last forced recalculation, reported under 'progress_recalc' in /system/stats
+progress_recalc_status = {'state': 'idle', 'requested_at': None, 'started_at': None, 'finished_at': None,
+                          'goals_met': 0, 'chunks': []}
+_progress_recalc_lock = threading.Lock()
+
+def force_update_all_progress(chunk_size=BULK_RECALC_CHUNK_SIZE):
+    """ Runs the bulk recalculation and records its chunk reports. Returns False on failure
+        (the job queue then retries it). """
+    started = time.time()
+    with _progress_recalc_lock:
+        progress_recalc_status.update(state='running', started_at=datetime.now().isoformat(timespec='seconds'),
+                                      finished_at=None, goals_met=0, chunks=[])
+    chunk_reports = bulk_recalculate_progress(chunk_size)
+    with _progress_recalc_lock:
+        progress_recalc_status.update(state='failed' if chunk_reports is None else 'done',
+                                      finished_at=datetime.now().isoformat(timespec='seconds'),
+                                      chunks=chunk_reports or [])
+    if chunk_reports is None:
+        return False
+
+    page_cache.clear() # Progress and goal status may have changed for any student
+    total_goals = sum(report['goals_met'] for report in chunk_reports)
+    with _progress_recalc_lock:
+        progress_recalc_status['goals_met'] = total_goals
+    print(f"FORCED PROGRESS UPDATE COMPLETE: {len(chunk_reports)} chunks, "
+          f"{total_goals} goals met in {time.time() - started:.3f}s.")
+    return True
+
+@app.route('/system/stats')
+def system_stats():
+    if not session.get('sys_access'):
+        return jsonify({'error': 'PIN required.'}), 403
+    return jsonify({
+        'db_pool': db_pool.stats(),
+        'job_queue': job_queue.stats(),
+        'reference_cache': reference_cache.stats(),
+        'event_bus': event_bus.stats(),
+        'event_streams': dict(stream_stats, push_enabled=push_enabled()),
+        'page_cache': page_cache.stats(),
+        'password_verifier': password_verifier.stats(),
+        'login_throttle': login_throttle.stats(),
+        'sessions': {'backend': session_config['backend'], 'entries': session_store.size()},
+        'prepared_statements': statement_registry.stats(),
+        'replicas': replica_router.stats(),
+        'async_reads': async_read_pool.stats() if async_read_pool else None,
+        'exports': dict(export_stats),
+        'progress_recalc': dict(progress_recalc_status)
+    })
+
+@app.route('/system/metrics')
+def system_metrics():
+    # Prometheus scrapers cannot hold a session, so the PIN may also be passed as ?pin=
+    if not session.get('sys_access') and request.args.get('pin') != DEVELOPER_PIN:
+        return Response('PIN required.\n', status=403, mimetype='text/plain')
+
+    lines = [request_metrics.render_prometheus().rstrip('\n')]
+    gauges = [('db_pool', db_pool.stats()), ('job_queue', job_queue.stats()), ('reference_cache', reference_cache.stats()),
+              ('event_bus', event_bus.stats()), ('event_streams', dict(stream_stats)), ('page_cache', page_cache.stats()),
+              ('password_verifier', password_verifier.stats()), ('login_throttle', login_throttle.stats()),
+              ('sessions', {'entries': session_store.size()}), ('prepared_statements', statement_registry.stats()),
+              ('replicas', replica_router.stats())]
+    for prefix, stats in gauges:
+        for name, value in sorted(stats.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f'# TYPE edumentor_{prefix}_{name} gauge')
+                lines.append(f'edumentor_{prefix}_{name} {value}')
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
 
 @app.route('/system/force_progress_recalc')
 def force_recalc_route():
@@ -972,15 +3396,361 @@ def force_recalc_route():
             flash('ACCESS DENIED: PIN required for system maintenance.', 'error')
             return redirect(url_for('subjects_pin'))
 
-    success = force_update_all_progress()
-    
-    if success:
-        flash('SYSTEM ALERT: All student progress logs recalculated successfully.', 'success')
+    # The recalculation runs on the background job queue so it never holds a web worker;
+    # its progress and per-chunk timings are reported under 'progress_recalc' in /system/stats
+    chunk_size = request.args.get('chunk_size', BULK_RECALC_CHUNK_SIZE, type=int)
+    with _progress_recalc_lock:
+        in_progress = progress_recalc_status['state'] in ('queued', 'running')
+        if not in_progress:
+            progress_recalc_status.update(state='queued', requested_at=datetime.now().isoformat(timespec='seconds'))
+
+    if in_progress:
+        flash('SYSTEM ALERT: A progress recalculation is already in progress.', 'success')
     else:
-        flash('SYSTEM CRITICAL: Progress recalculation failed. Check console for database errors.', 'error')
-        
+        job_queue.enqueue('progress_recalc', force_update_all_progress, (chunk_size,),
+                          coalesce_key=('progress_recalc',))
+        flash('SYSTEM ALERT: Progress recalculation queued. Follow it under progress_recalc in /system/stats.', 'success')
+
     return redirect(url_for('subjects')) # Redirect back to the system view
 
+# --- SYSTEM IMPORT: Bulk Study Sessions (CSV / JSON / NDJSON) ---
+IMPORT_BATCH_SIZE = 5000 # StudyLog rows per executemany() and transaction
+IMPORT_MAX_ERRORS = 100 # Rejected rows listed individually in the import report
+IMPORT_FIELDS = ('student_id', 'subject_id', 'mentor_id', 'duration_hours', 'study_date')
+
+def parse_study_import(stream, fmt):
+    """ Yields one dict per session from a CSV (header row), JSON array or NDJSON text stream """
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'json':
+        yield from json.load(stream)
+    elif fmt == 'ndjson':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}' (use csv, json or ndjson).")
+
+def _validate_import_row(record, student_ids, subject_ids, mentor_ids, archived_before=None):
+    """ Returns a StudyLog row tuple, or raises ValueError describing why the record is rejected """
+    try:
+        student_id = int(record['student_id'])
+        subject_id = int(record['subject_id'])
+        mentor_id = int(record['mentor_id'])
+        duration = round(float(record['duration_hours']), 2)
+    except KeyError as err:
+        raise ValueError(f"missing field {err}")
+    except (TypeError, ValueError):
+        raise ValueError("ids must be integers and duration_hours a number")
+
+    if student_id not in student_ids:
+        raise ValueError(f"unknown student_id {student_id}")
+    if subject_id not in subject_ids:
+        raise ValueError(f"unknown subject_id {subject_id}")
+    if mentor_id not in mentor_ids:
+        raise ValueError(f"unknown mentor_id {mentor_id}")
+    if not 0 < duration < 100: # StudyLog.duration_hours is DECIMAL(4, 2)
+        raise ValueError(f"duration_hours {duration} out of range")
+
+    study_date = record.get('study_date') or None
+    if study_date:
+        try:
+            study_date = datetime.fromisoformat(str(study_date))
+        except ValueError:
+            raise ValueError(f"study_date '{study_date}' is not ISO formatted")
+        if study_date.tzinfo is not None:
+            # Stored like every other timestamp: naive, in this server's local time (as datetime.now())
+            study_date = study_date.astimezone().replace(tzinfo=None)
+        if archived_before and study_date < archived_before:
+            raise ValueError(f"study_date {study_date:%Y-%m-%d} falls in an archived term")
+    else:
+        study_date = datetime.now().replace(microsecond=0)
+    return (student_id, subject_id, mentor_id, duration, study_date)
+
+def _insert_import_batch(conn, rows):
+    """ Inserts one batch of StudyLog rows and folds them into StudyHoursSummary, the daily/weekly
+        rollups and MentorStudent, all in a single transaction. Each table gets one executemany() (multi-row INSERT). """
+    summary = {}
+    daily = {}
+    weekly = {}
+    associations = {}
+    for student_id, subject_id, mentor_id, duration, study_date in rows:
+        hours, sessions, last_date = summary.get((student_id, subject_id, mentor_id), (0.0, 0, study_date))
+        summary[(student_id, subject_id, mentor_id)] = (hours + duration, sessions + 1, max(last_date, study_date))
+
+        first_date, last_date, sessions = associations.get((mentor_id, student_id), (study_date, study_date, 0))
+        associations[(mentor_id, student_id)] = (min(first_date, study_date), max(last_date, study_date), sessions + 1)
+
+        day = study_date.date()
+        week = day - timedelta(days=day.weekday())
+        for buckets, key in ((daily, (student_id, subject_id, day)), (weekly, (student_id, subject_id, week))):
+            hours, sessions = buckets.get(key, (0.0, 0))
+            buckets[key] = (hours + duration, sessions + 1)
+
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("""
+            INSERT INTO StudyLog (student_id, subject_id, mentor_id, duration_hours, study_date)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows)
+        cursor.executemany("""
+            INSERT INTO StudyHoursSummary (student_id, subject_id, mentor_id, total_hours, session_count, last_study_date)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_hours = total_hours + VALUES(total_hours),
+                session_count = session_count + VALUES(session_count),
+                last_study_date = GREATEST(last_study_date, VALUES(last_study_date))
+        """, [key + (round(hours, 2), sessions, last_date) for key, (hours, sessions, last_date) in summary.items()])
+        cursor.executemany("""
+            INSERT INTO StudyDailyRollup (student_id, subject_id, study_day, total_hours, session_count)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_hours = total_hours + VALUES(total_hours),
+                session_count = session_count + VALUES(session_count)
+        """, [key + (round(hours, 2), sessions) for key, (hours, sessions) in daily.items()])
+        cursor.executemany("""
+            INSERT INTO StudyWeeklyRollup (student_id, subject_id, week_start, total_hours, session_count)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_hours = total_hours + VALUES(total_hours),
+                session_count = session_count + VALUES(session_count)
+        """, [key + (round(hours, 2), sessions) for key, (hours, sessions) in weekly.items()])
+        cursor.executemany("""
+            INSERT INTO MentorStudent (mentor_id, student_id, first_interaction, last_interaction, session_count)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                first_interaction = LEAST(first_interaction, VALUES(first_interaction)),
+                last_interaction = GREATEST(last_interaction, VALUES(last_interaction)),
+                session_count = session_count + VALUES(session_count)
+        """, [key + value for key, value in associations.items()])
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def import_study_sessions(records, batch_size=IMPORT_BATCH_SIZE):
+    """ Validates and inserts study sessions in batches. Invalid records are skipped and reported.
+        Progress is not touched here; the report's 'pairs' set lists every (student, subject)
+        pair that needs one recalculation. A failed batch stops the import (earlier batches stay committed). """
+    # Foreign keys are checked in memory against the cached id sets, not with a query per row
+    student_ids = set(get_student_ids())
+    subject_ids = {row['subject_id'] for row in get_all_subjects()}
+    mentor_ids = {row['mentor_id'] for row in get_all_mentors()}
+
+    report = {'inserted': 0, 'rejected': 0, 'batches': 0, 'errors': [], 'pairs': set(), 'seconds': 0.0}
+    started = time.time()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        archived_before = get_archived_before(cursor)
+    finally:
+        cursor.close()
+    batch = []
+
+    def flush():
+        _insert_import_batch(conn, batch)
+        report['inserted'] += len(batch)
+        report['batches'] += 1
+        report['pairs'].update((row[0], row[1]) for row in batch)
+        batch.clear()
+
+    try:
+        for line_number, record in enumerate(records, start=1):
+            try:
+                batch.append(_validate_import_row(record, student_ids, subject_ids, mentor_ids, archived_before))
+            except ValueError as err:
+                report['rejected'] += 1
+                if len(report['errors']) < IMPORT_MAX_ERRORS:
+                    report['errors'].append({'record': line_number, 'error': str(err)})
+                continue
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        conn.close()
+        report['seconds'] = time.time() - started
+        if report['inserted']:
+            page_cache.clear() # New sessions can land on any student's or mentor's dashboard
+
+    rate = report['inserted'] / report['seconds'] if report['seconds'] else 0.0
+    print(f"STUDY IMPORT: {report['inserted']} sessions in {report['batches']} batches, "
+          f"{report['rejected']} rejected, {len(report['pairs'])} progress pairs ({rate:.0f} rows/s)")
+    return report
+
+@app.cli.command('import-study-sessions')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'json', 'ndjson']), default=None,
+              help='Input format (defaults to the file extension).')
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True, help='Rows per transactional batch.')
+def import_study_sessions_command(path, fmt, batch_size):
+    """ Bulk-import study sessions from an LMS export, then recalculate progress once per pair. """
+    fmt = fmt or path.rsplit('.', 1)[-1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        report = import_study_sessions(parse_study_import(f, fmt), batch_size)
+
+    for error in report['errors']:
+        print(f"  record {error['record']}: {error['error']}")
+
+    # The CLI process exits before queue workers would finish, so recalculate inline
+    failed = 0
+    for student_id, subject_id in sorted(report['pairs']):
+        if not update_student_progress(student_id, subject_id):
+            failed += 1
+    print(f"Progress recalculated for {len(report['pairs']) - failed}/{len(report['pairs'])} pairs.")
+    if report['rejected'] or failed:
+        raise SystemExit(1)
+
+@app.route('/system/import/study_sessions', methods=['POST'])
+def import_study_sessions_route():
+    if not session.get('sys_access'):
+        return jsonify({'error': 'PIN required.'}), 403
+
+    # Accepts a multipart upload ('file') or a raw request body; format from ?format= or the file name
+    upload = request.files.get('file')
+    fmt = request.args.get('format') or (upload.filename.rsplit('.', 1)[-1].lower() if upload and upload.filename else 'json')
+    if upload:
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8', newline='')
+    else:
+        stream = io.StringIO(request.get_data(as_text=True), newline='')
+
+    try:
+        report = import_study_sessions(parse_study_import(stream, fmt), request.args.get('batch_size', IMPORT_BATCH_SIZE, type=int))
+    except ValueError as err: # Unsupported format or malformed JSON
+        return jsonify({'error': str(err)}), 400
+    except mysql.connector.Error as err:
+        return jsonify({'error': f"Import stopped by a database error: {err}"}), 500
+
+    # One coalesced background recalculation per affected (student, subject) pair
+    for student_id, subject_id in report['pairs']:
+        enqueue_progress_update(student_id, subject_id)
+
+    report['pairs'] = len(report['pairs'])
+    return jsonify(report)
+
+# --- SYSTEM EXPORT: Streaming StudentStudySummary (CSV / NDJSON) ---
+SYSTEM_VIEW_PREVIEW_ROWS = 200
+EXPORT_FETCH_SIZE = 1000 # Rows pulled from the unbuffered cursor per chunk
+
+export_stats = {'exports': 0, 'rows': 0, 'seconds': 0.0, 'last_rows_per_second': 0.0}
+_export_stats_lock = threading.Lock()
+
+def build_study_summary_export_query(subject_id=None, semester=None, start_date=None, end_date=None):
+    """ Builds the export query over the aggregate base tables of StudentStudySummary.
+        Date-ranged exports sum the daily rollup; unranged exports read StudyHoursSummary. """
+    if start_date or end_date:
+        source, date_column = 'StudyDailyRollup', 'x.study_day'
+    else:
+        source, date_column = 'StudyHoursSummary', None
+
+    filters = []
+    params = []
+    if subject_id is not None:
+        filters.append("x.subject_id = %s")
+        params.append(subject_id)
+    if semester:
+        filters.append("s.semester = %s")
+        params.append(semester)
+    if start_date:
+        filters.append(f"{date_column} >= %s")
+        params.append(start_date)
+    if end_date:
+        filters.append(f"{date_column} <= %s")
+        params.append(end_date)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    query = f"""
+        SELECT s.student_id, s.name AS student_name, s.semester,
+               sub.subject_id, sub.subject_name, SUM(x.total_hours) AS total_study_hours
+        FROM {source} x
+        JOIN Students s ON x.student_id = s.student_id
+        JOIN Subjects sub ON x.subject_id = sub.subject_id
+        {where}
+        GROUP BY s.student_id, sub.subject_id
+        ORDER BY s.student_id, sub.subject_id
+    """
+    return query, tuple(params)
+
+def stream_study_summary(fmt, query, params):
+    """ Yields the export in chunks from an unbuffered cursor on a dedicated pooled connection,
+        so memory stays bounded by EXPORT_FETCH_SIZE regardless of the report size.
+        Exports read from a replica when one is healthy. """
+    conn = replica_router.acquire() or db_pool.acquire()
+    if conn is None:
+        yield '' if fmt == 'ndjson' else 'error\nDatabase Connection Failed.\n'
+        return
+
+    columns = ['student_id', 'student_name', 'semester', 'subject_id', 'subject_name', 'total_study_hours']
+    started = time.time()
+    rows_sent = 0
+    cursor = conn.cursor(dictionary=True) # Unbuffered: rows are read from the server as we go
+    try:
+        cursor.execute(query, params)
+        if fmt == 'csv':
+            yield ','.join(columns) + '\n'
+
+        while True:
+            rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+            if not rows:
+                break
+            chunk = io.StringIO()
+            if fmt == 'csv':
+                writer = csv.writer(chunk, lineterminator='\n')
+                for row in rows:
+                    writer.writerow([row[column] for column in columns])
+            else:
+                for row in rows:
+                    row['total_study_hours'] = float(row['total_study_hours'])
+                    chunk.write(json.dumps(row) + '\n')
+            rows_sent += len(rows)
+            yield chunk.getvalue()
+    except mysql.connector.Error as err:
+        print(f"Error streaming study summary export: {err}")
+    finally:
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            # Stopped mid-result (client disconnected or a fetch failed): the unread rows are still on
+            # the wire, so the connection is closed rather than drained back into the pool
+            conn.discard()
+        finally:
+            conn.release()
+
+        elapsed = time.time() - started
+        rate = rows_sent / elapsed if elapsed else 0.0
+        with _export_stats_lock:
+            export_stats['exports'] += 1
+            export_stats['rows'] += rows_sent
+            export_stats['seconds'] += elapsed
+            export_stats['last_rows_per_second'] = rate
+        print(f"EXPORT study_summary.{fmt}: {rows_sent} rows in {elapsed:.2f}s ({rate:.0f} rows/s)")
+
+@app.route('/system/export/study_summary.<fmt>')
+def export_study_summary(fmt):
+    if not session.get('sys_access'):
+        return redirect(url_for('subjects_pin'))
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': "Format must be 'csv' or 'ndjson'."}), 404
+
+    try:
+        start_date = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') else None
+        end_date = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else None
+    except ValueError:
+        return jsonify({'error': 'Dates must be YYYY-MM-DD.'}), 400
+
+    query, params = build_study_summary_export_query(
+        subject_id=request.args.get('subject_id', type=int),
+        semester=request.args.get('semester'),
+        start_date=start_date,
+        end_date=end_date
+    )
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = Response(stream_with_context(stream_study_summary(fmt, query, params)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=study_summary.{fmt}'
+    return response
+
 # --- SYSTEM VIEW: Subjects, Mentors & Analytics ---
 @app.route('/subjects', methods=['GET', 'POST'])
 def subjects():
@@ -1001,22 +3771,20 @@ def subjects():
         else:
             return redirect(url_for('subjects_pin'))
 
-    # --- 2. Database connection (Only runs if session['sys_access'] is True) ---
-    conn = get_db_connection()
+    # --- 2. Database connection (Only runs if session['sys_access'] is True; analytics read from a replica) ---
+    conn = get_read_connection()
     if conn:
         cursor = conn.cursor(dictionary=True)
         
-        # 1. Fetch Subjects
-        cursor.execute("SELECT * FROM Subjects")
-        subjects_data = cursor.fetchall()
+        # 1. Fetch Subjects (cached reference data)
+        subjects_data = get_all_subjects()
         
-        # 2. Fetch Mentors
-        cursor.execute("SELECT * FROM Mentors")
-        mentors_data = cursor.fetchall()
+        # 2. Fetch Mentors (cached reference data)
+        mentors_data = get_all_mentors()
 
-        # 3. Fetch Analytics
+        # 3. Fetch Analytics (bounded preview; the full report is available via the streaming export)
         try:
-            cursor.execute("SELECT * FROM StudentStudySummary")
+            cursor.execute("SELECT * FROM StudentStudySummary LIMIT %s", (SYSTEM_VIEW_PREVIEW_ROWS,))
             analytics_data = cursor.fetchall()
         except mysql.connector.Error:
             analytics_data = [] 
@@ -1037,7 +3805,7 @@ def add_mentor_action():
     if request.method == 'POST':
         name = request.form['name']
         email = request.form['email']
-        password = request.form['password']
+        password = hash_password(request.form['password'])
         expertise = request.form['expertise']
 
         conn = get_db_connection()
@@ -1046,6 +3814,7 @@ def add_mentor_action():
         try:
             cursor.callproc('AddMentor', (name, email, password, expertise))
             conn.commit()
+            reference_cache.invalidate('mentors:')
         except mysql.connector.Error as err:
             print(f"Error: {err}")
         finally:
@@ -1064,6 +3833,8 @@ def delete_mentor(mentor_id):
     try:
         cursor.callproc('DeleteMentor', (mentor_id,))
         conn.commit()
+        reference_cache.invalidate('mentors:')
+        drop_principal('mentor', mentor_id)
     except mysql.connector.Error as err:
         print(f"Error deleting mentor: {err}")
     finally:
@@ -1090,6 +3861,7 @@ def add_subject_action():
             # However, inserting via SQL setup is the preferred method for the current task.
             cursor.callproc('AddSubject', (subject_name, credits))
             conn.commit()
+            reference_cache.invalidate('subjects:')
         except mysql.connector.Error as err:
             print(f"Error: {err}")
         finally:
@@ -1108,6 +3880,7 @@ def delete_subject(subject_id):
     try:
         cursor.callproc('DeleteSubject', (subject_id,))
         conn.commit()
+        reference_cache.invalidate('subjects:')
     except mysql.connector.Error as err:
         print(f"Error deleting subject: {err}")
     finally:
@@ -1122,7 +3895,7 @@ def feedback():
     if 'user_id' not in session:
         return redirect(url_for('login'))
 
-    conn = get_db_connection()
+    conn = get_read_connection()
     cursor = conn.cursor(dictionary=True)
     
     role = session['role']
@@ -1134,18 +3907,7 @@ def feedback():
         # --- MODIFIED QUERY: Fetch only associated students ---
         
         # 1. Fetch list of students who have logged study hours with this mentor
-        associated_students_query = """
-            SELECT DISTINCT
-                S.student_id, 
-                S.name, 
-                S.semester 
-            FROM Students S
-            JOIN StudyLog SL ON S.student_id = SL.student_id
-            WHERE SL.mentor_id = %s
-            ORDER BY S.name;
-        """
-        cursor.execute(associated_students_query, (mentor_id,))
-        students = cursor.fetchall()
+        students = get_associated_students(cursor, mentor_id)
 
         # 2. Fetch feedback history given BY this mentor (Using Stored Procedure)
         try:
@@ -1190,6 +3952,7 @@ def submit_feedback():
         query = "INSERT INTO MentorFeedback (student_id, mentor_id, rating, comments) VALUES (%s, %s, %s, %s)"
         cursor.execute(query, (student_id, mentor_id, rating, comments))
         conn.commit()
+        page_cache.invalidate_user('student', student_id)
         flash("Progress Report submitted successfully!", "success")
     except mysql.connector.Error as err:
         print(f"Error submitting feedback: {err}")
@@ -1200,5 +3963,330 @@ def submit_feedback():
 
     return redirect(url_for('feedback'))
 
+# --- Data Lifecycle Configuration ('flask archive') ---
+archive_config = {
+    'term_start_months': (1, 7),  # Terms start in January and July
+    'keep_terms': 2,              # The current and the previous term stay in the hot tables
+    'months_ahead': 3             # Monthly partitions kept ready ahead of today
+}
+
+# Range-partitioned hot tables -> their partitioning (TIMESTAMP) column
+ARCHIVED_TABLES = {
+    'StudyLog': 'study_date',
+    'Messages': 'timestamp'
+}
+
+def _next_month(month_start):
+    return (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def archive_cutoff(today=None):
+    """ Start of the oldest term kept hot. Partitions ending on or before it hold closed terms only. """
+    today = today or datetime.now().date()
+    term_starts = [datetime(year, month, 1)
+                   for year in range(today.year, today.year - archive_config['keep_terms'] - 1, -1)
+                   for month in sorted(archive_config['term_start_months'], reverse=True)
+                   if datetime(year, month, 1).date() <= today]
+    return term_starts[archive_config['keep_terms'] - 1]
+
+def get_archived_before(cursor):
+    """ Returns the end of the newest archived StudyLog partition (no StudyLog rows remain before it), or None """
+    cursor.execute("SELECT MAX(range_end) FROM ArchiveRuns WHERE table_name = 'StudyLog'")
+    return cursor.fetchone()[0]
+
+def get_partitions(cursor, table):
+    """ Returns [(partition_name, upper_bound)] in partition order; upper_bound is None for MAXVALUE """
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION;
+    """, (table,))
+    return [(name, None if bound == 'MAXVALUE' else int(bound), rows) for name, bound, rows in cursor.fetchall()]
+
+def add_future_partitions(cursor, table, months_ahead):
+    """ Splits p_future so a monthly partition exists through `months_ahead` months from now.
+        p_future is normally empty, so the REORGANIZE only touches metadata. Returns the names added. """
+    monthly = [name for name, _, _ in get_partitions(cursor, table) if re.fullmatch(r'p\d{6}', name)]
+    this_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month = _next_month(datetime.strptime(monthly[-1][1:], '%Y%m')) if monthly else this_month
+    last_month = this_month
+    for _ in range(months_ahead):
+        last_month = _next_month(last_month)
+
+    added = []
+    while month <= last_month:
+        added.append(month)
+        month = _next_month(month)
+    if not added:
+        return []
+    parts = ', '.join(f"PARTITION p{m:%Y%m} VALUES LESS THAN (UNIX_TIMESTAMP('{_next_month(m):%Y-%m-%d}'))" for m in added)
+    cursor.execute(f"ALTER TABLE {table} REORGANIZE PARTITION p_future INTO ({parts}, PARTITION p_future VALUES LESS THAN MAXVALUE)")
+    return [f"p{m:%Y%m}" for m in added]
+
+def _archive_study_log_partition(conn, partition, range_end):
+    """ Copies one closed StudyLog partition to StudyLogArchive, folds it into StudyArchiveTotals and drops it.
+        StudyHoursSummary, the rollups and MentorStudent already count these rows and are left as they are.
+        Returns the number of rows archived. """
+    cursor = conn.cursor()
+    try:
+        archived = 0
+        cursor.execute("SELECT 1 FROM ArchiveRuns WHERE table_name = 'StudyLog' AND partition_name = %s", (partition,))
+        if cursor.fetchone() is None:
+            cursor.execute(f"""
+                INSERT INTO StudyLogArchive (log_id, student_id, subject_id, mentor_id, duration_hours, study_date)
+                SELECT log_id, student_id, subject_id, mentor_id, duration_hours, study_date
+                FROM StudyLog PARTITION ({partition});
+            """)
+            archived = cursor.rowcount
+            cursor.execute(f"""
+                INSERT INTO StudyArchiveTotals (student_id, subject_id, mentor_id, total_hours, session_count,
+                                                first_study_date, last_study_date)
+                SELECT student_id, subject_id, mentor_id, SUM(duration_hours), COUNT(*), MIN(study_date), MAX(study_date)
+                FROM StudyLog PARTITION ({partition})
+                WHERE student_id IS NOT NULL AND subject_id IS NOT NULL AND mentor_id IS NOT NULL
+                GROUP BY student_id, subject_id, mentor_id
+                ON DUPLICATE KEY UPDATE
+                    total_hours = total_hours + VALUES(total_hours),
+                    session_count = session_count + VALUES(session_count),
+                    first_study_date = LEAST(COALESCE(first_study_date, VALUES(first_study_date)), VALUES(first_study_date)),
+                    last_study_date = GREATEST(COALESCE(last_study_date, VALUES(last_study_date)), VALUES(last_study_date));
+            """)
+            cursor.execute("""
+                INSERT INTO ArchiveRuns (table_name, partition_name, range_end, rows_archived)
+                VALUES ('StudyLog', %s, %s, %s)
+            """, (partition, range_end, archived))
+            conn.commit()
+        # DDL commits on its own; if it fails, the ArchiveRuns row makes the next run skip straight to the drop
+        cursor.execute(f"ALTER TABLE StudyLog DROP PARTITION {partition}")
+        return archived
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def _archive_messages_partition(conn, partition, range_end):
+    """ Moves the read messages of one closed Messages partition to MessagesArchive. Unread messages stay
+        in place so unread counts are unchanged; the partition is dropped once none are left.
+        Returns (rows_archived, unread_rows_kept). """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            INSERT IGNORE INTO MessagesArchive (message_id, sender_id, recipient_id, sender_role, recipient_role,
+                                                content, timestamp, is_read)
+            SELECT message_id, sender_id, recipient_id, sender_role, recipient_role, content, timestamp, is_read
+            FROM Messages PARTITION ({partition})
+            WHERE is_read = TRUE;
+        """)
+        archived = cursor.rowcount
+        cursor.execute(f"SELECT COUNT(*) FROM Messages PARTITION ({partition}) WHERE is_read = FALSE")
+        kept = cursor.fetchone()[0]
+        if kept:
+            # Only rows that made it into the archive are removed
+            cursor.execute(f"""
+                DELETE m FROM Messages PARTITION ({partition}) m
+                JOIN MessagesArchive a ON a.message_id = m.message_id;
+            """)
+        cursor.execute("""
+            INSERT INTO ArchiveRuns (table_name, partition_name, range_end, rows_archived, rows_kept)
+            VALUES ('Messages', %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                rows_archived = rows_archived + VALUES(rows_archived),
+                rows_kept = VALUES(rows_kept),
+                archived_at = CURRENT_TIMESTAMP;
+        """, (partition, range_end, archived, kept))
+        conn.commit()
+        if not kept:
+            cursor.execute(f"ALTER TABLE Messages DROP PARTITION {partition}")
+        return archived, kept
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def run_archival(dry_run=False):
+    """ Adds upcoming monthly partitions to StudyLog and Messages and archives every partition that ends
+        on or before archive_cutoff(). Returns {'cutoff': datetime, 'tables': {table: report}}. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cutoff = archive_cutoff()
+    report = {'cutoff': cutoff, 'tables': {}}
+    try:
+        cursor.execute("SELECT UNIX_TIMESTAMP(%s)", (cutoff,))
+        cutoff_bound = int(cursor.fetchone()[0])
+        for table in ARCHIVED_TABLES:
+            partitions = get_partitions(cursor, table)
+            if not partitions:
+                raise ValueError(f"{table} is not partitioned; run 'flask migrate' first.")
+            closed = [(name, rows) for name, bound, rows in partitions
+                      if bound is not None and bound <= cutoff_bound and re.fullmatch(r'p\d{6}', name)]
+            table_report = {'closed': [name for name, _ in closed], 'estimated_rows': sum(rows or 0 for _, rows in closed),
+                            'added': [], 'rows_archived': 0, 'rows_kept': 0}
+            report['tables'][table] = table_report
+            if dry_run:
+                continue
+
+            table_report['added'] = add_future_partitions(cursor, table, archive_config['months_ahead'])
+            for name, _ in closed:
+                range_end = _next_month(datetime.strptime(name[1:], '%Y%m'))
+                started = time.time()
+                if table == 'StudyLog':
+                    archived, kept = _archive_study_log_partition(conn, name, range_end), 0
+                else:
+                    archived, kept = _archive_messages_partition(conn, name, range_end)
+                table_report['rows_archived'] += archived
+                table_report['rows_kept'] += kept
+                print(f"  {table} {name}: {archived} rows archived"
+                      + (f", {kept} unread kept" if kept else '') + f" in {time.time() - started:.1f}s")
+    finally:
+        cursor.close()
+        conn.close()
+
+    if not dry_run and any(t['closed'] for t in report['tables'].values()):
+        page_cache.clear() # Feeds and inboxes no longer list the archived rows
+    return report
+
+
+@app.cli.command('archive')
+@click.option('--dry-run', is_flag=True, help='List the closed partitions without archiving or adding partitions.')
+def archive_command(dry_run):
+    """ Archive closed terms of StudyLog and Messages and add upcoming monthly partitions. """
+    try:
+        report = run_archival(dry_run)
+    except (mysql.connector.Error, ValueError) as err:
+        print(f"Archival failed: {err}")
+        raise SystemExit(1)
+
+    print(f"Archive cutoff: {report['cutoff']:%Y-%m-%d} (terms starting before it are closed)")
+    for table, table_report in report['tables'].items():
+        if dry_run:
+            print(f"  {table}: {len(table_report['closed'])} closed partitions "
+                  f"(~{table_report['estimated_rows']} rows): {', '.join(table_report['closed']) or 'none'}")
+        else:
+            print(f"  {table}: {table_report['rows_archived']} rows archived from {len(table_report['closed'])} partitions, "
+                  f"{table_report['rows_kept']} unread kept, partitions added: {', '.join(table_report['added']) or 'none'}")
+
+
+# --- SCHEMA MIGRATIONS: Versioned Runner ('flask migrate') ---
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+def split_sql_script(script):
+    """ Splits a migration into statements, honouring DELIMITER changes around procedure bodies """
+    statements = []
+    delimiter = ';'
+    buffer = []
+    for line in script.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith('DELIMITER '):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if not buffer and (not stripped or stripped.startswith('--')):
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = '\n'.join(buffer).rstrip()[:-len(delimiter)].strip()
+            if statement:
+                statements.append(statement)
+            buffer = []
+    trailing = '\n'.join(buffer).strip()
+    if trailing:
+        statements.append(trailing)
+    return statements
+
+def load_migrations():
+    """ Returns the migrations/NNNN_name.sql files in version order """
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.match(r'^(\d+)_(\w+)\.sql$', filename)
+        if not match:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, filename), encoding='utf-8') as f:
+            script = f.read()
+        migrations.append({
+            'version': int(match.group(1)),
+            'name': match.group(2),
+            'script': script,
+            'checksum': hashlib.sha256(script.encode('utf-8')).hexdigest()
+        })
+    return migrations
+
+def get_applied_migrations(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            checksum CHAR(64) NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+    """)
+    cursor.execute("SELECT version, name, checksum, applied_at FROM SchemaMigrations ORDER BY version")
+    return {row['version']: row for row in cursor.fetchall()}
+
+def apply_migrations(target=None, baseline=None):
+    """ Applies pending migrations up to target (all when None), one version at a time.
+        With baseline, versions up to it are only recorded as applied, for databases whose
+        schema already has those changes. Returns the list of versions applied or recorded. """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    done = []
+    try:
+        applied = get_applied_migrations(cursor)
+        for migration in load_migrations():
+            version = migration['version']
+            if version in applied or (target is not None and version > target):
+                continue
+            if baseline is not None and version <= baseline:
+                print(f"  {version:04d}_{migration['name']}: recorded (baseline)")
+            else:
+                started = time.time()
+                # MySQL commits DDL implicitly, so a failure leaves earlier statements of this version applied
+                for statement in split_sql_script(migration['script']):
+                    cursor.execute(statement)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                print(f"  {version:04d}_{migration['name']}: applied in {time.time() - started:.2f}s")
+            cursor.execute("INSERT INTO SchemaMigrations (version, name, checksum) VALUES (%s, %s, %s)",
+                           (version, migration['name'], migration['checksum']))
+            conn.commit()
+            done.append(version)
+        return done
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.cli.command('migrate')
+@click.option('--status', is_flag=True, help='List migrations and whether they are applied, without applying any.')
+@click.option('--to', 'target', type=int, default=None, help='Apply pending migrations up to this version only.')
+@click.option('--baseline', type=int, default=None,
+              help='Record versions up to this one as applied without running them (existing databases).')
+def migrate_command(status, target, baseline):
+    """ Apply the versioned schema migrations in migrations/. """
+    if status:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            applied = get_applied_migrations(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+        for migration in load_migrations():
+            row = applied.get(migration['version'])
+            state = f"applied {row['applied_at']}" if row else 'pending'
+            if row and row['checksum'] and row['checksum'] != migration['checksum']:
+                state += ' (file changed since it was applied)'
+            print(f"  {migration['version']:04d}_{migration['name']}: {state}")
+        return
+
+    try:
+        done = apply_migrations(target, baseline)
+    except mysql.connector.Error as err:
+        print(f"Migration failed: {err}")
+        raise SystemExit(1)
+    print(f"{len(done)} migrations applied." if done else "Schema is up to date.")
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,93 @@
+# --- BENCHMARK: Sync vs. Async Independent Reads (dashboard / inbox query sets) ---
+# Compares running each page's independent queries one after another on mysql.connector with
+# running them concurrently on the aiomysql read pool (requires the optional 'aiomysql' package).
+# Usage (from the project root, against a database filled by benchmarks/generate_dataset.py):
+#     python benchmarks/async_read_bench.py --requests 500 --threads 1 8 32
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from app import (db_config, async_read_config, AsyncReadPool, study_log_page_query, inbox_page_query,
+                 contacts_query, PRESSING_GOAL_QUERY)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compare sync and async execution of independent page queries.')
+    parser.add_argument('--requests', type=int, default=300, help='Simulated page loads per mode and thread count')
+    parser.add_argument('--threads', type=int, nargs='*', default=[1, 8, 32], help='Concurrent clients to test')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def page_queries(student_id):
+    """ The independent reads behind one student dashboard plus one student inbox page """
+    return {
+        'logs': study_log_page_query('student', student_id),
+        'goal': (PRESSING_GOAL_QUERY, (student_id,)),
+        'inbox': inbox_page_query(student_id, 'student'),
+        'contacts': contacts_query(student_id, 'student')
+    }
+
+
+def run_mode(mode, student_ids, total_requests, threads, pool, seed):
+    per_thread = [total_requests // threads + (1 if i < total_requests % threads else 0) for i in range(threads)]
+
+    def client_loop(worker_index, request_count):
+        rng = random.Random(seed + worker_index)
+        conn = mysql.connector.connect(**db_config) if mode == 'sync' else None
+        cursor = conn.cursor(dictionary=True) if conn else None
+        for _ in range(request_count):
+            queries = page_queries(rng.choice(student_ids))
+            if mode == 'sync':
+                for query, params in queries.values():
+                    cursor.execute(query, params)
+                    cursor.fetchall()
+                conn.commit() # End the read snapshot, like a pooled connection release
+            else:
+                pool.gather(queries)
+        if conn:
+            cursor.close()
+            conn.close()
+
+    workers = [threading.Thread(target=client_loop, args=(i, count)) for i, count in enumerate(per_thread) if count]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - started
+    return total_requests / wall if wall else 0.0, wall / total_requests * 1000 * threads
+
+
+def main():
+    args = parse_args()
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT student_id FROM StudyLog ORDER BY student_id LIMIT 1000")
+    student_ids = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    if not student_ids:
+        print("No StudyLog data found. Run benchmarks/generate_dataset.py first.")
+        sys.exit(2)
+
+    pool = AsyncReadPool(db_config, async_read_config['minsize'], max(async_read_config['maxsize'], max(args.threads) * 4),
+                         async_read_config['timeout'])
+    pool.gather(page_queries(student_ids[0])) # Start the loop and pool outside the timed runs
+
+    print(f"{'threads':>7} | {'sync pages/s':>12} | {'sync ms/page':>12} | {'async pages/s':>13} | {'async ms/page':>13}")
+    print('-' * 70)
+    for threads in args.threads:
+        sync_rate, sync_ms = run_mode('sync', student_ids, args.requests, threads, pool, args.seed)
+        async_rate, async_ms = run_mode('async', student_ids, args.requests, threads, pool, args.seed)
+        print(f"{threads:>7} | {sync_rate:>12.1f} | {sync_ms:>12.2f} | {async_rate:>13.1f} | {async_ms:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# --- BENCHMARK DATA: Synthetic EduMentor Dataset Generator ---
+# Usage (from the project root, against a scratch copy of edumentor_db):
+#     python benchmarks/generate_dataset.py --students 100000 --study-logs 10000000 --messages 5000000 --reset
+# The same --seed always produces the same rows, so benchmark runs are reproducible.
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from app import db_config
+
+FIRST_NAMES = ['Sarah', 'Kyle', 'Ellen', 'Deckard', 'Gideon', 'Ada', 'Alan', 'Grace', 'Linus', 'Katherine',
+               'Dorothy', 'Edsger', 'Barbara', 'Donald', 'Frances', 'Claude', 'Radia', 'Tim', 'Hedy', 'John']
+LAST_NAMES = ['Connor', 'Reese', 'Ripley', 'Blade', 'Nav', 'Turing', 'Hopper', 'Lovelace', 'Torvalds', 'Johnson',
+              'Vaughan', 'Dijkstra', 'Liskov', 'Knuth', 'Allen', 'Shannon', 'Perlman', 'Berners-Lee', 'Lamarr', 'Backus']
+EXPERTISE = ['AI & Logic', 'Compilers', 'Algorithm Design', 'Physics & Computation', 'Game Theory', 'Software Engineering']
+MESSAGE_SNIPPETS = ['Please review the latest module.', 'Task complete, ready for review!', 'Can we discuss the last quiz?',
+                    'Great progress this week.', 'I am stuck on the recursion exercise.', 'Reminder: report due Friday.']
+
+# Tables cleared by --reset, children first
+RESET_TABLES = ['Messages', 'MessagesArchive', 'SubjectGoals', 'StudentProgress', 'MentorFeedback', 'StudyHoursSummary',
+                'StudyDailyRollup', 'StudyWeeklyRollup', 'MentorStudent', 'StudyLog', 'StudyLogArchive',
+                'StudyArchiveTotals', 'ArchiveRuns', 'Students', 'Mentors', 'Subjects']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate a synthetic EduMentor dataset.')
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--mentors', type=int, default=50)
+    parser.add_argument('--subjects', type=int, default=40)
+    parser.add_argument('--study-logs', type=int, default=100000)
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--goals', type=int, default=2000)
+    parser.add_argument('--feedback', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=365, help='StudyLog/Messages dates are spread over this many past days')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help='TRUNCATE the EduMentor tables before generating')
+    return parser.parse_args()
+
+
+def insert_batches(conn, label, query, row_source, total, batch_size):
+    """ Inserts rows from a generator with executemany() (multi-row INSERTs), one commit per batch """
+    cursor = conn.cursor()
+    started = time.time()
+    batch = []
+    inserted = 0
+    for row in row_source:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(query, batch)
+            conn.commit()
+            inserted += len(batch)
+            batch = []
+            print(f"  {label}: {inserted}/{total} ({inserted / (time.time() - started):.0f} rows/s)", end='\r')
+    if batch:
+        cursor.executemany(query, batch)
+        conn.commit()
+        inserted += len(batch)
+    cursor.close()
+    print(f"  {label}: {inserted} rows in {time.time() - started:.1f}s" + ' ' * 20)
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+
+    def random_past_time():
+        return now - timedelta(seconds=rng.randint(0, args.days * 86400))
+
+    def person_name(i):
+        return f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]} {i}"
+
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    # Bulk-load settings for this session only
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute("SET UNIQUE_CHECKS = 0")
+
+    if args.reset:
+        for table in RESET_TABLES:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        print("Tables truncated.")
+
+    # IDs continue after any existing rows so the generator can also top up a seeded database
+    def next_id(table, column):
+        cursor.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table}")
+        return cursor.fetchone()[0] + 1
+
+    first_subject = next_id('Subjects', 'subject_id')
+    first_mentor = next_id('Mentors', 'mentor_id')
+    first_student = next_id('Students', 'student_id')
+    subject_ids = range(first_subject, first_subject + args.subjects)
+    mentor_ids = range(first_mentor, first_mentor + args.mentors)
+    student_ids = range(first_student, first_student + args.students)
+
+    print(f"Generating dataset (seed={args.seed})")
+    insert_batches(conn, 'Subjects', "INSERT INTO Subjects (subject_id, subject_name, credits) VALUES (%s, %s, %s)",
+                   ((sid, f"Subject Protocol {sid}", rng.choice([3, 4])) for sid in subject_ids),
+                   args.subjects, args.batch_size)
+    insert_batches(conn, 'Mentors',
+                   "INSERT INTO Mentors (mentor_id, name, email, password, expertise_area) VALUES (%s, %s, %s, %s, %s)",
+                   ((mid, person_name(mid), f"mentor{mid}@bench.edu", 'admin123', rng.choice(EXPERTISE)) for mid in mentor_ids),
+                   args.mentors, args.batch_size)
+    insert_batches(conn, 'Students',
+                   "INSERT INTO Students (student_id, name, email, password, semester) VALUES (%s, %s, %s, %s, %s)",
+                   ((sid, person_name(sid), f"student{sid}@bench.edu", 'student123', str(rng.randint(1, 8))) for sid in student_ids),
+                   args.students, args.batch_size)
+
+    # Each student studies a handful of subjects, each with a preferred mentor, like real enrolments
+    enrolments = {}
+    for sid in student_ids:
+        enrolments[sid] = [(rng.choice(subject_ids), rng.choice(mentor_ids)) for _ in range(rng.randint(2, 6))]
+
+    def study_logs():
+        for _ in range(args.study_logs):
+            sid = rng.choice(student_ids)
+            subject_id, mentor_id = rng.choice(enrolments[sid])
+            yield (sid, subject_id, mentor_id, round(rng.uniform(0.25, 4.0), 2), random_past_time())
+    insert_batches(conn, 'StudyLog',
+                   "INSERT INTO StudyLog (student_id, subject_id, mentor_id, duration_hours, study_date) VALUES (%s, %s, %s, %s, %s)",
+                   study_logs(), args.study_logs, args.batch_size)
+
+    def messages():
+        for _ in range(args.messages):
+            sid = rng.choice(student_ids)
+            _, mentor_id = rng.choice(enrolments[sid])
+            if rng.random() < 0.5:
+                yield (sid, mentor_id, 'student', 'mentor', rng.choice(MESSAGE_SNIPPETS), random_past_time(), rng.random() < 0.7)
+            else:
+                yield (mentor_id, sid, 'mentor', 'student', rng.choice(MESSAGE_SNIPPETS), random_past_time(), rng.random() < 0.7)
+    insert_batches(conn, 'Messages',
+                   "INSERT INTO Messages (sender_id, recipient_id, sender_role, recipient_role, content, timestamp, is_read) "
+                   "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                   messages(), args.messages, args.batch_size)
+
+    def goals():
+        for _ in range(args.goals):
+            sid = rng.choice(student_ids)
+            subject_id, mentor_id = rng.choice(enrolments[sid])
+            due = (now + timedelta(days=rng.randint(-30, 90))).date()
+            yield (sid, subject_id, mentor_id, rng.choice([10, 20, 30, 40]), due, False)
+    insert_batches(conn, 'SubjectGoals',
+                   "INSERT INTO SubjectGoals (student_id, subject_id, mentor_id, target_hours, due_date, is_met) VALUES (%s, %s, %s, %s, %s, %s)",
+                   goals(), args.goals, args.batch_size)
+
+    def feedback():
+        for _ in range(args.feedback):
+            sid = rng.choice(student_ids)
+            _, mentor_id = rng.choice(enrolments[sid])
+            yield (sid, mentor_id, rng.randint(1, 5), rng.choice(MESSAGE_SNIPPETS), random_past_time())
+    insert_batches(conn, 'MentorFeedback',
+                   "INSERT INTO MentorFeedback (student_id, mentor_id, rating, comments, feedback_date) VALUES (%s, %s, %s, %s, %s)",
+                   feedback(), args.feedback, args.batch_size)
+
+    # Derived tables are rebuilt set-based rather than generated row by row
+    print("Rebuilding StudyHoursSummary...")
+    cursor.execute("DELETE FROM StudyHoursSummary")
+    cursor.execute("""
+        INSERT INTO StudyHoursSummary (student_id, subject_id, mentor_id, total_hours, session_count, last_study_date)
+        SELECT student_id, subject_id, mentor_id, SUM(duration_hours), COUNT(*), MAX(study_date)
+        FROM StudyLog
+        GROUP BY student_id, subject_id, mentor_id
+    """)
+    conn.commit()
+
+    print("Rebuilding daily/weekly study rollups...")
+    cursor.execute("DELETE FROM StudyDailyRollup")
+    cursor.execute("""
+        INSERT INTO StudyDailyRollup (student_id, subject_id, study_day, total_hours, session_count)
+        SELECT student_id, subject_id, DATE(study_date), SUM(duration_hours), COUNT(*)
+        FROM StudyLog
+        GROUP BY student_id, subject_id, DATE(study_date)
+    """)
+    cursor.execute("DELETE FROM StudyWeeklyRollup")
+    cursor.execute("""
+        INSERT INTO StudyWeeklyRollup (student_id, subject_id, week_start, total_hours, session_count)
+        SELECT student_id, subject_id, DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY, SUM(duration_hours), COUNT(*)
+        FROM StudyLog
+        GROUP BY student_id, subject_id, DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY
+    """)
+    conn.commit()
+
+    print("Rebuilding MentorStudent associations...")
+    cursor.execute("DELETE FROM MentorStudent")
+    cursor.execute("""
+        INSERT INTO MentorStudent (mentor_id, student_id, first_interaction, last_interaction, session_count)
+        SELECT mentor_id, student_id, MIN(study_date), MAX(study_date), COUNT(*)
+        FROM StudyLog
+        GROUP BY mentor_id, student_id
+    """)
+    conn.commit()
+
+    cursor.execute("SET UNIQUE_CHECKS = 1")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.close()
+    conn.close()
+    print("Dataset ready.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# --- BENCHMARK: Goal Progress (N+1 per-goal lookups vs. batched service) ---
+# Usage (from the project root, with the XAMPP database running):
+#     python benchmarks/goal_progress_bench.py [goal_counts...]
+# Temporary goals are inserted inside a transaction that is rolled back at the end of each run,
+# so the benchmark leaves edumentor_db unchanged.
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from app import db_config, fetch_goals_with_progress
+
+BENCH_MENTOR_ID = 1
+REPEATS = 5
+
+
+class CountingCursor:
+    """ Dictionary cursor wrapper that counts the statements sent to MySQL """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.queries = 0
+
+    def execute(self, query, params=None):
+        self.queries += 1
+        return self._cursor.execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def legacy_goal_progress(cursor, mentor_id):
+    # Original goals_management logic: one SUM query per goal
+    cursor.execute("""
+        SELECT sg.goal_id, sg.student_id, sg.subject_id, s.name as student_name, sub.subject_name, sg.target_hours, sg.due_date, sg.is_met
+        FROM SubjectGoals sg
+        JOIN Students s ON sg.student_id = s.student_id
+        JOIN Subjects sub ON sg.subject_id = sub.subject_id
+        WHERE sg.mentor_id = %s
+        ORDER BY sg.due_date;
+    """, (mentor_id,))
+    goals = cursor.fetchall()
+    for goal in goals:
+        cursor.execute("SELECT SUM(duration_hours) AS current_hours FROM StudyLog WHERE student_id = %s AND subject_id = %s",
+                       (goal['student_id'], goal['subject_id']))
+        hours_result = cursor.fetchone()
+        current_hours = float(hours_result['current_hours']) if hours_result['current_hours'] is not None else 0.0
+        target_hours = float(goal['target_hours'])
+        goal['current_hours'] = current_hours
+        goal['progress_percent'] = min((current_hours / target_hours) * 100, 100.0) if target_hours > 0 else 0.0
+    return goals
+
+
+def seed_goals(cursor, count):
+    cursor.execute("SELECT student_id FROM Students")
+    student_ids = [row['student_id'] for row in cursor.fetchall()]
+    cursor.execute("SELECT subject_id FROM Subjects")
+    subject_ids = [row['subject_id'] for row in cursor.fetchall()]
+
+    rows = []
+    for i in range(count):
+        rows.append((student_ids[i % len(student_ids)], subject_ids[i % len(subject_ids)], BENCH_MENTOR_ID, 10 + (i % 20)))
+    cursor.executemany("""
+        INSERT INTO SubjectGoals (student_id, subject_id, mentor_id, target_hours, due_date)
+        VALUES (%s, %s, %s, %s, CURDATE() + INTERVAL 30 DAY)
+    """, rows)
+
+
+def time_run(func, cursor):
+    cursor.queries = 0
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return cursor.queries // REPEATS, best * 1000
+
+
+def main():
+    goal_counts = [int(arg) for arg in sys.argv[1:]] or [10, 50, 100, 300, 1000]
+    conn = mysql.connector.connect(**db_config)
+    raw_cursor = conn.cursor(dictionary=True, buffered=True)
+    cursor = CountingCursor(raw_cursor)
+
+    print(f"{'goals':>7} | {'legacy queries':>14} | {'legacy ms':>10} | {'batched queries':>15} | {'batched ms':>10}")
+    print('-' * 70)
+    try:
+        for count in goal_counts:
+            conn.start_transaction()
+            raw_cursor.execute("DELETE FROM SubjectGoals WHERE mentor_id = %s", (BENCH_MENTOR_ID,))
+            seed_goals(raw_cursor, count)
+
+            legacy_queries, legacy_ms = time_run(lambda: legacy_goal_progress(cursor, BENCH_MENTOR_ID), cursor)
+            batched_queries, batched_ms = time_run(lambda: fetch_goals_with_progress(cursor, 'mentor', BENCH_MENTOR_ID), cursor)
+
+            print(f"{count:>7} | {legacy_queries:>14} | {legacy_ms:>10.2f} | {batched_queries:>15} | {batched_ms:>10.2f}")
+            conn.rollback()
+    finally:
+        raw_cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
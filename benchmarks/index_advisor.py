@@ -0,0 +1,180 @@
+# --- BENCHMARK: EXPLAIN-Based Index Advisor ---
+# Runs EXPLAIN against the configured (seeded) database and reports full table scans, filesorts and
+# temporary tables, so indexes are added for the queries the routes actually run:
+#   1. Hot statements: every statement in app.statement_registry, i.e. the complete text the query
+#      builders produce (keyset ORDER BY ... LIMIT included), bound to the busiest student/mentor/subject.
+#   2. Every other SQL string literal in app.py, with placeholders bound to 1. Literals that are only
+#      fragments of a hot statement are covered by step 1 and not explained on their own.
+# Usage (from the project root, after 'flask migrate' and benchmarks/generate_dataset.py):
+#     python benchmarks/index_advisor.py [--min-rows 1000] [--json benchmarks/results/explain.json]
+# Other f-string queries (dynamic IN lists, filters or table names) are listed as skipped.
+import argparse
+import ast
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from app import db_config, statement_registry, study_log_page_query, inbox_page_query
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='EXPLAIN every SQL statement in app.py and flag slow access paths.')
+    parser.add_argument('--min-rows', type=int, default=1000,
+                        help='Only flag full scans whose estimated row count is at least this large')
+    parser.add_argument('--json', help='Also write the findings to this JSON file')
+    return parser.parse_args()
+
+
+def normalise(sql):
+    return ' '.join(sql.split()).rstrip(';').strip()
+
+
+def collect_statements(path, hot_texts=()):
+    """ Returns (line, sql) for plain string literals and (line, None) for f-string SQL.
+        Literals (or all literal parts of an f-string) contained in one of hot_texts are left out. """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    def covered(*parts):
+        parts = [normalise(part) for part in parts if normalise(part)]
+        return any(all(part in hot for part in parts) for hot in hot_texts)
+
+    found = []
+    fstring_parts = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr):
+            constants = [part.value for part in node.values if isinstance(part, ast.Constant)]
+            fstring_parts.update(id(part) for part in node.values)
+            if ''.join(constants).strip().upper().startswith(EXPLAINABLE) and not covered(*constants):
+                found.append((node.lineno, None))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in fstring_parts:
+            sql = node.value.strip().rstrip(';')
+            if sql.upper().startswith(EXPLAINABLE) and ' ' in sql and not covered(sql):
+                found.append((node.lineno, sql))
+    return sorted(found, key=lambda item: item[0])
+
+
+def representative_ids(cursor):
+    """ The busiest student, mentor and subject, so plans are judged on the largest index ranges """
+    ids = {}
+    for key, column in (('student', 'student_id'), ('mentor', 'mentor_id'), ('subject', 'subject_id')):
+        cursor.execute(f"SELECT {column} FROM StudyHoursSummary GROUP BY {column} ORDER BY SUM(session_count) DESC LIMIT 1")
+        row = cursor.fetchone()
+        ids[key] = row[column] if row else 1
+    return ids
+
+
+def hot_statement_params(ids):
+    """ Representative parameters per registered statement name, built with the same builders the routes use """
+    student, mentor, subject = ids['student'], ids['mentor'], ids['subject']
+    seek = (datetime.now(), 2 ** 31 - 1) # Cursor of a later page
+    return {
+        'messages.unread_count': (student, 'student'),
+        'contacts.students': (mentor,),
+        'contacts.mentors': (student,),
+        'goals.with_progress.student': (student, student),
+        'goals.with_progress.mentor': (mentor, mentor),
+        'goals.most_pressing': (student,),
+        'study_log.feed.student': study_log_page_query('student', student)[1],
+        'study_log.feed.student.after': study_log_page_query('student', student, seek)[1],
+        'study_log.feed.mentor': study_log_page_query('mentor', mentor)[1],
+        'study_log.feed.mentor.after': study_log_page_query('mentor', mentor, seek)[1],
+        'inbox.page': inbox_page_query(student, 'student')[1],
+        'inbox.page.after': inbox_page_query(student, 'student', seek)[1],
+        'study_log.insert': (student, subject, mentor, 1.5)
+    }
+
+
+def explain(cursor, sql, params=None):
+    if params is None:
+        cursor.execute('EXPLAIN ' + sql.replace('%s', '1'))
+    else:
+        cursor.execute('EXPLAIN ' + sql.strip().rstrip(';'), params)
+    return cursor.fetchall()
+
+
+def findings_for(plan, min_rows):
+    findings = []
+    for row in plan:
+        extra = row.get('Extra') or ''
+        rows = row.get('rows') or 0
+        table = row.get('table')
+        if row.get('type') == 'ALL' and rows >= min_rows:
+            findings.append(f"full scan of {table} (~{rows} rows)")
+        if 'Using filesort' in extra:
+            findings.append(f"filesort on {table}")
+        if 'Using temporary' in extra:
+            findings.append(f"temporary table for {table}")
+    return findings
+
+
+def main():
+    args = parse_args()
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor(dictionary=True)
+
+    report = {'hot': [], 'flagged': [], 'clean': 0, 'skipped': [], 'errors': []}
+    hot = statement_registry.statements()
+    params_by_name = hot_statement_params(representative_ids(cursor))
+    for name, sql in sorted(hot.items()):
+        if name not in params_by_name:
+            report['errors'].append({'statement': name, 'error': 'no representative parameters in index_advisor.py'})
+            continue
+        try:
+            plan = explain(cursor, sql, params_by_name[name])
+        except mysql.connector.Error as err:
+            report['errors'].append({'statement': name, 'error': str(err)})
+            continue
+        report['hot'].append({'statement': name, 'findings': findings_for(plan, args.min_rows)})
+
+    for line, sql in collect_statements(APP_PATH, [normalise(text) for text in hot.values()]):
+        if sql is None:
+            report['skipped'].append({'line': line, 'reason': 'f-string query'})
+            continue
+        try:
+            plan = explain(cursor, sql)
+        except mysql.connector.Error as err:
+            report['errors'].append({'line': line, 'error': str(err)})
+            continue
+        findings = findings_for(plan, args.min_rows)
+        if findings:
+            report['flagged'].append({'line': line, 'sql': ' '.join(sql.split())[:160], 'findings': findings})
+        else:
+            report['clean'] += 1
+    conn.rollback()
+    cursor.close()
+    conn.close()
+
+    for item in report['hot']:
+        print(f"hot {item['statement']}: {'; '.join(item['findings']) or 'ok'}")
+    for item in report['flagged']:
+        print(f"app.py:{item['line']}: {'; '.join(item['findings'])}")
+        print(f"    {item['sql']}")
+    for item in report['errors']:
+        where = f"hot {item['statement']}" if 'statement' in item else f"app.py:{item['line']}"
+        print(f"{where}: EXPLAIN failed: {item['error']}")
+    hot_flagged = sum(1 for item in report['hot'] if item['findings'])
+    print(f"{hot_flagged}/{len(report['hot'])} hot statements flagged; "
+          f"{len(report['flagged'])} other statements flagged, {report['clean']} clean, "
+          f"{len(report['skipped'])} f-string queries skipped (lines {', '.join(str(s['line']) for s in report['skipped'])}), "
+          f"{len(report['errors'])} errors.")
+
+    if args.json:
+        output_dir = os.path.dirname(args.json)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if report['flagged'] or hot_flagged else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# --- BENCHMARK: Password KDF Cost vs. Login Throughput ---
+# Measures how long one PBKDF2-SHA256 verification takes at several work factors and how many
+# logins per second the verifier pool sustains with different worker counts, so
+# credential_config['iterations'] and ['workers'] can be chosen for the deployment hardware.
+# Usage (from the project root; no database needed):
+#     python benchmarks/kdf_bench.py --iterations 100000 260000 600000 --workers 1 2 4 8 --logins 200
+# Aim for roughly 100-250 ms per hash and enough workers to cover the expected login peak.
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import hash_password, check_password, PasswordVerifier
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Measure password hashing cost and verifier throughput.')
+    parser.add_argument('--iterations', type=int, nargs='*', default=[100000, 260000, 600000])
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 2, 4, 8])
+    parser.add_argument('--logins', type=int, default=100, help='Verifications per worker-count run')
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent login requests')
+    return parser.parse_args()
+
+
+def single_hash_ms(iterations, samples=5):
+    stored = hash_password('correct horse battery staple', iterations)
+    started = time.perf_counter()
+    for _ in range(samples):
+        check_password('correct horse battery staple', stored)
+    return (time.perf_counter() - started) / samples * 1000, stored
+
+
+def logins_per_second(stored, workers, logins, clients):
+    verifier = PasswordVerifier(workers, max_pending=logins, timeout=600)
+    per_client = [logins // clients + (1 if i < logins % clients else 0) for i in range(clients)]
+
+    def client_loop(count):
+        for _ in range(count):
+            verifier.verify('correct horse battery staple', stored)
+
+    threads = [threading.Thread(target=client_loop, args=(count,)) for count in per_client if count]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return logins / wall if wall else 0.0
+
+
+def main():
+    args = parse_args()
+    print(f"{'iterations':>10} | {'ms/hash':>8} | " + ' | '.join(f"{f'{w} workers':>10}" for w in args.workers))
+    print('-' * (24 + 13 * len(args.workers)))
+    for iterations in args.iterations:
+        ms, stored = single_hash_ms(iterations)
+        rates = [logins_per_second(stored, workers, args.logins, args.clients) for workers in args.workers]
+        print(f"{iterations:>10} | {ms:>8.1f} | " + ' | '.join(f"{rate:>8.1f}/s" for rate in rates))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+# --- BENCHMARK: Route Load Test with JSON Baselines ---
+# Drives the Flask routes through the test client against the configured database
+# (fill it first with benchmarks/generate_dataset.py), then records throughput and latency
+# percentiles per endpoint.
+# Usage (from the project root):
+#     python benchmarks/load_test.py --requests 200 --threads 4 --output benchmarks/results/run.json
+#     python benchmarks/load_test.py --baseline benchmarks/results/run.json    # exits 1 on regression
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from app import app, db_config
+
+# Scenario name -> (role, path template). {subject_id} is filled from the user's own StudyLog rows.
+SCENARIOS = {
+    'dashboard_student': ('student', '/dashboard'),
+    'dashboard_mentor': ('mentor', '/dashboard'),
+    'goals_management': ('mentor', '/goals'),
+    'student_goals': ('student', '/student_goals'),
+    'message_inbox_student': ('student', '/messages'),
+    'message_inbox_mentor': ('mentor', '/messages'),
+    'progress_report': ('student', '/progress'),
+    'subject_analytics': ('student', '/subject_analytics/{subject_id}'),
+    'force_progress_recalc': ('system', '/system/force_progress_recalc')
+}
+# Expensive maintenance routes run only a few times per benchmark
+SCENARIO_REQUEST_CAP = {'force_progress_recalc': 3}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load-test EduMentor routes and compare against a baseline.')
+    parser.add_argument('--scenarios', nargs='*', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=100, help='Requests per scenario')
+    parser.add_argument('--threads', type=int, default=4, help='Concurrent clients per scenario')
+    parser.add_argument('--users', type=int, default=200, help='Distinct students/mentors sampled per run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'latest.json'))
+    parser.add_argument('--baseline', help='Previous results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help='Allowed relative slowdown of p95 / drop in throughput before flagging a regression')
+    return parser.parse_args()
+
+
+def sample_users(count, seed):
+    """ Picks active students (with one subject each) and mentors from the database, deterministically """
+    rng = random.Random(seed)
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    cursor.execute("SELECT student_id, MIN(subject_id) FROM StudyLog GROUP BY student_id ORDER BY student_id LIMIT %s", (count * 5,))
+    students = cursor.fetchall()
+    cursor.execute("SELECT DISTINCT mentor_id FROM StudyLog ORDER BY mentor_id LIMIT %s", (count * 5,))
+    mentors = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    rng.shuffle(students)
+    rng.shuffle(mentors)
+    return students[:count], mentors[:count]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(q * len(sorted_values)) - 1, 0)]
+
+
+def run_scenario(name, total_requests, threads, students, mentors, seed):
+    role, path_template = SCENARIOS[name]
+    total_requests = min(total_requests, SCENARIO_REQUEST_CAP.get(name, total_requests))
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def client_loop(worker_index, request_count):
+        rng = random.Random(seed + worker_index)
+        client = app.test_client()
+        for _ in range(request_count):
+            with client.session_transaction() as sess:
+                sess.clear()
+                if role == 'student':
+                    student_id, subject_id = rng.choice(students)
+                    sess.update({'user_id': student_id, 'role': 'student', 'name': f"Bench Student {student_id}"})
+                elif role == 'mentor':
+                    mentor_id = rng.choice(mentors)
+                    subject_id = None
+                    sess.update({'user_id': mentor_id, 'role': 'mentor', 'name': f"Bench Mentor {mentor_id}"})
+                else:
+                    subject_id = None
+                    sess['sys_access'] = True
+            path = path_template.format(subject_id=subject_id)
+
+            started = time.perf_counter()
+            response = client.get(path)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code >= 400:
+                    errors[0] += 1
+
+    per_thread = [total_requests // threads + (1 if i < total_requests % threads else 0) for i in range(threads)]
+    workers = [threading.Thread(target=client_loop, args=(i, count)) for i, count in enumerate(per_thread) if count]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': len(latencies) / wall if wall else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000
+    }
+
+
+def compare(results, baseline, tolerance):
+    """ Returns a list of human-readable regressions between two result files """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if not previous:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms")
+        if previous['throughput_rps'] and current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s")
+    return regressions
+
+
+def main():
+    args = parse_args()
+    students, mentors = sample_users(args.users, args.seed)
+    if not students or not mentors:
+        print("No StudyLog data found. Run benchmarks/generate_dataset.py first.")
+        sys.exit(2)
+
+    # Read the baseline first: --output may point at the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {'requests': args.requests, 'threads': args.threads, 'users': args.users, 'seed': args.seed},
+        'scenarios': {}
+    }
+
+    print(f"{'scenario':<24} | {'req':>5} | {'err':>4} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}")
+    print('-' * 84)
+    for name in args.scenarios:
+        stats = run_scenario(name, args.requests, args.threads, students, mentors, args.seed)
+        results['scenarios'][name] = stats
+        print(f"{name:<24} | {stats['requests']:>5} | {stats['errors']:>4} | {stats['throughput_rps']:>8.1f} | "
+              f"{stats['p50_ms']:>8.1f} | {stats['p95_ms']:>8.1f} | {stats['p99_ms']:>8.1f}")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"REGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions vs {args.baseline}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# --- BENCHMARK: Prepared Statements vs. Text Protocol (hot app.py queries) ---
+# Runs each registered hot statement repeatedly on one connection, first as plain text SQL
+# (parsed by MySQL on every call) and then through a server-side prepared cursor (parsed once).
+# Usage (from the project root, against a database filled by benchmarks/generate_dataset.py):
+#     python benchmarks/prepared_bench.py --executions 2000
+# The StudyLog insert runs inside a transaction that is rolled back, so no rows are kept.
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from app import (db_config, study_log_page_query, inbox_page_query, goals_with_progress_query, UNREAD_COUNT_QUERY,
+                 ASSOCIATED_MENTORS_QUERY, PRESSING_GOAL_QUERY, STUDY_LOG_INSERT_QUERY)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compare prepared and text-protocol execution of hot statements.')
+    parser.add_argument('--executions', type=int, default=1000, help='Executions per statement and protocol')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def sample_ids(cursor, query):
+    cursor.execute(query)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def workload(student_ids, mentor_ids, subject_ids):
+    """ (label, sql, params factory) for the statements the dashboard, inbox, goals and log_study pages run """
+    return [
+        ('study_log.feed.student', study_log_page_query('student', 0)[0],
+         lambda rng: study_log_page_query('student', rng.choice(student_ids))[1]),
+        ('study_log.feed.mentor', study_log_page_query('mentor', 0)[0],
+         lambda rng: study_log_page_query('mentor', rng.choice(mentor_ids))[1]),
+        ('inbox.page', inbox_page_query(0, 'student')[0],
+         lambda rng: inbox_page_query(rng.choice(student_ids), 'student')[1]),
+        ('messages.unread_count', UNREAD_COUNT_QUERY, lambda rng: (rng.choice(student_ids), 'student')),
+        ('goals.with_progress.student', goals_with_progress_query('student'),
+         lambda rng: (rng.choice(student_ids),) * 2),
+        ('goals.most_pressing', PRESSING_GOAL_QUERY, lambda rng: (rng.choice(student_ids),)),
+        ('contacts.mentors', ASSOCIATED_MENTORS_QUERY, lambda rng: (rng.choice(student_ids),)),
+        ('study_log.insert', STUDY_LOG_INSERT_QUERY,
+         lambda rng: (rng.choice(student_ids), rng.choice(subject_ids), rng.choice(mentor_ids), 1.5))
+    ]
+
+
+def run(conn, prepared, sql, make_params, executions, seed):
+    rng = random.Random(seed)
+    cursor = conn.cursor(prepared=True) if prepared else conn.cursor()
+    if prepared:
+        sql = sql.strip().rstrip(';')
+    started = time.perf_counter()
+    for _ in range(executions):
+        cursor.execute(sql, make_params(rng))
+        if cursor.with_rows:
+            cursor.fetchall()
+    elapsed = time.perf_counter() - started
+    cursor.close()
+    conn.rollback()
+    return executions / elapsed if elapsed else 0.0
+
+
+def main():
+    args = parse_args()
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    student_ids = sample_ids(cursor, "SELECT DISTINCT student_id FROM StudyLog ORDER BY student_id LIMIT 1000")
+    mentor_ids = sample_ids(cursor, "SELECT mentor_id FROM Mentors LIMIT 200")
+    subject_ids = sample_ids(cursor, "SELECT subject_id FROM Subjects LIMIT 200")
+    cursor.close()
+    if not student_ids or not mentor_ids or not subject_ids:
+        print("No data found. Run benchmarks/generate_dataset.py first.")
+        sys.exit(2)
+
+    print(f"{'statement':<30} | {'text exec/s':>11} | {'prepared exec/s':>15} | {'speedup':>7}")
+    print('-' * 73)
+    for label, sql, make_params in workload(student_ids, mentor_ids, subject_ids):
+        text_rate = run(conn, False, sql, make_params, args.executions, args.seed)
+        prepared_rate = run(conn, True, sql, make_params, args.executions, args.seed)
+        speedup = prepared_rate / text_rate if text_rate else 0.0
+        print(f"{label:<30} | {text_rate:>11.1f} | {prepared_rate:>15.1f} | {speedup:>6.2f}x")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
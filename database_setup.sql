@@ -16,7 +16,8 @@ CREATE TABLE IF NOT EXISTS Students (
     name VARCHAR(100) NOT NULL,
     email VARCHAR(100) UNIQUE NOT NULL, -- Indexed automatically for fast lookup
     password VARCHAR(255) NOT NULL,
-    semester VARCHAR(50)
+    semester VARCHAR(50),
+    major VARCHAR(100) NOT NULL DEFAULT 'General' -- Drives the subject filter on log_study
 ) ENGINE=InnoDB; -- Ensures ACID Compliance
 
 -- Table: Mentors
@@ -34,27 +35,94 @@ CREATE TABLE IF NOT EXISTS Mentors (
 CREATE TABLE IF NOT EXISTS Subjects (
     subject_id INT AUTO_INCREMENT PRIMARY KEY,
     subject_name VARCHAR(100) NOT NULL,
-    credits INT DEFAULT 3
+    credits INT DEFAULT 3,
+    major_area VARCHAR(100) NOT NULL DEFAULT 'General'
 ) ENGINE=InnoDB;
 
 -- Table: StudyLog
--- Concepts: Foreign Keys (Referential Integrity), Many-to-Many Resolution
+-- Concepts: Many-to-Many Resolution, Range Partitioning (monthly, by study_date; see PartitionByMonth)
+-- Partitioned tables cannot have foreign keys: ids are validated by the app, and StudyHoursSummary
+-- carries the same constraints. The primary key includes study_date, as partitioning requires.
 CREATE TABLE IF NOT EXISTS StudyLog (
-    log_id INT AUTO_INCREMENT PRIMARY KEY,
+    log_id INT AUTO_INCREMENT,
     student_id INT,
     subject_id INT,
     mentor_id INT,
     duration_hours DECIMAL(4, 2) NOT NULL,
-    study_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    
-    -- Foreign Key Constraints
-    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
-    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id),
-    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id),
+    study_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (log_id, study_date),
 
     -- Indexing for Performance Optimization
     INDEX idx_study_date (study_date),
-    INDEX idx_student_subject (student_id, subject_id)
+    INDEX idx_student_subject (student_id, subject_id),
+    -- Keyset pagination of the dashboard feeds (InnoDB appends log_id to each secondary index)
+    INDEX idx_mentor_date (mentor_id, study_date),
+    INDEX idx_student_date (student_id, study_date)
+) ENGINE=InnoDB;
+
+-- Table: StudyHoursSummary
+-- Concepts: Materialized Aggregate (maintained by log_study in the same transaction as the StudyLog insert)
+CREATE TABLE IF NOT EXISTS StudyHoursSummary (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    mentor_id INT NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+    last_study_date TIMESTAMP NULL,
+
+    PRIMARY KEY (student_id, subject_id, mentor_id),
+    INDEX idx_mentor_subject (mentor_id, subject_id),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id),
+    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id)
+) ENGINE=InnoDB;
+
+-- Tables: StudyDailyRollup / StudyWeeklyRollup
+-- Concepts: Time-Bucketed Aggregates for trend charts (maintained by log_study, backfilled by 'flask study-rollups')
+CREATE TABLE IF NOT EXISTS StudyDailyRollup (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    study_day DATE NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (student_id, study_day, subject_id),
+    INDEX idx_subject_day (subject_id, study_day),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS StudyWeeklyRollup (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    week_start DATE NOT NULL, -- Monday of the week
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (student_id, week_start, subject_id),
+    INDEX idx_subject_week (subject_id, week_start),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id)
+) ENGINE=InnoDB;
+
+-- Table: MentorStudent
+-- Concepts: Association Index (maintained by log_study; replaces DISTINCT scans of StudyLog per mentor/student)
+CREATE TABLE IF NOT EXISTS MentorStudent (
+    mentor_id INT NOT NULL,
+    student_id INT NOT NULL,
+    first_interaction TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_interaction TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    session_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (mentor_id, student_id),
+    INDEX idx_student_mentor (student_id, mentor_id),
+
+    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id) ON DELETE CASCADE,
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
 -- Table: MentorFeedback
@@ -62,13 +130,40 @@ CREATE TABLE IF NOT EXISTS MentorFeedback (
     feedback_id INT AUTO_INCREMENT PRIMARY KEY,
     student_id INT,
     mentor_id INT,
+    rating VARCHAR(20) NOT NULL DEFAULT 'Good', -- 'Very Good', 'Good', 'Improving' or 'Needs Focus'
     comments TEXT,
     feedback_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- Feedback history per mentor (GetMentorFeedback) and per student, newest first
+    INDEX idx_mentor_date (mentor_id, feedback_date),
+    INDEX idx_student_date (student_id, feedback_date),
     
     FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
+-- Table: SubjectGoals
+-- Concepts: Mentor-set targets (goals_management, student_goals, goal evaluation)
+CREATE TABLE IF NOT EXISTS SubjectGoals (
+    goal_id INT AUTO_INCREMENT PRIMARY KEY,
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    mentor_id INT NOT NULL,
+    target_hours DECIMAL(6, 2) NOT NULL,
+    due_date DATE NOT NULL,
+    is_met BOOLEAN NOT NULL DEFAULT FALSE,
+    mentor_override BOOLEAN NOT NULL DEFAULT FALSE, -- Toggled by hand: goal evaluation leaves it alone
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_mentor_due (mentor_id, due_date),             -- Mentor goal list, ordered by due date
+    INDEX idx_student_open (student_id, is_met, due_date),  -- Most pressing open goal on the dashboard
+    INDEX idx_student_subject (student_id, subject_id),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id) ON DELETE CASCADE,
+    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
 -- Table: StudentProgress
 -- Concepts: Domain Integrity (CHECK Constraint)
 CREATE TABLE IF NOT EXISTS StudentProgress (
@@ -80,39 +175,122 @@ CREATE TABLE IF NOT EXISTS StudentProgress (
     
     -- Constraint: Progress must be valid percentage
     CONSTRAINT chk_progress_valid CHECK (progress_percentage BETWEEN 0 AND 100),
+
+    -- One progress row per student/subject (required by ON DUPLICATE KEY UPDATE upserts)
+    UNIQUE KEY uq_student_subject (student_id, subject_id),
     
     FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
 -- Table: Messages (NEW FOR TWO-WAY COMMUNICATION)
+-- Range-partitioned by month of timestamp; read messages of closed terms move to MessagesArchive
 CREATE TABLE IF NOT EXISTS Messages (
-    message_id INT AUTO_INCREMENT PRIMARY KEY,
+    message_id INT AUTO_INCREMENT,
     sender_id INT NOT NULL,
     recipient_id INT NOT NULL,
     sender_role VARCHAR(10) NOT NULL, -- 'student' or 'mentor'
+    recipient_role VARCHAR(10) NOT NULL, -- 'student' or 'mentor' (student and mentor IDs overlap)
     content TEXT NOT NULL,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     is_read BOOLEAN DEFAULT FALSE,
+
+    PRIMARY KEY (message_id, timestamp),
     
     -- Indexing for efficient inbox/outbox retrieval
-    INDEX idx_recipient (recipient_id),
+    -- Composite inbox index: filter by recipient + role, read back already ordered by timestamp
+    INDEX idx_recipient_inbox (recipient_id, recipient_role, timestamp),
     INDEX idx_sender (sender_id)
 ) ENGINE=InnoDB;
 
+-- Table: StudyLogArchive / MessagesArchive
+-- Concepts: Data Lifecycle ('flask archive' moves closed terms here; compressed, not read by any page)
+CREATE TABLE IF NOT EXISTS StudyLogArchive (
+    log_id INT NOT NULL PRIMARY KEY,
+    student_id INT,
+    subject_id INT,
+    mentor_id INT,
+    duration_hours DECIMAL(4, 2) NOT NULL,
+    study_date TIMESTAMP NOT NULL,
+
+    INDEX idx_student_date (student_id, study_date)
+) ENGINE=InnoDB ROW_FORMAT=COMPRESSED;
+
+CREATE TABLE IF NOT EXISTS MessagesArchive (
+    message_id INT NOT NULL PRIMARY KEY,
+    sender_id INT NOT NULL,
+    recipient_id INT NOT NULL,
+    sender_role VARCHAR(10) NOT NULL,
+    recipient_role VARCHAR(10) NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    is_read BOOLEAN DEFAULT TRUE,
+
+    INDEX idx_recipient (recipient_id, recipient_role, timestamp)
+) ENGINE=InnoDB ROW_FORMAT=COMPRESSED;
+
+-- Table: StudyArchiveTotals
+-- Concepts: Pre-aggregated totals of archived StudyLog rows (aggregate rebuilds add these to the live rows)
+CREATE TABLE IF NOT EXISTS StudyArchiveTotals (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    mentor_id INT NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+    first_study_date TIMESTAMP NULL,
+    last_study_date TIMESTAMP NULL,
+
+    PRIMARY KEY (student_id, subject_id, mentor_id),
+    INDEX idx_mentor_student (mentor_id, student_id)
+) ENGINE=InnoDB;
+
+-- Table: ArchiveRuns
+-- One row per archived partition ('flask archive' skips partitions it has already copied)
+CREATE TABLE IF NOT EXISTS ArchiveRuns (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    partition_name VARCHAR(64) NOT NULL,
+    range_end DATETIME NOT NULL, -- Every archived row is older than this
+    rows_archived INT NOT NULL DEFAULT 0,
+    rows_kept INT NOT NULL DEFAULT 0, -- Unread messages left in the hot table
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE KEY uq_table_partition (table_name, partition_name)
+) ENGINE=InnoDB;
+
+-- Table: SchemaMigrations
+-- Versions from migrations/ already applied to this database ('flask migrate')
+CREATE TABLE IF NOT EXISTS SchemaMigrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    checksum CHAR(64) NULL, -- NULL when the version was created by this script rather than the runner
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB;
+
+-- This script already creates everything up to the latest migration
+INSERT IGNORE INTO SchemaMigrations (version, name) VALUES
+(1, 'app_columns'),
+(2, 'subject_goals'),
+(3, 'message_recipient_role'),
+(4, 'study_aggregates'),
+(5, 'hot_path_indexes'),
+(6, 'partition_and_archive'),
+(7, 'goal_mentor_override');
+
 -- 3. VIRTUAL TABLES (VIEWS) 
 -- Concept: Data Abstraction & Join Simplification
 
 -- View: StudentStudySummary (Complex JOIN)
+-- Reads the StudyHoursSummary aggregate instead of re-summing every StudyLog row
 CREATE OR REPLACE VIEW StudentStudySummary AS
 SELECT 
     s.student_id,
     s.name AS student_name,
     sub.subject_name,
-    SUM(sl.duration_hours) AS total_study_hours
+    SUM(hs.total_hours) AS total_study_hours
 FROM Students s
-JOIN StudyLog sl ON s.student_id = sl.student_id
-JOIN Subjects sub ON sl.subject_id = sub.subject_id
+JOIN StudyHoursSummary hs ON s.student_id = hs.student_id
+JOIN Subjects sub ON hs.subject_id = sub.subject_id
 GROUP BY s.student_id, sub.subject_id;
 
 -- View: MentorFeedbackReport (Reporting Layer)
@@ -138,6 +316,8 @@ DROP PROCEDURE IF EXISTS AddSubject;
 DROP PROCEDURE IF EXISTS DeleteMentor;
 DROP PROCEDURE IF EXISTS DeleteSubject;
 DROP PROCEDURE IF EXISTS CalculateAndUpdateProgress; 
+DROP PROCEDURE IF EXISTS AddSubjectGoal;
+DROP PROCEDURE IF EXISTS PartitionByMonth;
 
 DELIMITER //
 
@@ -159,6 +339,7 @@ CREATE PROCEDURE GetMentorFeedback(IN p_mentor_id INT)
 BEGIN
     SELECT 
         s.name AS student_name,
+        mf.rating,
         mf.comments,
         mf.feedback_date
     FROM MentorFeedback mf
@@ -187,6 +368,29 @@ BEGIN
     VALUES (p_subject_name, p_credits);
 END //
 
+-- Procedure: AddSubjectGoal
+-- Updates the mentor's open goal for this student/subject, or creates one
+CREATE PROCEDURE AddSubjectGoal(
+    IN p_student_id INT,
+    IN p_subject_id INT,
+    IN p_mentor_id INT,
+    IN p_target_hours DECIMAL(6, 2),
+    IN p_due_date DATE
+)
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM SubjectGoals
+        WHERE student_id = p_student_id AND subject_id = p_subject_id AND mentor_id = p_mentor_id AND is_met = FALSE
+    ) THEN
+        UPDATE SubjectGoals
+        SET target_hours = p_target_hours, due_date = p_due_date
+        WHERE student_id = p_student_id AND subject_id = p_subject_id AND mentor_id = p_mentor_id AND is_met = FALSE;
+    ELSE
+        INSERT INTO SubjectGoals (student_id, subject_id, mentor_id, target_hours, due_date)
+        VALUES (p_student_id, p_subject_id, p_mentor_id, p_target_hours, p_due_date);
+    END IF;
+END //
+
 -- Procedure: DeleteMentor 
 -- Removes a mentor by ID
 CREATE PROCEDURE DeleteMentor(IN p_mentor_id INT)
@@ -201,20 +405,51 @@ BEGIN
     DELETE FROM Subjects WHERE subject_id = p_subject_id;
 END //
 
+-- Procedure: PartitionByMonth
+-- (Re)partitions a table by month of a TIMESTAMP column: one partition pYYYYMM per month from the
+-- oldest row through p_months_ahead months from now, plus p_future for anything later
+CREATE PROCEDURE PartitionByMonth(IN p_table VARCHAR(64), IN p_column VARCHAR(64), IN p_months_ahead INT)
+BEGIN
+    DECLARE month_start DATE;
+    DECLARE last_month DATE;
+    DECLARE parts TEXT DEFAULT '';
+
+    SET @first_month = NULL;
+    SET @min_sql = CONCAT('SELECT DATE_FORMAT(COALESCE(MIN(`', p_column, '`), NOW()), ''%Y-%m-01'') INTO @first_month FROM `', p_table, '`');
+    PREPARE stmt FROM @min_sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+
+    SET month_start = @first_month;
+    SET last_month = DATE_FORMAT(NOW() + INTERVAL p_months_ahead MONTH, '%Y-%m-01');
+    WHILE month_start <= last_month DO
+        SET parts = CONCAT(parts, 'PARTITION p', DATE_FORMAT(month_start, '%Y%m'),
+                           ' VALUES LESS THAN (UNIX_TIMESTAMP(''', month_start + INTERVAL 1 MONTH, ''')), ');
+        SET month_start = month_start + INTERVAL 1 MONTH;
+    END WHILE;
+
+    SET @ddl = CONCAT('ALTER TABLE `', p_table, '` PARTITION BY RANGE (UNIX_TIMESTAMP(`', p_column, '`)) (',
+                      parts, 'PARTITION p_future VALUES LESS THAN MAXVALUE)');
+    PREPARE stmt FROM @ddl;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+END //
+
 -- Procedure: CalculateAndUpdateProgress 
--- Calculates progress percentage based on StudyLog hours vs (Credits * 10) expected hours.
+-- Calculates progress percentage based on logged hours vs (Credits * 10) expected hours.
+-- Reads the StudyHoursSummary aggregate, which still counts sessions archived out of StudyLog.
 CREATE PROCEDURE CalculateAndUpdateProgress(
     IN p_student_id INT,
     IN p_subject_id INT
 )
 BEGIN
-    DECLARE total_logged DECIMAL(5, 2);
+    DECLARE total_logged DECIMAL(10, 2);
     DECLARE subject_credits INT;
     DECLARE calculated_progress DECIMAL(5, 2);
     
     -- 1. Get total logged hours for this student/subject
-    SELECT SUM(duration_hours) INTO total_logged
-    FROM StudyLog
+    SELECT SUM(total_hours) INTO total_logged
+    FROM StudyHoursSummary
     WHERE student_id = p_student_id AND subject_id = p_subject_id;
 
     -- 2. Get subject credits
@@ -247,9 +482,18 @@ SET FOREIGN_KEY_CHECKS = 0;
 
 -- Clear data from tables before re-seeding to prevent duplicate entries (TRUNCATE is faster than DELETE)
 TRUNCATE TABLE StudyLog;
+TRUNCATE TABLE StudyHoursSummary;
+TRUNCATE TABLE StudyDailyRollup;
+TRUNCATE TABLE StudyWeeklyRollup;
+TRUNCATE TABLE MentorStudent;
 TRUNCATE TABLE MentorFeedback;
+TRUNCATE TABLE SubjectGoals;
 TRUNCATE TABLE StudentProgress;
 TRUNCATE TABLE Messages; -- NEW TABLE TRUNCATE
+TRUNCATE TABLE StudyLogArchive;
+TRUNCATE TABLE MessagesArchive;
+TRUNCATE TABLE StudyArchiveTotals;
+TRUNCATE TABLE ArchiveRuns;
 TRUNCATE TABLE Students;
 TRUNCATE TABLE Mentors;
 TRUNCATE TABLE Subjects;
@@ -319,22 +563,55 @@ INSERT INTO StudyLog (student_id, subject_id, mentor_id, duration_hours, study_d
 (2, 3, 3, 2.0, NOW() - INTERVAL 15 DAY), 
 (1, 4, 3, 3.0, NOW() - INTERVAL 1 DAY);  
 
+-- Build the StudyHoursSummary aggregate from the seeded StudyLog rows
+INSERT INTO StudyHoursSummary (student_id, subject_id, mentor_id, total_hours, session_count, last_study_date)
+SELECT student_id, subject_id, mentor_id, SUM(duration_hours), COUNT(*), MAX(study_date)
+FROM StudyLog
+GROUP BY student_id, subject_id, mentor_id;
+
+-- Build the daily and weekly trend rollups from the seeded StudyLog rows
+INSERT INTO StudyDailyRollup (student_id, subject_id, study_day, total_hours, session_count)
+SELECT student_id, subject_id, DATE(study_date), SUM(duration_hours), COUNT(*)
+FROM StudyLog
+GROUP BY student_id, subject_id, DATE(study_date);
+
+INSERT INTO StudyWeeklyRollup (student_id, subject_id, week_start, total_hours, session_count)
+SELECT student_id, subject_id, DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY, SUM(duration_hours), COUNT(*)
+FROM StudyLog
+GROUP BY student_id, subject_id, DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY;
+
+-- Build the mentor-student association index from the seeded StudyLog rows
+INSERT INTO MentorStudent (mentor_id, student_id, first_interaction, last_interaction, session_count)
+SELECT mentor_id, student_id, MIN(study_date), MAX(study_date), COUNT(*)
+FROM StudyLog
+GROUP BY mentor_id, student_id;
+
+
+-- Sample SubjectGoals
+INSERT INTO SubjectGoals (student_id, subject_id, mentor_id, target_hours, due_date) VALUES
+(1, 1, 2, 10.0, CURDATE() + INTERVAL 14 DAY),
+(2, 6, 4, 8.0, CURDATE() + INTERVAL 7 DAY),
+(3, 4, 3, 12.0, CURDATE() - INTERVAL 2 DAY);
 
 -- Sample MentorFeedback
-INSERT INTO MentorFeedback (student_id, mentor_id, comments) VALUES
-(1, 1, 'Sarah is demonstrating strong aptitude in logical reasoning, a key component of AI. Keep pushing the theoretical concepts.'), 
-(2, 6, 'Kyle has excellent practical skills in Software Engineering but needs to document his design choices more thoroughly.'),  
-(3, 3, 'Ellen, your Data Structures project showed great efficiency. Next, focus on analyzing the time complexity (O-notation) of your solutions.'), 
-(1, 2, 'Good work on the last DBMS query optimization challenge, Sarah. You reduced the execution time by 40%.'), 
-(4, 1, 'Deckard, your participation in the Cyber Security seminar was insightful. Please formalize your findings in a brief report.');
+INSERT INTO MentorFeedback (student_id, mentor_id, rating, comments) VALUES
+(1, 1, 'Very Good', 'Sarah is demonstrating strong aptitude in logical reasoning, a key component of AI. Keep pushing the theoretical concepts.'), 
+(2, 6, 'Improving', 'Kyle has excellent practical skills in Software Engineering but needs to document his design choices more thoroughly.'),  
+(3, 3, 'Good', 'Ellen, your Data Structures project showed great efficiency. Next, focus on analyzing the time complexity (O-notation) of your solutions.'), 
+(1, 2, 'Very Good', 'Good work on the last DBMS query optimization challenge, Sarah. You reduced the execution time by 40%.'), 
+(4, 1, 'Needs Focus', 'Deckard, your participation in the Cyber Security seminar was insightful. Please formalize your findings in a brief report.');
 
 -- Sample Messages (NEW DML)
-INSERT INTO Messages (sender_id, recipient_id, sender_role, content, is_read) VALUES
+INSERT INTO Messages (sender_id, recipient_id, sender_role, recipient_role, content, is_read) VALUES
 -- Turing (M1) to Sarah (S1)
-(1, 1, 'mentor', 'Please review the recent AI ethics paper I sent you.', FALSE), 
+(1, 1, 'mentor', 'student', 'Please review the recent AI ethics paper I sent you.', FALSE), 
 -- Sarah (S1) to Turing (M1)
-(1, 1, 'student', 'Got it, Dr. Turing. Starting on it tomorrow.', FALSE), 
+(1, 1, 'student', 'mentor', 'Got it, Dr. Turing. Starting on it tomorrow.', FALSE), 
 -- Lovelace (M3) to Ellen (S3)
-(3, 3, 'mentor', 'I noticed your progress in Data Structures is slowing. Are there any specific topics causing trouble?', FALSE),
+(3, 3, 'mentor', 'student', 'I noticed your progress in Data Structures is slowing. Are there any specific topics causing trouble?', FALSE),
 -- Kyle (S2) to Hamilton (M6)
-(2, 6, 'student', 'The SE task is complete. Ready for the next module review!', TRUE);
\ No newline at end of file
+(2, 6, 'student', 'mentor', 'The SE task is complete. Ready for the next module review!', TRUE);
+
+-- Monthly partitions covering the seeded rows (later months are added by 'flask archive')
+CALL PartitionByMonth('StudyLog', 'study_date', 3);
+CALL PartitionByMonth('Messages', 'timestamp', 3);
\ No newline at end of file
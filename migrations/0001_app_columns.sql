@@ -0,0 +1,8 @@
+-- Columns app.py reads and writes that the original schema never declared
+-- Students.major drives the subject filter on log_study; Subjects.major_area is what it matches against
+ALTER TABLE Students ADD COLUMN major VARCHAR(100) NOT NULL DEFAULT 'General' AFTER semester;
+
+ALTER TABLE Subjects ADD COLUMN major_area VARCHAR(100) NOT NULL DEFAULT 'General' AFTER credits;
+
+-- Feedback ratings are labels ('Very Good', 'Good', 'Improving', 'Needs Focus') chosen in feedback.html
+ALTER TABLE MentorFeedback ADD COLUMN rating VARCHAR(20) NOT NULL DEFAULT 'Good' AFTER mentor_id;
@@ -0,0 +1,62 @@
+-- Mentor-set study goals (goals_management, student_goals, dashboard, goal evaluation)
+CREATE TABLE IF NOT EXISTS SubjectGoals (
+    goal_id INT AUTO_INCREMENT PRIMARY KEY,
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    mentor_id INT NOT NULL,
+    target_hours DECIMAL(6, 2) NOT NULL,
+    due_date DATE NOT NULL,
+    is_met BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_mentor_due (mentor_id, due_date),
+    INDEX idx_student_open (student_id, is_met, due_date),
+    INDEX idx_student_subject (student_id, subject_id),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id) ON DELETE CASCADE,
+    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+DROP PROCEDURE IF EXISTS AddSubjectGoal;
+DROP PROCEDURE IF EXISTS GetMentorFeedback;
+
+DELIMITER //
+
+-- Updates the mentor's open goal for this student/subject, or creates one
+CREATE PROCEDURE AddSubjectGoal(
+    IN p_student_id INT,
+    IN p_subject_id INT,
+    IN p_mentor_id INT,
+    IN p_target_hours DECIMAL(6, 2),
+    IN p_due_date DATE
+)
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM SubjectGoals
+        WHERE student_id = p_student_id AND subject_id = p_subject_id AND mentor_id = p_mentor_id AND is_met = FALSE
+    ) THEN
+        UPDATE SubjectGoals
+        SET target_hours = p_target_hours, due_date = p_due_date
+        WHERE student_id = p_student_id AND subject_id = p_subject_id AND mentor_id = p_mentor_id AND is_met = FALSE;
+    ELSE
+        INSERT INTO SubjectGoals (student_id, subject_id, mentor_id, target_hours, due_date)
+        VALUES (p_student_id, p_subject_id, p_mentor_id, p_target_hours, p_due_date);
+    END IF;
+END //
+
+-- feedback.html shows the rating of every report in the mentor's history
+CREATE PROCEDURE GetMentorFeedback(IN p_mentor_id INT)
+BEGIN
+    SELECT 
+        s.name AS student_name,
+        mf.rating,
+        mf.comments,
+        mf.feedback_date
+    FROM MentorFeedback mf
+    JOIN Students s ON mf.student_id = s.student_id
+    WHERE mf.mentor_id = p_mentor_id
+    ORDER BY mf.feedback_date DESC;
+END //
+
+DELIMITER ;
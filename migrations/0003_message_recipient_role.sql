@@ -0,0 +1,11 @@
+-- Student and mentor IDs overlap, so inbox queries filter on the recipient's role as well as the ID
+ALTER TABLE Messages ADD COLUMN recipient_role VARCHAR(10) NOT NULL DEFAULT 'student' AFTER sender_role;
+
+-- Students only message mentors and mentors only message students
+UPDATE Messages SET recipient_role = CASE WHEN sender_role = 'student' THEN 'mentor' ELSE 'student' END;
+
+ALTER TABLE Messages ALTER COLUMN recipient_role DROP DEFAULT;
+
+ALTER TABLE Messages
+    ADD INDEX idx_recipient_inbox (recipient_id, recipient_role, timestamp),
+    DROP INDEX idx_recipient;
@@ -0,0 +1,93 @@
+-- Aggregates maintained alongside every StudyLog insert (record_study_hours), backfilled from StudyLog
+CREATE TABLE IF NOT EXISTS StudyHoursSummary (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    mentor_id INT NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+    last_study_date TIMESTAMP NULL,
+
+    PRIMARY KEY (student_id, subject_id, mentor_id),
+    INDEX idx_mentor_subject (mentor_id, subject_id),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id),
+    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS StudyDailyRollup (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    study_day DATE NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (student_id, study_day, subject_id),
+    INDEX idx_subject_day (subject_id, study_day),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS StudyWeeklyRollup (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    week_start DATE NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (student_id, week_start, subject_id),
+    INDEX idx_subject_week (subject_id, week_start),
+
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (subject_id) REFERENCES Subjects(subject_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS MentorStudent (
+    mentor_id INT NOT NULL,
+    student_id INT NOT NULL,
+    first_interaction TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_interaction TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    session_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (mentor_id, student_id),
+    INDEX idx_student_mentor (student_id, mentor_id),
+
+    FOREIGN KEY (mentor_id) REFERENCES Mentors(mentor_id) ON DELETE CASCADE,
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+INSERT INTO StudyHoursSummary (student_id, subject_id, mentor_id, total_hours, session_count, last_study_date)
+SELECT student_id, subject_id, mentor_id, SUM(duration_hours), COUNT(*), MAX(study_date)
+FROM StudyLog
+WHERE student_id IS NOT NULL AND subject_id IS NOT NULL AND mentor_id IS NOT NULL
+GROUP BY student_id, subject_id, mentor_id;
+
+INSERT INTO StudyDailyRollup (student_id, subject_id, study_day, total_hours, session_count)
+SELECT student_id, subject_id, DATE(study_date), SUM(duration_hours), COUNT(*)
+FROM StudyLog
+WHERE student_id IS NOT NULL AND subject_id IS NOT NULL
+GROUP BY student_id, subject_id, DATE(study_date);
+
+INSERT INTO StudyWeeklyRollup (student_id, subject_id, week_start, total_hours, session_count)
+SELECT student_id, subject_id, DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY, SUM(duration_hours), COUNT(*)
+FROM StudyLog
+WHERE student_id IS NOT NULL AND subject_id IS NOT NULL
+GROUP BY student_id, subject_id, DATE(study_date) - INTERVAL WEEKDAY(study_date) DAY;
+
+INSERT INTO MentorStudent (mentor_id, student_id, first_interaction, last_interaction, session_count)
+SELECT mentor_id, student_id, MIN(study_date), MAX(study_date), COUNT(*)
+FROM StudyLog
+WHERE mentor_id IS NOT NULL AND student_id IS NOT NULL
+GROUP BY mentor_id, student_id;
+
+CREATE OR REPLACE VIEW StudentStudySummary AS
+SELECT 
+    s.student_id,
+    s.name AS student_name,
+    sub.subject_name,
+    SUM(hs.total_hours) AS total_study_hours
+FROM Students s
+JOIN StudyHoursSummary hs ON s.student_id = hs.student_id
+JOIN Subjects sub ON hs.subject_id = sub.subject_id
+GROUP BY s.student_id, sub.subject_id;
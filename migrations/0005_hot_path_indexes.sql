@@ -0,0 +1,18 @@
+-- Indexes behind the hot queries reported by benchmarks/index_advisor.py
+
+-- Dashboard feeds: keyset pagination per mentor / per student, newest first
+ALTER TABLE StudyLog
+    ADD INDEX idx_mentor_date (mentor_id, study_date),
+    ADD INDEX idx_student_date (student_id, study_date);
+
+-- ON DUPLICATE KEY UPDATE needs one row per student/subject: keep the newest duplicate, then enforce it
+DELETE sp FROM StudentProgress sp
+JOIN StudentProgress newer
+  ON newer.student_id = sp.student_id AND newer.subject_id = sp.subject_id AND newer.progress_id > sp.progress_id;
+
+ALTER TABLE StudentProgress ADD UNIQUE KEY uq_student_subject (student_id, subject_id);
+
+-- Feedback history per mentor (GetMentorFeedback) and per student, newest first
+ALTER TABLE MentorFeedback
+    ADD INDEX idx_mentor_date (mentor_id, feedback_date),
+    ADD INDEX idx_student_date (student_id, feedback_date);
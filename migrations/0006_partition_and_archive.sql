@@ -0,0 +1,158 @@
+-- Monthly range partitions on StudyLog (study_date) and Messages (timestamp), plus the archive
+-- tables 'flask archive' moves closed terms into, so the hot tables stop growing forever.
+-- Partitioned InnoDB tables cannot have foreign keys and every unique key must include the
+-- partitioning column: StudyLog drops its foreign keys (ids are validated by the app, and
+-- StudyHoursSummary keeps the same constraints) and both primary keys gain the date column.
+
+-- Archived rows, compressed; no longer read by any page
+CREATE TABLE IF NOT EXISTS StudyLogArchive (
+    log_id INT NOT NULL PRIMARY KEY,
+    student_id INT,
+    subject_id INT,
+    mentor_id INT,
+    duration_hours DECIMAL(4, 2) NOT NULL,
+    study_date TIMESTAMP NOT NULL,
+
+    INDEX idx_student_date (student_id, study_date)
+) ENGINE=InnoDB ROW_FORMAT=COMPRESSED;
+
+CREATE TABLE IF NOT EXISTS MessagesArchive (
+    message_id INT NOT NULL PRIMARY KEY,
+    sender_id INT NOT NULL,
+    recipient_id INT NOT NULL,
+    sender_role VARCHAR(10) NOT NULL,
+    recipient_role VARCHAR(10) NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    is_read BOOLEAN DEFAULT TRUE,
+
+    INDEX idx_recipient (recipient_id, recipient_role, timestamp)
+) ENGINE=InnoDB ROW_FORMAT=COMPRESSED;
+
+-- Pre-aggregated totals of every archived StudyLog row; rebuilds of the StudyLog aggregates add these
+-- to the live rows instead of reading StudyLogArchive
+CREATE TABLE IF NOT EXISTS StudyArchiveTotals (
+    student_id INT NOT NULL,
+    subject_id INT NOT NULL,
+    mentor_id INT NOT NULL,
+    total_hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    session_count INT NOT NULL DEFAULT 0,
+    first_study_date TIMESTAMP NULL,
+    last_study_date TIMESTAMP NULL,
+
+    PRIMARY KEY (student_id, subject_id, mentor_id),
+    INDEX idx_mentor_student (mentor_id, student_id)
+) ENGINE=InnoDB;
+
+-- One row per archived partition ('flask archive' skips partitions it has already copied)
+CREATE TABLE IF NOT EXISTS ArchiveRuns (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    partition_name VARCHAR(64) NOT NULL,
+    range_end DATETIME NOT NULL, -- Every archived row is older than this
+    rows_archived INT NOT NULL DEFAULT 0,
+    rows_kept INT NOT NULL DEFAULT 0, -- Unread messages left in the hot table
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE KEY uq_table_partition (table_name, partition_name)
+) ENGINE=InnoDB;
+
+DROP PROCEDURE IF EXISTS DropForeignKeys;
+DROP PROCEDURE IF EXISTS PartitionByMonth;
+DROP PROCEDURE IF EXISTS CalculateAndUpdateProgress;
+
+DELIMITER //
+
+CREATE PROCEDURE DropForeignKeys(IN p_table VARCHAR(64))
+BEGIN
+    SET @drops = NULL;
+    SELECT GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`')) INTO @drops
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = p_table;
+    IF @drops IS NOT NULL THEN
+        SET @ddl = CONCAT('ALTER TABLE `', p_table, '` ', @drops);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+
+-- (Re)partitions a table by month of a TIMESTAMP column: one partition pYYYYMM per month from the
+-- oldest row through p_months_ahead months from now, plus p_future for anything later
+CREATE PROCEDURE PartitionByMonth(IN p_table VARCHAR(64), IN p_column VARCHAR(64), IN p_months_ahead INT)
+BEGIN
+    DECLARE month_start DATE;
+    DECLARE last_month DATE;
+    DECLARE parts TEXT DEFAULT '';
+
+    SET @first_month = NULL;
+    SET @min_sql = CONCAT('SELECT DATE_FORMAT(COALESCE(MIN(`', p_column, '`), NOW()), ''%Y-%m-01'') INTO @first_month FROM `', p_table, '`');
+    PREPARE stmt FROM @min_sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+
+    SET month_start = @first_month;
+    SET last_month = DATE_FORMAT(NOW() + INTERVAL p_months_ahead MONTH, '%Y-%m-01');
+    WHILE month_start <= last_month DO
+        SET parts = CONCAT(parts, 'PARTITION p', DATE_FORMAT(month_start, '%Y%m'),
+                           ' VALUES LESS THAN (UNIX_TIMESTAMP(''', month_start + INTERVAL 1 MONTH, ''')), ');
+        SET month_start = month_start + INTERVAL 1 MONTH;
+    END WHILE;
+
+    SET @ddl = CONCAT('ALTER TABLE `', p_table, '` PARTITION BY RANGE (UNIX_TIMESTAMP(`', p_column, '`)) (',
+                      parts, 'PARTITION p_future VALUES LESS THAN MAXVALUE)');
+    PREPARE stmt FROM @ddl;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+END //
+
+-- Reads the StudyHoursSummary aggregate, which still counts archived sessions
+CREATE PROCEDURE CalculateAndUpdateProgress(
+    IN p_student_id INT,
+    IN p_subject_id INT
+)
+BEGIN
+    DECLARE total_logged DECIMAL(10, 2);
+    DECLARE subject_credits INT;
+    DECLARE calculated_progress DECIMAL(5, 2);
+
+    SELECT SUM(total_hours) INTO total_logged
+    FROM StudyHoursSummary
+    WHERE student_id = p_student_id AND subject_id = p_subject_id;
+
+    SELECT credits INTO subject_credits
+    FROM Subjects
+    WHERE subject_id = p_subject_id;
+
+    IF total_logged IS NULL THEN
+        SET calculated_progress = 0;
+    ELSE
+        SET calculated_progress = LEAST(100.00, (total_logged / (subject_credits * 10)) * 100);
+    END IF;
+
+    INSERT INTO StudentProgress (student_id, subject_id, progress_percentage)
+    VALUES (p_student_id, p_subject_id, calculated_progress)
+    ON DUPLICATE KEY UPDATE
+        progress_percentage = calculated_progress,
+        last_updated = CURRENT_TIMESTAMP;
+END //
+
+DELIMITER ;
+
+CALL DropForeignKeys('StudyLog');
+DROP PROCEDURE DropForeignKeys;
+
+UPDATE StudyLog SET study_date = CURRENT_TIMESTAMP WHERE study_date IS NULL;
+ALTER TABLE StudyLog
+    MODIFY study_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (log_id, study_date);
+
+UPDATE Messages SET timestamp = CURRENT_TIMESTAMP WHERE timestamp IS NULL;
+ALTER TABLE Messages
+    MODIFY timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (message_id, timestamp);
+
+CALL PartitionByMonth('StudyLog', 'study_date', 3);
+CALL PartitionByMonth('Messages', 'timestamp', 3);
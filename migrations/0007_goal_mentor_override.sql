@@ -0,0 +1,3 @@
+-- Goals a mentor marked met or unmet by hand; goal evaluation leaves them alone so a manual
+-- un-mark is not undone (and the student not praised again) on the next progress update
+ALTER TABLE SubjectGoals ADD COLUMN mentor_override BOOLEAN NOT NULL DEFAULT FALSE AFTER is_met;
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import mysql.connector
+import pytest
+
+# Tests import app.py from the project root, like the benchmarks do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+from fakes import FakeServer, FakeServers
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """ The primary database as a FakeServer behind a fresh pool, with empty page and unread caches """
+    server = FakeServer()
+    monkeypatch.setattr(mysql.connector, 'connect', FakeServers(**{app.db_config['host']: server}).connect)
+    monkeypatch.setattr(app, 'db_pool', app.ConnectionPool(app.db_config, **app.pool_config))
+    app.page_cache.clear()
+    app._unread_count_cache.clear()
+    return server
+
+
+def login(client, role, user_id, **extra):
+    with client.session_transaction() as sess:
+        sess.update(user_id=user_id, role=role, name=f'{role.title()} {user_id}', **extra)
@@ -0,0 +1,149 @@
+# --- Stand-in MySQL servers for tests that run without a database ---
+# A FakeServer answers SQL by response key: the exact statement text, or any fragment of it (whitespace
+# is normalised on both sides, first matching key wins). A response is a list of row dicts, an int rowcount
+# for writes, an exception to raise, or a callable (sql, params) returning one of those.
+# Tests patch mysql.connector.connect with FakeServers.connect so the pools in app.py open
+# FakeConnections to them by host.
+import mysql.connector
+
+
+def normalise(sql):
+    return ' '.join(sql.split())
+
+
+class FakeCursor:
+    """ Unbuffered like mysql.connector's default cursor: close() with unread rows raises.
+        Rows come back as dicts for dictionary cursors and as tuples otherwise (prepared cursors included). """
+
+    def __init__(self, server, dictionary=False, prepared=False):
+        self._server = server
+        self._dictionary = dictionary and not prepared
+        self.prepared = prepared
+        self._rows = []
+        self.with_rows = False
+        self.column_names = ()
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def _run(self, sql, params):
+        self._server.executed.append(normalise(sql))
+        self._server.calls.append((normalise(sql), params))
+        response = self._server.respond(sql, params)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def execute(self, sql, params=None):
+        response = self._run(sql, params)
+        self.with_rows = normalise(sql).upper().startswith(('SELECT', 'SHOW', 'WITH', 'EXPLAIN', '('))
+        if isinstance(response, int):
+            self._rows, self.rowcount = [], response
+        else:
+            rows = list(response or [])
+            self.rowcount = len(rows)
+            if self.with_rows:
+                self.column_names = tuple(rows[0]) if rows else ()
+                self.description = [(name,) for name in self.column_names] if rows else None
+                self._rows = rows if self._dictionary else [tuple(row.values()) for row in rows]
+            else:
+                self._rows = []
+        self.lastrowid = self._server.next_id()
+
+    def executemany(self, sql, seq_params):
+        seq_params = list(seq_params)
+        self._server.executed.append(normalise(sql))
+        self._server.calls.append((normalise(sql), seq_params))
+        self.rowcount = len(seq_params)
+        self.with_rows = False
+
+    def callproc(self, procname, args=()):
+        """ A row-list response becomes the procedure's one result set, read through stored_results() """
+        response = self._run(f"CALL {procname}", args)
+        self._stored = []
+        if isinstance(response, list) and response:
+            result = FakeCursor(self._server, self._dictionary)
+            result._rows = response if self._dictionary else [tuple(row.values()) for row in response]
+            self._stored.append(result)
+        return args
+
+    def stored_results(self):
+        return iter(getattr(self, '_stored', []))
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        if self._rows:
+            raise mysql.connector.errors.InternalError('Unread result found')
+
+
+class FakeConnection:
+    def __init__(self, server):
+        self._server = server
+        self.closed = False
+
+    def cursor(self, *args, dictionary=False, prepared=False, **kwargs):
+        return FakeCursor(self._server, dictionary, prepared)
+
+    def ping(self, reconnect=False):
+        if self._server.down:
+            raise mysql.connector.errors.InterfaceError('Connection lost')
+
+    def commit(self):
+        self._server.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    def __init__(self, responses=None):
+        self.responses = dict(responses or {})
+        self.executed = [] # Normalised SQL of every statement, in order
+        self.calls = [] # (normalised SQL, params) of every statement, in order
+        self.commits = 0
+        self.down = False
+        self._last_id = 0
+
+    def respond(self, sql, params):
+        text = normalise(sql)
+        response = self.responses.get(sql)
+        if response is None:
+            response = next((value for key, value in self.responses.items() if normalise(key) in text), [])
+        return response(text, params) if callable(response) else response
+
+    def next_id(self):
+        self._last_id += 1
+        return self._last_id
+
+    def ran(self, fragment):
+        """ Statements (normalised) that contain fragment """
+        return [sql for sql in self.executed if normalise(fragment) in sql]
+
+
+class FakeServers:
+    """ host -> FakeServer; connect() has the signature of mysql.connector.connect """
+
+    def __init__(self, **servers):
+        self.servers = servers
+
+    def connect(self, **connect_args):
+        server = self.servers.get(connect_args['host'])
+        if server is None or server.down:
+            raise mysql.connector.errors.InterfaceError(f"Can't connect to MySQL server on '{connect_args['host']}'")
+        return FakeConnection(server)
@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import generate_dataset
+import load_test
+from fakes import FakeConnection, FakeServer
+
+
+def test_percentile_uses_the_nearest_rank():
+    values = [0.01 * n for n in range(1, 101)]
+    assert load_test.percentile(values, 0.50) == values[49]
+    assert load_test.percentile(values, 0.95) == values[94]
+    assert load_test.percentile([0.2], 0.99) == 0.2
+    assert load_test.percentile([], 0.95) == 0.0
+
+
+def run(p95_ms, throughput_rps):
+    return {'scenarios': {'dashboard_student': {'p95_ms': p95_ms, 'throughput_rps': throughput_rps}}}
+
+
+def test_compare_flags_only_changes_beyond_the_tolerance():
+    baseline = run(100.0, 50.0)
+    assert load_test.compare(run(119.0, 41.0), baseline, 0.20) == []
+    regressions = load_test.compare(run(121.0, 39.0), baseline, 0.20)
+    assert regressions == ['dashboard_student: p95 100.0ms -> 121.0ms',
+                           'dashboard_student: throughput 50.0 -> 39.0 req/s']
+
+
+def test_compare_skips_scenarios_missing_from_the_baseline():
+    assert load_test.compare(run(500.0, 1.0), {'scenarios': {}}, 0.20) == []
+
+
+def test_run_scenario_spreads_requests_over_the_threads(db):
+    stats = load_test.run_scenario('dashboard_student', 7, 3, students=[(1, 10), (2, 10)], mentors=[3], seed=1)
+    assert stats['requests'] == 7 and stats['errors'] == 0
+    assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms'] <= stats['max_ms']
+
+
+def test_run_scenario_caps_maintenance_routes(db):
+    stats = load_test.run_scenario('force_progress_recalc', 50, 2, students=[], mentors=[], seed=1)
+    assert stats['requests'] == load_test.SCENARIO_REQUEST_CAP['force_progress_recalc']
+
+
+def test_insert_batches_commits_once_per_batch(capsys):
+    server = FakeServer()
+    rows = ((n, f'Student {n}') for n in range(12))
+    generate_dataset.insert_batches(FakeConnection(server), 'Students', 'INSERT INTO Students VALUES (%s, %s)',
+                                    rows, 12, batch_size=5)
+
+    assert [len(params) for _, params in server.calls] == [5, 5, 2]
+    assert server.commits == 3
+    assert 'Students: 12 rows' in capsys.readouterr().out
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app
+from conftest import login
+
+FEED = 'FROM StudyLog JOIN Subjects'
+START = datetime(2026, 9, 1, 12, 0)
+# Pairs of sessions share a timestamp, so pages must break ties on log_id
+LOGS = [{'log_id': n, 'study_date': START + timedelta(hours=n // 2), 'duration_hours': 1,
+         'subject_name': 'Databases', 'mentor_name': 'Mentor 3'} for n in range(1, 12)]
+
+
+def seek(sql, params):
+    """ Answers a feed page like MySQL would: rows before the seek position, newest first, up to LIMIT """
+    rows = sorted(LOGS, key=lambda log: (log['study_date'], log['log_id']), reverse=True)
+    if 'StudyLog.log_id <' in sql:
+        after = (params[1], params[3])
+        rows = [log for log in rows if (log['study_date'], log['log_id']) < after]
+    return [dict(log) for log in rows[:params[-1]]]
+
+
+@pytest.fixture
+def client(db):
+    db.responses[FEED] = seek
+    client = app.app.test_client()
+    login(client, 'student', 5)
+    return client
+
+
+def test_paging_through_the_feed_returns_every_log_once(client, db):
+    seen, cursor, pages = [], None, 0
+    while True:
+        query = '/dashboard/logs?limit=4' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(query).get_json()
+        seen += [log['log_id'] for log in body['logs']]
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == list(range(11, 0, -1))
+    assert pages == 3
+    assert all('OFFSET' not in sql for sql in db.ran(FEED))
+
+
+def test_next_cursor_points_at_the_last_row_of_the_page(client):
+    body = client.get('/dashboard/logs?limit=3').get_json()
+    last = LOGS[8] # log_id 9
+    assert body['next_cursor'] == app.encode_page_cursor(last['study_date'], last['log_id'])
+    assert app.decode_page_cursor(body['next_cursor']) == (last['study_date'], 9)
+
+
+def test_last_page_has_no_cursor(client):
+    assert client.get('/dashboard/logs?limit=11').get_json()['next_cursor'] is None
+
+
+@pytest.mark.parametrize('cursor', ['garbage', '2026-09-01T12:00:00', '2026-09-01_x'])
+def test_malformed_cursors_are_rejected(client, cursor):
+    assert client.get(f'/dashboard/logs?cursor={cursor}').status_code == 400
+
+
+def test_mentor_feed_filters_on_the_mentor():
+    query, params = app.study_log_page_query('mentor', 3, after=(START, 7), limit=10)
+    assert 'WHERE StudyLog.mentor_id = %s' in query
+    assert params == (3, START, START, 7, 11)
@@ -0,0 +1,59 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(app.event_bus_config, 'max_streams', 1)
+    client = app.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = 'student'
+    return client
+
+
+def test_streams_over_the_cap_are_turned_away(client):
+    first = client.get('/events/stream', buffered=False)
+    assert first.status_code == 200
+    assert app.stream_stats['open'] == 1
+
+    second = client.get('/events/stream', buffered=False)
+    assert second.status_code == 503
+    assert second.headers['Retry-After'] == '60'
+
+    first.close()
+    assert app.stream_stats['open'] == 0
+    third = client.get('/events/stream', buffered=False)
+    assert third.status_code == 200
+    third.close()
+
+
+def test_closing_a_stream_unsubscribes(client):
+    stream = client.get('/events/stream', buffered=False)
+    assert app.event_bus.stats()['subscribers'] == 1
+    stream.close() # Closed before the first chunk was read
+    assert app.event_bus.stats()['subscribers'] == 0
+    assert app.stream_stats['open'] == 0
+
+
+def test_push_is_off_without_async_workers(monkeypatch):
+    assert app.push_enabled() is False
+    monkeypatch.setitem(app.event_bus_config, 'push', True)
+    assert app.push_enabled() is True
+
+
+def test_a_failed_subscribe_gives_the_slot_back(client, monkeypatch):
+    def unreachable(channel):
+        raise ConnectionError('event bus unreachable')
+    monkeypatch.setattr(app.event_bus, 'subscribe', unreachable)
+    monkeypatch.setattr(app.app, 'testing', False) # Let the error become a 500 instead of propagating
+
+    assert client.get('/events/stream').status_code == 500
+    assert app.stream_stats['open'] == 0
+
+    monkeypatch.undo()
+    monkeypatch.setitem(app.event_bus_config, 'max_streams', 1)
+    stream = client.get('/events/stream', buffered=False)
+    assert stream.status_code == 200
+    stream.close()
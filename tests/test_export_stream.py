@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+import mysql.connector
+import pytest
+
+import app
+from fakes import FakeServer, FakeServers
+
+EXPORT_QUERY = 'SELECT study summary export'
+
+
+@pytest.fixture
+def export_pool(monkeypatch):
+    rows = [{'student_id': i, 'student_name': f'Student {i}', 'semester': 1, 'subject_id': 1,
+             'subject_name': 'Algebra', 'total_study_hours': Decimal('1.50')}
+            for i in range(app.EXPORT_FETCH_SIZE * 3)]
+    server = FakeServer({EXPORT_QUERY: rows})
+    monkeypatch.setattr(mysql.connector, 'connect', FakeServers(**{app.db_config['host']: server}).connect)
+    pool = app.ConnectionPool(app.db_config, **app.pool_config)
+    monkeypatch.setattr(app, 'db_pool', pool)
+    return pool
+
+
+def test_complete_export_returns_connection_to_pool(export_pool):
+    body = ''.join(app.stream_study_summary('csv', EXPORT_QUERY, ()))
+
+    assert body.count('\n') == app.EXPORT_FETCH_SIZE * 3 + 1
+    stats = export_pool.stats()
+    assert stats['in_use'] == 0
+    assert stats['idle'] == 1
+
+
+def test_abandoned_export_releases_connection(export_pool):
+    stream = app.stream_study_summary('ndjson', EXPORT_QUERY, ())
+    next(stream)
+    stream.close() # What werkzeug does when the client disconnects
+
+    stats = export_pool.stats()
+    assert stats['in_use'] == 0
+    assert stats['idle'] == 0 # Closed, not pooled with the rest of the result still unread
+    assert stats['open'] == 0
@@ -0,0 +1,84 @@
+import app
+from conftest import login
+
+GOAL_QUERY = 'FROM SubjectGoals sg JOIN StudentProgress sp'
+REACHED_GOAL = {'goal_id': 7, 'student_id': 1, 'subject_id': 2, 'mentor_id': 3,
+                'student_name': 'Ada', 'subject_name': 'Algebra'}
+
+
+def reached_goals_unless_overridden(sql, params):
+    # Goal 7 is at 100% progress, but the mentor has toggled it by hand
+    return [] if 'mentor_override = FALSE' in sql else [dict(REACHED_GOAL)]
+
+
+def test_mentor_can_unmark_a_reached_goal(db):
+    db.responses.update({
+        GOAL_QUERY: reached_goals_unless_overridden,
+        'SELECT sg.student_id, sg.subject_id, sg.is_met': [
+            {'student_id': 1, 'subject_id': 2, 'is_met': 0, 'subject_name': 'Algebra'}]
+    })
+    events = app.event_bus.subscribe('student:1')
+    client = app.app.test_client()
+    login(client, 'mentor', 3)
+    try:
+        response = client.post('/toggle_goal_met/7')
+    finally:
+        events.close()
+
+    assert response.status_code == 302
+    assert 'mentor_override = TRUE' in db.ran('UPDATE SubjectGoals SET is_met = CASE')[0]
+    assert db.ran('CALL CalculateAndUpdateProgress')
+    assert not db.ran('UPDATE SubjectGoals SET is_met = TRUE WHERE goal_id IN')
+    assert not db.ran('INSERT INTO Messages')
+    assert events.get(0) is None
+
+
+def reached(goal_id, student_id, subject_id, mentor_id=3):
+    return {'goal_id': goal_id, 'student_id': student_id, 'subject_id': subject_id, 'mentor_id': mentor_id,
+            'student_name': f'Student {student_id}', 'subject_name': f'Subject {subject_id}'}
+
+
+def evaluate(db, *student_range):
+    conn = app.get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        return app.evaluate_goals(cursor, *student_range)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def test_reached_goals_are_marked_met_and_praised_once_per_pair(db):
+    # Goals 1 and 2 are two targets for the same student/subject pair
+    db.responses[GOAL_QUERY] = [reached(1, 5, 10), reached(2, 5, 10), reached(3, 6, 10, mentor_id=4)]
+    met_goals, messages = evaluate(db)
+
+    assert [goal['goal_id'] for goal in met_goals] == [1, 2, 3]
+    (update, params), = [call for call in db.calls if call[0].startswith('UPDATE SubjectGoals')]
+    assert 'AND is_met = FALSE' in update and params == (1, 2, 3)
+    (insert, rows), = [call for call in db.calls if call[0].startswith('INSERT INTO Messages')]
+    assert [(sender, recipient) for sender, recipient, _ in rows] == [(3, 5), (4, 6)]
+    assert messages == rows
+    assert db.commits == 0 # The caller's transaction
+
+
+def test_no_reached_goals_writes_nothing(db):
+    assert evaluate(db) == ([], [])
+    assert len(db.executed) == 1 # Only the goal lookup
+
+
+def test_goal_rows_are_locked_for_the_student_range(db):
+    evaluate(db, 100, 199)
+    (sql, params), = db.calls
+    assert sql.endswith('AND sg.student_id BETWEEN %s AND %s ORDER BY sg.goal_id FOR UPDATE')
+    assert 'sg.is_met = FALSE AND sg.mentor_override = FALSE' in sql
+    assert params == (100, 199)
+
+
+def test_goal_results_are_published_after_the_commit(db, monkeypatch):
+    db.responses[GOAL_QUERY] = [reached(1, 5, 10)]
+    order = []
+    monkeypatch.setattr(app, 'publish_goal_results', lambda met_goals, messages: order.append(('publish', db.commits)))
+
+    assert app.run_goal_evaluation() == (1, 1)
+    assert order == [('publish', 1)]
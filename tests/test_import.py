@@ -0,0 +1,153 @@
+import io
+from datetime import date, datetime, timedelta, timezone
+
+import mysql.connector
+import pytest
+
+import app
+
+IDS = ({1, 2}, {10}, {20})
+
+
+def row(**overrides):
+    record = {'student_id': '1', 'subject_id': '10', 'mentor_id': '20', 'duration_hours': '1.5',
+              'study_date': '2026-03-02T10:00:00'}
+    record.update(overrides)
+    return record
+
+
+def test_offset_study_dates_are_stored_as_local_naive_time():
+    aware = datetime(2026, 3, 2, 8, 0, tzinfo=timezone(timedelta(hours=-2)))
+    study_date = app._validate_import_row(row(study_date=aware.isoformat()), *IDS)[4]
+
+    assert study_date.tzinfo is None
+    assert study_date == aware.astimezone().replace(tzinfo=None)
+
+
+def test_offset_study_dates_compare_with_the_archive_boundary():
+    with pytest.raises(ValueError, match='archived term'):
+        app._validate_import_row(row(study_date='2025-01-05T00:00:00+02:00'), *IDS, archived_before=datetime(2026, 1, 1))
+    assert app._validate_import_row(row(study_date='2026-02-01T00:00:00+02:00'), *IDS, archived_before=datetime(2026, 1, 1))
+
+
+@pytest.fixture
+def known_ids(monkeypatch):
+    monkeypatch.setattr(app, 'get_student_ids', lambda: [1, 2])
+    monkeypatch.setattr(app, 'get_all_subjects', lambda: [{'subject_id': 10}])
+    monkeypatch.setattr(app, 'get_all_mentors', lambda: [{'mentor_id': 20}])
+
+
+@pytest.fixture
+def primary(db, known_ids):
+    db.responses['FROM ArchiveRuns'] = [{'MAX(range_end)': None}]
+    return db
+
+
+def executemany_params(db, table):
+    return [params for sql, params in db.calls if sql.startswith(f'INSERT INTO {table} ')]
+
+
+def test_naive_and_offset_dates_import_in_one_batch(primary):
+    db = primary
+    report = app.import_study_sessions([row(), row(study_date='2026-03-01T23:30:00+05:30'), row(study_date='')])
+
+    assert report['inserted'] == 3
+    assert report['rejected'] == 0
+    inserted = next(params for sql, params in db.calls if sql.startswith('INSERT INTO StudyLog'))
+    assert all(study_date.tzinfo is None for *_, study_date in inserted)
+
+
+@pytest.mark.parametrize('record, error', [
+    ({'subject_id': '10', 'mentor_id': '20', 'duration_hours': '1'}, "missing field 'student_id'"),
+    (row(student_id='one'), 'ids must be integers'),
+    (row(student_id='3'), 'unknown student_id 3'),
+    (row(subject_id='11'), 'unknown subject_id 11'),
+    (row(mentor_id='21'), 'unknown mentor_id 21'),
+    (row(duration_hours='0'), 'out of range'),
+    (row(duration_hours='100'), 'out of range'),
+    (row(study_date='02/03/2026'), 'not ISO formatted'),
+])
+def test_invalid_records_are_rejected(record, error):
+    with pytest.raises(ValueError, match=error):
+        app._validate_import_row(record, *IDS)
+
+
+def test_rejected_records_are_reported_by_position_and_skipped(primary):
+    report = app.import_study_sessions([row(), row(mentor_id='99'), row(student_id='2')])
+
+    assert report['inserted'] == 2 and report['rejected'] == 1
+    assert report['errors'] == [{'record': 2, 'error': 'unknown mentor_id 99'}]
+    assert report['pairs'] == {(1, 10), (2, 10)}
+
+
+def test_each_full_batch_is_its_own_transaction(primary):
+    report = app.import_study_sessions([row() for _ in range(5)], batch_size=2)
+
+    assert report['batches'] == 3 and report['inserted'] == 5
+    assert [len(params) for params in executemany_params(primary, 'StudyLog')] == [2, 2, 1]
+    assert primary.commits == 3
+
+
+def test_a_batch_is_folded_into_the_aggregates_once_per_key(primary):
+    monday, tuesday, next_monday = '2026-03-02T09:00:00', '2026-03-03T09:00:00', '2026-03-09T09:00:00'
+    app.import_study_sessions([row(study_date=monday, duration_hours='1'), row(study_date=tuesday, duration_hours='2'),
+                             row(study_date=next_monday, duration_hours='0.5'),
+                             row(student_id='2', study_date=monday, duration_hours='3')])
+
+    (summary,) = executemany_params(primary, 'StudyHoursSummary')
+    assert summary == [(1, 10, 20, 3.5, 3, datetime(2026, 3, 9, 9)), (2, 10, 20, 3.0, 1, datetime(2026, 3, 2, 9))]
+    (weekly,) = executemany_params(primary, 'StudyWeeklyRollup')
+    assert weekly == [(1, 10, date(2026, 3, 2), 3.0, 2), (1, 10, date(2026, 3, 9), 0.5, 1), (2, 10, date(2026, 3, 2), 3.0, 1)]
+    (daily,) = executemany_params(primary, 'StudyDailyRollup')
+    assert len(daily) == 4
+    (associations,) = executemany_params(primary, 'MentorStudent')
+    assert associations == [(20, 1, datetime(2026, 3, 2, 9), datetime(2026, 3, 9, 9), 3),
+                            (20, 2, datetime(2026, 3, 2, 9), datetime(2026, 3, 2, 9), 1)]
+
+
+def test_a_failed_batch_stops_the_import_and_keeps_earlier_batches(primary, monkeypatch):
+    original = app._insert_import_batch
+    batches = []
+
+    def second_batch_fails(conn, rows):
+        batches.append(len(rows))
+        if len(batches) == 2:
+            raise mysql.connector.errors.OperationalError('Lock wait timeout exceeded')
+        original(conn, rows)
+    monkeypatch.setattr(app, '_insert_import_batch', second_batch_fails)
+
+    with pytest.raises(mysql.connector.Error):
+        app.import_study_sessions([row() for _ in range(6)], batch_size=2)
+    assert batches == [2, 2] and primary.commits == 1
+
+
+@pytest.mark.parametrize('fmt, text', [
+    ('csv', 'student_id,subject_id,mentor_id,duration_hours\n1,10,20,1.5\n'),
+    ('json', '[{"student_id": 1, "subject_id": 10, "mentor_id": 20, "duration_hours": 1.5}]'),
+    ('ndjson', '{"student_id": 1, "subject_id": 10, "mentor_id": 20, "duration_hours": 1.5}\n\n'),
+])
+def test_import_formats_parse_to_records(fmt, text):
+    (record,) = list(app.parse_study_import(io.StringIO(text), fmt))
+    assert app._validate_import_row(record, *IDS)[:4] == (1, 10, 20, 1.5)
+
+
+def test_import_route_queues_one_recalculation_per_pair(primary, monkeypatch):
+    queued = []
+    monkeypatch.setattr(app, 'enqueue_progress_update', lambda student_id, subject_id: queued.append((student_id, subject_id)))
+    client = app.app.test_client()
+    with client.session_transaction() as sess:
+        sess['sys_access'] = True
+
+    response = client.post('/system/import/study_sessions?format=ndjson',
+                           data='{"student_id": 1, "subject_id": 10, "mentor_id": 20, "duration_hours": 1}\n' * 3)
+
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 3 and response.get_json()['pairs'] == 1
+    assert queued == [(1, 10)]
+
+
+def test_import_route_rejects_unknown_formats(primary):
+    client = app.app.test_client()
+    with client.session_transaction() as sess:
+        sess['sys_access'] = True
+    assert client.post('/system/import/study_sessions?format=xml', data='<rows/>').status_code == 400
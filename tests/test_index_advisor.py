@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import index_advisor
+from app import statement_registry
+
+IDS = {'student': 11, 'mentor': 22, 'subject': 33}
+
+
+def test_every_registered_statement_has_representative_params():
+    params = index_advisor.hot_statement_params(IDS)
+    for name, sql in statement_registry.statements().items():
+        assert sql.count('%s') == len(params[name]), name
+
+
+def test_builder_fragments_are_explained_as_complete_statements():
+    hot = [index_advisor.normalise(sql) for sql in statement_registry.statements().values()]
+    fragment = 'SELECT StudyLog.log_id, StudyLog.study_date'
+
+    assert any(fragment in (sql or '') for _, sql in index_advisor.collect_statements(index_advisor.APP_PATH))
+    assert not any(fragment in (sql or '') for _, sql in index_advisor.collect_statements(index_advisor.APP_PATH, hot))
+    # ... because the registry holds the builder's full text, ORDER BY ... LIMIT included
+    assert any(sql.startswith(fragment) and sql.endswith('LIMIT %s') for sql in hot)
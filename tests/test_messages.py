@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app
+from conftest import login
+
+MARK_READ = 'UPDATE Messages SET is_read = TRUE'
+
+
+@pytest.fixture
+def client(db):
+    db.responses[MARK_READ] = 2
+    db.responses['FROM Messages'] = [{'unread': 0}]
+    client = app.app.test_client()
+    login(client, 'student', 5)
+    return client
+
+
+def test_mark_read_marks_the_listed_messages(client, db):
+    response = client.post('/messages/mark_read', json={'message_ids': [11, '12']})
+    assert response.status_code == 200
+    assert response.get_json()['marked'] == 2
+    (sql, params), = [call for call in db.calls if MARK_READ in call[0]]
+    assert params == (5, 'student', 11, 12)
+
+
+@pytest.mark.parametrize('payload', [{'message_ids': '123'}, {'message_ids': 7}, {}, [1, 2], {'message_ids': ['x']}])
+def test_mark_read_rejects_anything_but_a_list_of_ids(client, db, payload):
+    assert client.post('/messages/mark_read', json=payload).status_code == 400
+    assert not db.ran(MARK_READ)
+
+
+INBOX = 'FROM Messages m LEFT JOIN Students S'
+SENT = datetime(2026, 9, 1, 8, 0)
+# Two users share id 5: only the student's messages belong in the student's inbox
+MESSAGES = [{'message_id': n, 'content': f'Message {n}', 'timestamp': SENT + timedelta(minutes=n // 3),
+             'sender_role': 'mentor', 'is_read': 0, 'sender_id': 3, 'sender_name': 'Mentor 3',
+             'recipient_role': 'student' if n % 4 else 'mentor'} for n in range(1, 15)]
+
+
+def inbox_seek(sql, params):
+    """ One inbox page the way MySQL would answer it: this recipient's rows before the seek position, newest first """
+    rows = [m for m in MESSAGES if m['recipient_role'] == params[1]]
+    rows.sort(key=lambda m: (m['timestamp'], m['message_id']), reverse=True)
+    if 'm.message_id <' in sql:
+        after = (params[2], params[4])
+        rows = [m for m in rows if (m['timestamp'], m['message_id']) < after]
+    return [{key: value for key, value in m.items() if key != 'recipient_role'} for m in rows[:params[-1]]]
+
+
+def test_paging_through_the_inbox_returns_each_message_once(client, db):
+    db.responses = {INBOX: inbox_seek, **db.responses} # Ahead of the fixture's unread-count response
+    seen, cursor = [], None
+    while True:
+        body = client.get('/messages/inbox?limit=4' + (f'&cursor={cursor}' if cursor else '')).get_json()
+        seen += [message['message_id'] for message in body['messages']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == [n for n in range(14, 0, -1) if n % 4]
+    assert all(params[:2] == (5, 'student') for sql, params in db.calls if INBOX in sql)
+
+
+def test_inbox_rejects_malformed_cursors(client):
+    assert client.get('/messages/inbox?cursor=nonsense').status_code == 400
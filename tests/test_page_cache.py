@@ -0,0 +1,107 @@
+import pytest
+
+import app
+from conftest import login
+
+
+def make_cache(stamps, max_bytes=1024, ttl=300):
+    return app.PageCache(max_bytes, ttl, stamps, stamp_ttl=3600)
+
+
+@pytest.fixture
+def stamps():
+    return app.MemoryCacheBackend(100)
+
+
+def test_invalidation_reaches_other_workers_sharing_the_stamps(stamps):
+    worker_a, worker_b = make_cache(stamps), make_cache(stamps)
+    worker_b.set(worker_b.key('student', 5, 'progress'), '<old>')
+    assert worker_b.get(worker_b.key('student', 5, 'progress')) == '<old>'
+
+    worker_a.invalidate_user('student', 5) # The write was handled by the other worker
+
+    assert worker_b.get(worker_b.key('student', 5, 'progress')) is None
+
+
+def test_invalidation_is_per_user(stamps):
+    cache = make_cache(stamps)
+    cache.set(cache.key('student', 5, 'progress'), '<five>')
+    cache.set(cache.key('student', 6, 'progress'), '<six>')
+    cache.set(cache.key('mentor', 5, 'dashboard'), '<mentor five>')
+
+    cache.invalidate_user('student', 5)
+
+    assert cache.get(cache.key('student', 5, 'progress')) is None
+    assert cache.get(cache.key('student', 6, 'progress')) == '<six>'
+    assert cache.get(cache.key('mentor', 5, 'dashboard')) == '<mentor five>'
+
+
+def test_clear_reaches_other_workers(stamps):
+    worker_a, worker_b = make_cache(stamps), make_cache(stamps)
+    worker_b.set(worker_b.key('student', 5, 'progress'), '<old>')
+    worker_a.clear()
+    assert worker_b.get(worker_b.key('student', 5, 'progress')) is None
+
+
+def test_page_rendered_across_a_write_is_not_served(stamps):
+    cache = make_cache(stamps)
+    key = cache.key('student', 5, 'progress') # Taken before the page's data was read
+    cache.invalidate_user('student', 5)        # Write lands while the page renders
+    cache.set(key, '<stale>')
+    assert cache.get(cache.key('student', 5, 'progress')) is None
+
+
+def test_lost_stamp_does_not_revive_older_pages(stamps):
+    cache = make_cache(stamps)
+    cache.set(cache.key('student', 5, 'progress'), '<old>')
+    stamps.delete('student:5') # Expired or evicted from the stamps backend
+    assert cache.get(cache.key('student', 5, 'progress')) is None
+
+
+def test_least_recently_used_pages_are_evicted_past_the_byte_cap(stamps):
+    cache = make_cache(stamps, max_bytes=10)
+    first, second, third = (cache.key('student', n, 'progress') for n in (1, 2, 3))
+    cache.set(first, 'aaaa')
+    cache.set(second, 'bbbb')
+    cache.get(first) # Now the most recently used
+    cache.set(third, 'cccc')
+
+    assert cache.get(second) is None
+    assert cache.get(first) == 'aaaa' and cache.get(third) == 'cccc'
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['bytes'] == 8 and stats['entries'] == 2
+
+
+def test_expired_pages_are_misses(stamps):
+    cache = make_cache(stamps, ttl=-1)
+    key = cache.key('student', 5, 'progress')
+    cache.set(key, '<page>')
+    assert cache.get(key) is None
+    assert cache.stats()['hit_rate'] == 0.0
+
+
+def progress_rows(sql, params):
+    return [{'subject_id': 10, 'subject_name': 'Databases', 'last_updated': '2026-10-01', 'progress_percentage': 30.0}]
+
+
+def test_progress_read_on_the_primary_is_cached(db, monkeypatch):
+    monkeypatch.setattr(app, 'replica_router', type('NoReplicas', (), {'acquire': lambda self: None})())
+    db.responses['CALL GetStudentProgressReport'] = progress_rows
+    client = app.app.test_client()
+    login(client, 'student', 5)
+
+    assert client.get('/progress').status_code == 200
+    assert client.get('/progress').status_code == 200
+    assert len(db.ran('CALL GetStudentProgressReport')) == 1
+
+
+def test_progress_read_on_a_replica_is_not_cached(db, monkeypatch):
+    replica_pool = app.ConnectionPool(app.db_config, **app.pool_config) # Answered by the same fake server
+    monkeypatch.setattr(app, 'replica_router', type('OneReplica', (), {'acquire': lambda self: replica_pool.acquire()})())
+    db.responses['CALL GetStudentProgressReport'] = progress_rows
+    client = app.app.test_client()
+    login(client, 'student', 5)
+
+    client.get('/progress')
+    client.get('/progress')
+    assert len(db.ran('CALL GetStudentProgressReport')) == 2
@@ -0,0 +1,81 @@
+import pytest
+
+import app
+
+USER_LOOKUP = 'SELECT * FROM Students WHERE email'
+REHASH = 'UPDATE Students SET password'
+
+
+@pytest.fixture(autouse=True)
+def fast_kdf(monkeypatch):
+    monkeypatch.setitem(app.credential_config, 'iterations', 1000)
+    monkeypatch.setattr(app, 'login_throttle', app.LoginThrottle(900, 100))
+
+
+def test_current_hashes_verify_without_a_rehash():
+    stored = app.hash_password('s3cret')
+    assert stored.startswith('pbkdf2_sha256$1000$')
+    assert app.check_password('s3cret', stored) == (True, False)
+    assert app.check_password('wrong', stored) == (False, False)
+
+
+def test_hashes_with_an_old_work_factor_need_a_rehash():
+    assert app.check_password('s3cret', app.hash_password('s3cret', iterations=500)) == (True, True)
+    assert app.check_password('wrong', app.hash_password('s3cret', iterations=500)) == (False, False)
+
+
+def test_plaintext_rows_need_a_rehash_once_confirmed():
+    assert app.check_password('s3cret', 's3cret') == (True, True)
+    assert app.check_password('wrong', 's3cret') == (False, False)
+
+
+def test_malformed_hashes_never_match():
+    assert app.check_password('s3cret', 'pbkdf2_sha256$many$salt') == (False, False)
+
+
+def log_in(db, stored, password='s3cret'):
+    db.responses[USER_LOOKUP] = [{'student_id': 5, 'name': 'Student 5', 'major': 'CSE', 'password': stored}]
+    client = app.app.test_client()
+    response = client.post('/login', data={'email': 'five@example.com', 'password': password, 'role': 'student'})
+    return client, response
+
+
+def test_plaintext_password_is_replaced_after_login(db):
+    client, response = log_in(db, 's3cret')
+
+    assert response.headers['Location'].endswith('/dashboard')
+    (sql, params), = [call for call in db.calls if call[0].startswith(REHASH)]
+    assert sql.endswith('WHERE student_id = %s AND password = %s') # Only if no other login replaced it first
+    new_hash, student_id, old_value = params
+    assert (student_id, old_value) == (5, 's3cret')
+    assert app.check_password('s3cret', new_hash) == (True, False)
+
+
+def test_current_hash_is_left_alone(db):
+    log_in(db, app.hash_password('s3cret'))
+    assert not db.ran(REHASH)
+
+
+def test_busy_verifier_skips_the_rehash(db, monkeypatch):
+    monkeypatch.setattr(app.password_verifier, 'hash', lambda password: None)
+    client, response = log_in(db, 's3cret')
+    assert response.headers['Location'].endswith('/dashboard') # The login itself still succeeds
+    assert not db.ran(REHASH)
+
+
+def test_wrong_password_neither_logs_in_nor_rehashes(db):
+    client, response = log_in(db, 's3cret', password='guess')
+    assert response.headers['Location'].endswith('/login')
+    assert not db.ran(REHASH)
+    with client.session_transaction() as sess:
+        assert 'user_id' not in sess
+
+
+def test_repeated_failures_block_the_account_before_any_query(db, monkeypatch):
+    monkeypatch.setitem(app.credential_config, 'max_failures_per_account', 2)
+    for _ in range(2):
+        log_in(db, 's3cret', password='guess')
+    lookups = len(db.ran(USER_LOOKUP))
+
+    log_in(db, 's3cret') # Right password, but the account is throttled
+    assert len(db.ran(USER_LOOKUP)) == lookups
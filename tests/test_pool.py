@@ -0,0 +1,102 @@
+import mysql.connector
+import pytest
+
+import app
+from fakes import FakeServer, FakeServers
+
+HOST = app.db_config['host']
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(mysql.connector, 'connect', FakeServers(**{HOST: server}).connect)
+    return server
+
+
+def make_pool(pool_size=2, max_overflow=1, checkout_timeout=0.05, idle_timeout=300, ping_after_idle=30):
+    return app.ConnectionPool(app.db_config, pool_size, max_overflow, checkout_timeout, idle_timeout, ping_after_idle)
+
+
+def test_returned_connections_are_reused(server):
+    pool = make_pool()
+    first = pool.acquire()
+    raw = first._raw_conn
+    first.close()
+    second = pool.acquire()
+
+    assert second._raw_conn is raw
+    stats = pool.stats()
+    assert stats['connections_created'] == 1 and stats['checkouts'] == 2
+    assert stats['open'] == 1 and stats['in_use'] == 1
+
+
+def test_exhausted_pool_overflows_then_fails(server):
+    pool = make_pool(pool_size=1, max_overflow=1)
+    pooled = pool.acquire()
+    overflow = pool.acquire()
+    assert overflow._overflow
+    assert pool.acquire() is None
+
+    stats = pool.stats()
+    assert stats['misses'] == 2 and stats['failed_checkouts'] == 1 and stats['overflow_in_use'] == 1
+
+    raw = overflow._raw_conn
+    overflow.close() # Overflow connections are closed, never pooled
+    assert raw.closed and pool.stats()['idle'] == 0
+    pooled.close()
+    assert pool.stats()['idle'] == 1
+
+
+def test_connection_failing_its_health_check_is_replaced(server, monkeypatch):
+    pool = make_pool(ping_after_idle=0)
+    conn = pool.acquire()
+    stale = conn._raw_conn
+    conn.close()
+
+    def lost(reconnect=False):
+        raise mysql.connector.errors.InterfaceError('Connection lost')
+    monkeypatch.setattr(stale, 'ping', lost)
+    fresh = pool.acquire()
+
+    assert fresh._raw_conn is not stale and stale.closed
+    stats = pool.stats()
+    assert stats['health_check_failures'] == 1 and stats['open'] == 1
+
+
+def test_idle_connections_past_the_timeout_are_closed(server):
+    pool = make_pool(idle_timeout=-1)
+    conn = pool.acquire()
+    old = conn._raw_conn
+    conn.close()
+
+    assert pool.acquire()._raw_conn is not old
+    assert old.closed and pool.stats()['idle_evictions'] == 1
+
+
+def test_failed_connect_frees_its_slot(server):
+    pool = make_pool(pool_size=1, max_overflow=0)
+    server.down = True
+    assert pool.acquire() is None
+    server.down = False
+    assert pool.acquire() is not None
+
+
+def test_discarded_connection_frees_its_slot(server):
+    pool = make_pool(pool_size=1, max_overflow=0)
+    conn = pool.acquire()
+    raw = conn._raw_conn
+    conn.discard()
+    assert raw.closed and pool.stats()['open'] == 0
+    assert pool.acquire() is not None
+
+
+def test_request_shares_one_connection_until_teardown(server, monkeypatch):
+    pool = make_pool()
+    monkeypatch.setattr(app, 'db_pool', pool)
+    with app.app.test_request_context():
+        first = app.get_db_connection()
+        first.close() # Helpers close their handle; the request keeps the connection
+        assert app.get_db_connection() is first
+        assert pool.stats()['in_use'] == 1
+    assert pool.stats()['in_use'] == 0 and pool.stats()['idle'] == 1
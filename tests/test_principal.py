@@ -0,0 +1,46 @@
+import mysql.connector
+import pytest
+from flask import session
+
+import app
+
+STUDENT_LOOKUP = 'FROM Students WHERE student_id'
+
+
+@pytest.fixture
+def student(db):
+    app.drop_principal('student', 5)
+    with app.app.test_request_context():
+        session.update(user_id=5, role='student', name='Student 5')
+        yield db
+    app.drop_principal('student', 5)
+
+
+def test_principal_is_loaded_once_then_cached(student):
+    student.responses[STUDENT_LOOKUP] = [{'student_id': 5, 'name': 'Student 5', 'major': 'CSE'}]
+    assert app.get_principal()['major'] == 'CSE'
+    del app.g.principal # Next request
+    assert app.get_principal()['major'] == 'CSE'
+    assert len(student.ran(STUDENT_LOOKUP)) == 1
+
+
+def test_exhausted_pool_falls_back_to_the_session(student, monkeypatch):
+    monkeypatch.setattr(app, 'get_db_connection', lambda: None)
+    assert app.get_principal() == {'id': 5, 'role': 'student', 'name': 'Student 5', 'major': 'General'}
+    assert app.session_store.get('principal:student:5') is None # Retried on the next request
+
+
+def test_database_error_falls_back_to_the_session(student):
+    student.responses[STUDENT_LOOKUP] = mysql.connector.errors.OperationalError('Lost connection')
+    assert app.get_principal()['major'] == 'General'
+    assert app.session_store.get('principal:student:5') is None
+
+
+def test_deleting_a_mentor_drops_their_principal(db):
+    app.cache_principal('mentor', {'mentor_id': 3, 'name': 'Mentor 3', 'expertise_area': 'AI'})
+    client = app.app.test_client()
+    with client.session_transaction() as sess:
+        sess['sys_access'] = True
+    client.post('/delete_mentor/3')
+    assert db.ran('CALL DeleteMentor')
+    assert app.session_store.get('principal:mentor:3') is None
@@ -0,0 +1,55 @@
+import pytest
+
+import app
+
+SUBJECTS = [{'subject_id': 10, 'subject_name': 'Databases'}, {'subject_id': 11, 'subject_name': 'Compilers'}]
+
+
+@pytest.fixture
+def cache(db, monkeypatch):
+    cache = app.ReferenceDataCache(app.MemoryCacheBackend(16), ttl=300)
+    monkeypatch.setattr(app, 'reference_cache', cache)
+    db.responses['SELECT * FROM Subjects WHERE subject_id'] = lambda sql, params: [s for s in SUBJECTS if s['subject_id'] == params[0]]
+    db.responses['SELECT * FROM Subjects'] = SUBJECTS
+    return cache
+
+
+def test_reference_rows_are_loaded_once(cache, db):
+    assert app.get_all_subjects() == SUBJECTS
+    assert app.get_all_subjects() == SUBJECTS
+    assert db.executed.count('SELECT * FROM Subjects') == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_callers_get_copies(cache):
+    app.get_all_subjects()[0]['subject_name'] = 'Annotated by a route'
+    assert app.get_all_subjects()[0]['subject_name'] == 'Databases'
+
+
+def test_missing_rows_are_not_cached(cache, db):
+    assert app.get_subject(99) is None
+    assert app.get_subject(99) is None
+    assert len(db.ran('WHERE subject_id')) == 2
+
+
+def test_deleting_a_subject_invalidates_subject_entries(cache, db):
+    app.get_all_subjects()
+    app.get_subject(10)
+    client = app.app.test_client()
+    with client.session_transaction() as sess:
+        sess['sys_access'] = True
+    client.post('/delete_subject/10')
+
+    assert db.ran('CALL DeleteSubject')
+    assert cache.stats()['entries'] == 0
+    app.get_all_subjects()
+    assert db.executed.count('SELECT * FROM Subjects') == 2
+
+
+def test_expired_entries_are_reloaded(db, monkeypatch):
+    cache = app.ReferenceDataCache(app.MemoryCacheBackend(16), ttl=-1)
+    monkeypatch.setattr(app, 'reference_cache', cache)
+    db.responses['SELECT * FROM Subjects'] = SUBJECTS
+    app.get_all_subjects()
+    app.get_all_subjects()
+    assert db.executed.count('SELECT * FROM Subjects') == 2
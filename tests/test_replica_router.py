@@ -0,0 +1,115 @@
+import time
+
+import mysql.connector
+import pytest
+from flask import Response, g, session
+
+import app
+from fakes import FakeServer, FakeServers
+
+REPLICA_STATUS = 'SHOW REPLICA STATUS'
+SLAVE_STATUS = 'SHOW SLAVE STATUS'
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    servers = FakeServers(**{
+        app.db_config['host']: FakeServer(),
+        'replica-1': FakeServer({REPLICA_STATUS: [{'Seconds_Behind_Source': 0}]}),
+        'replica-2': FakeServer({REPLICA_STATUS: [{'Seconds_Behind_Source': 0}]})
+    })
+    monkeypatch.setattr(mysql.connector, 'connect', servers.connect)
+    return servers.servers
+
+
+@pytest.fixture
+def router(servers, monkeypatch):
+    router = app.ReplicaRouter(app.db_config, [{'host': 'replica-1'}, {'host': 'replica-2'}], app.pool_config,
+                               max_lag=5, check_interval=5)
+    monkeypatch.setattr(app, 'replica_router', router)
+    monkeypatch.setattr(app, 'db_pool', app.ConnectionPool(app.db_config, **app.pool_config))
+    return router
+
+
+def replica_state(router):
+    return {r['name']: (r['healthy'], r['last_error']) for r in router.stats()['replicas']}
+
+
+def read_host(conn):
+    return conn._raw_conn._server
+
+
+def test_replicas_unused_until_first_check(router):
+    assert router.acquire() is None
+    router.check()
+    assert router.acquire() is not None
+
+
+def test_reads_round_robin_over_healthy_replicas(router, servers):
+    router.check()
+    first, second = router.acquire(), router.acquire()
+    assert {read_host(first), read_host(second)} == {servers['replica-1'], servers['replica-2']}
+
+
+def test_lagging_replica_is_skipped(router, servers):
+    servers['replica-2'].responses[REPLICA_STATUS] = [{'Seconds_Behind_Source': 10}]
+    router.check()
+
+    assert replica_state(router)['replica-2:3306'] == (False, 'lag 10s')
+    assert all(read_host(router.acquire()) is servers['replica-1'] for _ in range(4))
+
+
+def test_stopped_replication_is_skipped(router, servers):
+    servers['replica-1'].responses[REPLICA_STATUS] = [{'Seconds_Behind_Source': None}]
+    servers['replica-2'].responses[REPLICA_STATUS] = []
+    router.check()
+
+    assert replica_state(router) == {'replica-1:3306': (False, 'replication stopped'),
+                                     'replica-2:3306': (False, 'not replicating')}
+    assert router.acquire() is None
+
+
+def test_failed_health_check_is_skipped_then_recovers(router, servers):
+    router.check()
+    servers['replica-1'].down = True
+    servers['replica-1'].responses[REPLICA_STATUS] = mysql.connector.errors.OperationalError('Lost connection')
+    router.check()
+
+    assert replica_state(router)['replica-1:3306'][0] is False
+    assert all(read_host(router.acquire()) is servers['replica-2'] for _ in range(4))
+
+    servers['replica-1'].down = False
+    servers['replica-1'].responses[REPLICA_STATUS] = [{'Seconds_Behind_Source': 1}]
+    router.check()
+    assert replica_state(router)['replica-1:3306'] == (True, None)
+
+
+def test_falls_back_to_show_slave_status(router, servers):
+    for name in ('replica-1', 'replica-2'):
+        servers[name].responses[REPLICA_STATUS] = mysql.connector.errors.ProgrammingError('You have an error in your SQL syntax')
+        servers[name].responses[SLAVE_STATUS] = [{'Seconds_Behind_Master': 2}]
+    router.check()
+
+    assert all(healthy for healthy, _ in replica_state(router).values())
+    assert SLAVE_STATUS in servers['replica-1'].executed
+
+
+def test_read_after_commit_stays_on_primary(router, servers):
+    router.check()
+    primary = servers[app.db_config['host']]
+
+    with app.app.test_request_context('/'):
+        app.get_db_connection().commit()
+        assert g.db_wrote
+        app.remember_recent_write(Response())
+        last_write_at = session['last_write_at']
+
+    # The next request from the same user reads from the primary while the write is recent
+    with app.app.test_request_context('/'):
+        session['last_write_at'] = last_write_at
+        assert read_host(app.get_read_connection()) is primary
+
+    # Once sticky_seconds have passed, reads go back to the replicas
+    with app.app.test_request_context('/'):
+        session['last_write_at'] = time.time() - app.replica_config['sticky_seconds'] - 1
+        assert read_host(app.get_read_connection()) is not primary
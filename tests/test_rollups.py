@@ -0,0 +1,62 @@
+from datetime import date, datetime
+
+import app
+from fakes import FakeServer, FakeConnection
+
+ARCHIVE_BOUNDARY = 'FROM ArchiveRuns'
+
+
+def trend_cursor(rows):
+    server = FakeServer({'FROM StudyWeeklyRollup': rows, 'FROM StudyDailyRollup': rows})
+    return server, FakeConnection(server).cursor(dictionary=True)
+
+
+def test_weekly_trend_is_dense_and_starts_on_a_monday():
+    server, cursor = trend_cursor([{'bucket': date(2026, 9, 14), 'hours': 2.5, 'sessions': 2}])
+    series = app.get_study_trend(cursor, date(2026, 9, 10), date(2026, 9, 30), 'week', student_id=5)
+
+    assert series == [{'bucket': '2026-09-07', 'hours': 0.0, 'sessions': 0},
+                      {'bucket': '2026-09-14', 'hours': 2.5, 'sessions': 2},
+                      {'bucket': '2026-09-21', 'hours': 0.0, 'sessions': 0},
+                      {'bucket': '2026-09-28', 'hours': 0.0, 'sessions': 0}]
+    (sql, params), = server.calls
+    assert 'student_id = %s' in sql and 'subject_id' not in sql.split('WHERE')[1]
+    assert params == (date(2026, 9, 7), date(2026, 9, 30), 5)
+
+
+def test_daily_trend_filters_by_subject():
+    server, cursor = trend_cursor([{'bucket': date(2026, 9, 2), 'hours': 1, 'sessions': 1}])
+    series = app.get_study_trend(cursor, date(2026, 9, 1), date(2026, 9, 3), 'day', subject_id=10)
+
+    assert [point['hours'] for point in series] == [0.0, 1.0, 0.0]
+    assert server.calls[0][1] == (date(2026, 9, 1), date(2026, 9, 3), 10)
+
+
+def test_full_backfill_rebuilds_both_rollups(db):
+    db.responses[ARCHIVE_BOUNDARY] = [{'MAX(range_end)': None}]
+    db.responses['INSERT INTO StudyDailyRollup'] = 40
+    db.responses['INSERT INTO StudyWeeklyRollup'] = 9
+
+    assert app.backfill_study_rollups() == {'day': 40, 'week': 9}
+    assert db.ran('DELETE FROM StudyDailyRollup') == ['DELETE FROM StudyDailyRollup']
+    assert db.ran('DELETE FROM StudyWeeklyRollup') == ['DELETE FROM StudyWeeklyRollup']
+    assert db.commits == 2 # One transaction per rollup table
+
+
+def test_partial_backfill_starts_at_the_bucket_containing_since(db):
+    db.responses[ARCHIVE_BOUNDARY] = [{'MAX(range_end)': None}]
+    app.backfill_study_rollups(date(2026, 9, 10)) # A Thursday
+
+    deletes = {sql: params for sql, params in db.calls if sql.startswith('DELETE')}
+    assert deletes == {'DELETE FROM StudyDailyRollup WHERE study_day >= %s': (date(2026, 9, 10),),
+                       'DELETE FROM StudyWeeklyRollup WHERE week_start >= %s': (date(2026, 9, 7),)}
+
+
+def test_backfill_leaves_archived_buckets_alone(db):
+    db.responses[ARCHIVE_BOUNDARY] = [{'MAX(range_end)': datetime(2026, 9, 10)}]
+    app.backfill_study_rollups(date(2026, 1, 1))
+
+    deletes = {sql: params for sql, params in db.calls if sql.startswith('DELETE')}
+    # The week straddling the boundary keeps its row: its archived sessions are no longer in StudyLog
+    assert deletes == {'DELETE FROM StudyDailyRollup WHERE study_day >= %s': (date(2026, 9, 10),),
+                       'DELETE FROM StudyWeeklyRollup WHERE week_start >= %s': (date(2026, 9, 14),)}
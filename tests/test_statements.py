@@ -0,0 +1,43 @@
+import app
+
+PRESSING_GOAL = 'FROM SubjectGoals sg JOIN Subjects sub'
+
+
+def goal_rows(sql, params):
+    return [{'due_date': '2026-11-01', 'target_hours': 10, 'subject_name': 'Databases'},
+            {'due_date': '2026-12-01', 'target_hours': 4, 'subject_name': 'Compilers'}]
+
+
+def test_registered_statement_result_describes_the_prepared_execution(db):
+    db.responses[PRESSING_GOAL] = goal_rows
+    conn = app.get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(app.PRESSING_GOAL_QUERY, (5,))
+        # The wrapped plain cursor never ran anything: these come from the prepared cursor
+        assert cursor.with_rows is True
+        assert cursor.column_names == ('due_date', 'target_hours', 'subject_name')
+        assert [column[0] for column in cursor.description] == ['due_date', 'target_hours', 'subject_name']
+        assert cursor.rowcount == 2
+        assert cursor.fetchmany(1) == [goal_rows(None, None)[0]]
+        assert cursor.fetchall() == [goal_rows(None, None)[1]]
+    finally:
+        cursor.close()
+        conn.close()
+    assert app.statement_registry.stats()['statements']['goals.most_pressing']['executions'] >= 1
+
+
+def test_plain_statement_after_a_prepared_one_uses_the_wrapped_cursor(db):
+    db.responses[PRESSING_GOAL] = goal_rows
+    db.responses['SELECT 1 AS one'] = [{'one': 1}]
+    conn = app.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(app.PRESSING_GOAL_QUERY, (5,))
+        cursor.fetchall()
+        cursor.execute('SELECT 1 AS one')
+        assert cursor.column_names == ('one',)
+        assert cursor.fetchall() == [(1,)]
+    finally:
+        cursor.close()
+        conn.close()